@@ -0,0 +1,320 @@
+import json
+from dataclasses import dataclass, field, asdict
+import numpy as np
+from .ecosystem import PLAY_GATE
+from .importance import (universe_weights, universe_groups, group_sums, weighted_mean, weighted_rate,
+                         weighted_percentile, effective_sample_size)
+
+# --- SCOREBOARD ---
+# Weights of the four scoreboard components in total_score
+SCORE_WEIGHTS = {'gold': 0.30, 'survival': 0.30, 'cost': 0.20, 'time': 0.20}
+GRADE_BANDS = ((90, 'A'), (80, 'B'), (70, 'C'), (60, 'D'))
+
+
+def grade_for(total_score: float) -> str:
+    for floor, grade in GRADE_BANDS:
+        if total_score >= floor:
+            return grade
+    return 'F'
+
+
+def score_results(results: dict, total_months: int, start_ga: float) -> dict:
+    """
+    Scoreboard numbers for a set of career results (RESULT_COLUMNS arrays).
+    Importance-sampled runs are weighted by their likelihood ratios.
+    """
+    weights = universe_weights(results)
+    groups = universe_groups(results)
+
+    avg_final_ga = weighted_mean(results['final_ga'], weights)
+    avg_contrib = weighted_mean(results['contrib'], weights)
+    avg_tax = weighted_mean(results['tax'], weights)
+    avg_insolvent = weighted_mean(results['insolvent_months'], weights)
+
+    gold_mask = results['gold_year'] != -1
+    gold_rate, gold_se = weighted_rate(gold_mask, weights, groups)
+    ruin_rate, ruin_se = weighted_rate(results['final_ga'] < PLAY_GATE, weights, groups)
+
+    components = _score_components(avg_final_ga, avg_contrib, avg_tax, avg_insolvent, gold_rate, ruin_rate, total_months)
+    avg_monthly_cost, score_gold, score_survival, score_cost, score_time, total_score = (float(c) for c in components)
+
+    return {
+        'avg_final_ga': avg_final_ga,
+        'avg_contrib': avg_contrib,
+        'avg_tax': avg_tax,
+        'avg_insolvent': avg_insolvent,
+        'avg_monthly_cost': avg_monthly_cost,
+        'net_life_result': avg_final_ga + avg_tax - (start_ga + avg_contrib),
+        'gold_rate': gold_rate, 'gold_se': gold_se,
+        'ruin_rate': ruin_rate, 'ruin_se': ruin_se,
+        'score_gold': score_gold,
+        'score_survival': score_survival,
+        'score_cost': score_cost,
+        'score_time': score_time,
+        'total_score': total_score,
+        'grade': grade_for(total_score),
+    }
+
+
+def _score_components(avg_final_ga, avg_contrib, avg_tax, avg_insolvent, gold_rate, ruin_rate, total_months):
+    """Scoreboard formulas; works on scalars or on arrays of bootstrap resamples."""
+    insolvency_pct = (avg_insolvent / total_months) * 100
+    avg_monthly_cost = (avg_contrib - avg_tax) / total_months
+
+    score_gold = gold_rate * 100
+    score_survival = (1 - ruin_rate) * 100
+    score_cost = np.where(avg_monthly_cost <= 0, 100.0, np.maximum(0.0, 100 - (avg_monthly_cost / 5)))
+    score_time = 100 - insolvency_pct
+    total_score = (score_gold * SCORE_WEIGHTS['gold']) + (score_survival * SCORE_WEIGHTS['survival']) \
+        + (score_cost * SCORE_WEIGHTS['cost']) + (score_time * SCORE_WEIGHTS['time'])
+    return avg_monthly_cost, score_gold, score_survival, score_cost, score_time, total_score
+
+
+# --- BOOTSTRAP ---
+# Every scoreboard number is a function of seven per-universe column means, so a
+# resample only needs those means: counts @ columns for a chunk of resamples in
+# one matmul (Poisson(1) counts, i.e. the Poisson bootstrap). The counts are
+# drawn as a Poisson(groups) total scattered uniformly over the groups (same
+# law, cheaper than per-cell Poisson draws) and streamed in chunks of
+# BOOTSTRAP_CHUNK_CELLS, so memory stays flat. Only past BOOTSTRAP_EXACT_CELLS
+# (resamples x groups, ~0.5 s) are the column means drawn from their normal limit
+# instead; that result is marked method='normal' and labelled as a normal
+# approximation wherever it is shown. Stratified / antithetic runs resample
+# whole sampling groups.
+BOOTSTRAP_RESAMPLES = 2000
+BOOTSTRAP_EXACT_CELLS = 20_000_000   # exact resampling up to 10k groups at the default count
+BOOTSTRAP_CHUNK_CELLS = 4_000_000
+CI_LEVEL = 0.95
+BOOTSTRAP_METRICS = ('avg_final_ga', 'score_gold', 'score_survival', 'score_cost', 'score_time', 'total_score')
+
+
+def bootstrap_scores(results: dict, total_months: int, n_resamples: int = BOOTSTRAP_RESAMPLES, seed=None) -> dict:
+    """
+    {'intervals': {metric: [low, high]}, 'grade_probs': {grade: p}, 'resamples', 'method'}
+    for BOOTSTRAP_METRICS at CI_LEVEL (percentile intervals).
+    """
+    weights = universe_weights(results)
+    n = len(weights)
+    if n < 2:
+        return None
+    universe_columns = np.column_stack([
+        weights * results['final_ga'], weights * results['contrib'], weights * results['tax'],
+        weights * results['insolvent_months'], weights,
+        weights * (results['gold_year'] != -1), weights * (results['final_ga'] < PLAY_GATE),
+    ]).astype(float)
+    columns, sizes = group_sums(universe_columns, universe_groups(results))
+    g = len(sizes)
+    if g < 2:
+        return None
+    rng = np.random.default_rng(seed)
+
+    # 1. Resampled column means (n_resamples, 7), resampling groups
+    if g * n_resamples <= BOOTSTRAP_EXACT_CELLS:
+        chunk = max(1, BOOTSTRAP_CHUNK_CELLS // g)
+        means = []
+        for first in range(0, n_resamples, chunk):
+            rows = min(chunk, n_resamples - first)
+            totals = rng.poisson(g, size=rows)
+            cells = np.repeat(np.arange(rows) * g, totals) + rng.integers(0, g, size=totals.sum())
+            counts = np.bincount(cells, minlength=rows * g).reshape(rows, g).astype(float)
+            drawn = counts @ sizes
+            keep = drawn > 0  # drop the (rare) empty resamples
+            means.append(counts[keep] @ columns / drawn[keep, None])
+        means = np.concatenate(means)
+        method = 'resample'
+    else:
+        center = universe_columns.mean(axis=0)
+        residuals = columns - sizes[:, None] * center
+        cov = residuals.T @ residuals * (g / max(g - 1, 1)) / (n * n)
+        means = rng.multivariate_normal(center, cov, size=n_resamples, method='eigh')
+        method = 'normal'
+
+    # 2. Scoreboard per resample (self-normalized means, unnormalized rates as in score_results)
+    total_w = np.maximum(means[:, 4], 1e-300)
+    avg_final_ga, avg_contrib, avg_tax, avg_insolvent = (means[:, i] / total_w for i in range(4))
+    _, score_gold, score_survival, score_cost, score_time, total_score = _score_components(
+        avg_final_ga, avg_contrib, avg_tax, avg_insolvent, means[:, 5], means[:, 6], total_months)
+    samples = dict(avg_final_ga=avg_final_ga, score_gold=score_gold, score_survival=score_survival,
+                   score_cost=score_cost, score_time=score_time, total_score=total_score)
+
+    # 3. Percentile intervals + grade probabilities
+    tail = (1 - CI_LEVEL) / 2 * 100
+    intervals = {m: np.percentile(samples[m], [tail, 100 - tail]).tolist() for m in BOOTSTRAP_METRICS}
+    floors = np.array([floor for floor, _ in GRADE_BANDS])
+    grades = [grade for _, grade in GRADE_BANDS] + ['F']
+    band = np.searchsorted(-floors, -total_score, side='left')  # 0 = A ... len(floors) = F
+    grade_probs = np.bincount(band, minlength=len(grades)) / len(band)
+    return {
+        'intervals': intervals,
+        'grade_probs': {g: float(p) for g, p in zip(grades, grade_probs)},
+        'resamples': len(band),
+        'method': method,
+    }
+
+
+# --- STATUS ATTAINMENT ---
+def first_hit_years(year_points: np.ndarray, thresholds) -> np.ndarray:
+    """(universes, thresholds) first career year (1-based) each points threshold was reached, -1 if never."""
+    hit = year_points[:, :, None] >= np.asarray(thresholds, dtype=float)
+    return np.where(hit.any(axis=1), hit.argmax(axis=1) + 1, -1).astype(np.int16)
+
+
+def status_attainment(results: dict, levels: dict) -> dict:
+    """
+    Every status level ({name: points}) from one run's yearly points:
+    {name: {'points', 'prob', 'se', 'avg_year', 'curve'}} where curve[y] is the
+    probability of having reached the level by the end of year y + 1.
+    """
+    if 'year_points' not in results or not levels:
+        return {}
+    weights = universe_weights(results)
+    groups = universe_groups(results)
+    first = first_hit_years(results['year_points'], list(levels.values()))
+    years = np.arange(1, results['year_points'].shape[1] + 1)
+
+    # (years, levels): weighted share of universes whose first hit is <= year
+    reached = (first[:, None, :] != -1) & (first[:, None, :] <= years[None, :, None])
+    curves = np.tensordot(weights, reached, axes=(0, 0)) / len(weights)
+
+    attainment = {}
+    for j, (name, points) in enumerate(levels.items()):
+        ever = first[:, j] != -1
+        prob, se = weighted_rate(ever, weights, groups)
+        avg_year = weighted_mean(first[ever, j], weights[ever]) if ever.any() else 0.0
+        attainment[name] = {'points': float(points), 'prob': prob, 'se': se, 'avg_year': float(avg_year),
+                            'curve': curves[:, j].tolist()}
+    return attainment
+
+
+# --- ANALYSIS SUMMARY ---
+@dataclass
+class AnalysisSummary:
+    """
+    Everything the results view draws, computed off the event loop by summarize().
+    Plain floats/lists only, so it pickles and round-trips through JSON.
+    """
+    n_results: int
+    num_sims: int
+    partial: bool
+    start_ga: float
+    total_months: int
+    status_name: str
+    score: dict
+    avg_year_hit: float
+    ess: float = None                            # effective sample size (importance sampling only)
+    bootstrap: dict = None                       # bootstrap_scores() intervals and grade odds
+    bands: dict = field(default_factory=dict)    # min/p25/p75/max/mean per month
+    status: dict = field(default_factory=dict)   # status_attainment() for every SBM level
+    use_holiday: bool = False                    # chart reference lines
+    use_tax: bool = False
+    report: str = ''
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, text: str) -> 'AnalysisSummary':
+        return cls(**json.loads(text))
+
+
+def summarize(results: dict, config: dict, overrides, partial: bool = False) -> AnalysisSummary:
+    """Pure, vectorized analysis stage. partial=True skips the text report."""
+    start_ga = config['start_ga']
+    total_months = config['years'] * 12
+    weights = universe_weights(results)
+    weighted = config.get('is_target', 'Off') != 'Off'
+
+    # 1. Confidence bands (months along axis 1)
+    trajectories = results['trajectory']
+    if weighted:
+        p25, p75 = (weighted_percentile(trajectories, weights, q, axis=0) for q in (25, 75))
+    else:
+        p25, p75 = np.percentile(trajectories, [25, 75], axis=0)
+    bands = {
+        'min': np.min(trajectories, axis=0), 'p25': p25, 'p75': p75,
+        'max': np.max(trajectories, axis=0), 'mean': weighted_mean(trajectories, weights, axis=0),
+    }
+
+    # 2. Scoreboard
+    score = score_results(results, total_months, start_ga)
+    gold_mask = results['gold_year'] != -1
+    avg_year_hit = weighted_mean(results['gold_year'][gold_mask], weights[gold_mask]) if gold_mask.any() else 0.0
+
+    summary = AnalysisSummary(
+        n_results=len(results['final_ga']),
+        num_sims=config['num_sims'],
+        partial=partial,
+        start_ga=float(start_ga),
+        total_months=total_months,
+        status_name=config['status_target_name'],
+        score={k: (v if isinstance(v, str) else float(v)) for k, v in score.items()},
+        avg_year_hit=float(avg_year_hit),
+        ess=float(effective_sample_size(weights)) if weighted else None,
+        bands={name: np.asarray(band, dtype=float).tolist() for name, band in bands.items()},
+        use_holiday=bool(config.get('use_holiday')),
+        use_tax=bool(config.get('use_tax')),
+        bootstrap=bootstrap_scores(results, total_months),
+    )
+    if not partial:
+        summary.status = status_attainment(results, config.get('status_levels', {}))
+        summary.report = build_report(summary, config, overrides)
+    return summary
+
+
+def build_report(summary: AnalysisSummary, config: dict, overrides) -> str:
+    """Plain-text report for the 'AI Analysis Data' panel."""
+    score = summary.score
+    depth = overrides.press_depth
+    st_depth = "Unlimited" if depth == 0 else f"{depth} steps"
+    st_ratch = f"ON ({config['ratchet_pct']}%)" if config.get('use_ratchet') else "OFF"
+    st_tax = f"ON (>€{config['tax_thresh']} @ {config['tax_rate']}%)" if config.get('use_tax') else "OFF"
+
+    lines = [
+        f"MONTE CARLO REPORT ({summary.n_results} Universes)",
+        f"STRATEGY GRADE: {score['grade']} ({score['total_score']:.1f}%)",
+        "-" * 40,
+        f"Target: {config.get('status_target_name', 'N/A')} ({config.get('status_target_pts', 0):,.0f} pts)",
+        f"Start GA: €{summary.start_ga:,.0f} | Final GA: €{score['avg_final_ga']:,.0f}",
+        f"Net Life Result: €{score['net_life_result']:,.0f} (Avg)",
+        f"True Cost: €{score['avg_monthly_cost']:,.0f}/month",
+        f"Active Play: {score['score_time']:.1f}% ({score['avg_insolvent']:.1f} months insolvent)",
+        f"Gold Prob: {score['score_gold']:.2f}% ± {score['gold_se'] * 100:.2f}%",
+        f"Ruin Prob: {score['ruin_rate'] * 100:.2f}% ± {score['ruin_se'] * 100:.2f}%",
+    ]
+    if summary.bootstrap:
+        ci = summary.bootstrap['intervals']
+        odds = ', '.join(f"{g} {p * 100:.0f}%" for g, p in summary.bootstrap['grade_probs'].items() if p > 0)
+        kind = 'bootstrap' if summary.bootstrap['method'] == 'resample' else 'normal approx.'
+        lines += [
+            f"Score {CI_LEVEL:.0%} CI ({kind}): {ci['total_score'][0]:.1f}-{ci['total_score'][1]:.1f}% | Grade Odds: {odds}",
+            f"Final GA {CI_LEVEL:.0%} CI ({kind}): €{ci['avg_final_ga'][0]:,.0f} - €{ci['avg_final_ga'][1]:,.0f}",
+        ]
+    if config.get('run_seed') is not None:
+        lines.append(f"Seed: {config['run_seed']}")
+    if config.get('sampling', 'Plain') != 'Plain':
+        lines.append(f"Universe Sampling: {config['sampling']} (errors over independent groups)")
+    if summary.ess is not None:
+        lines.append(f"Importance Sampling: {config['is_target']} (ESS {summary.ess:,.0f} of {summary.n_results})")
+    if summary.status:
+        lines.append("-" * 20 + " STATUS " + "-" * 20)
+        for name, level in summary.status.items():
+            hit_year = f" (avg year {level['avg_year']:.1f})" if level['prob'] > 0 else ""
+            lines.append(f"{name} ({level['points']:,.0f} pts): {level['prob'] * 100:.1f}% ± {level['se'] * 100:.1f}%{hit_year}")
+
+    lines += [
+        "-" * 20 + " INPUTS " + "-" * 20,
+        f"Iron Gate: {overrides.iron_gate_limit} Losses",
+        f"Progression: {overrides.progression}",
+        f"Press Logic: {overrides.press_trigger_wins} wins (Depth: {st_depth})",
+        f"Stop/Target: {overrides.stop_loss_units}u / {overrides.profit_lock_units}u",
+        f"Ratchet: {st_ratch}",
+        f"Ladder: {config.get('ladder_mode', 'Standard')} | Safety Buffer: {config.get('safety', 0)}x",
+    ]
+    if config.get('hand_source_label'):
+        lines.append(f"Hands: {config['hand_source_label']}")
+    lines += [
+        f"Contrib: Win=€{config.get('contrib_win', 0)}, Loss=€{config.get('contrib_loss', 0)}",
+        f"Tax: {st_tax}",
+        f"Holiday: {'ON' if config.get('use_holiday') else 'OFF'}",
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,184 @@
+import numpy as np
+from .ecosystem import calculate_luxury_tax, monthly_contribution, can_play
+from .kernel import compile_rules, draw_outcomes, run_sessions, trace_sessions, P_BANKER, P_PLAYER
+from .importance import session_log_weights
+from .sampling import uses_predraw, sample_outcomes
+from .tier_params import get_ladder
+from .trajectory import TRAJECTORY_DTYPE
+
+# Per-universe summary columns produced by every career run (name -> dtype)
+RESULT_COLUMNS = {
+    'final_ga': np.float64,
+    'contrib': np.float64,
+    'tax': np.float64,
+    'play_pnl': np.float64,
+    'holidays': np.int32,
+    'insolvent_months': np.int32,
+    'total_volume': np.float64,
+    'gold_year': np.int16,
+    'weight': np.float64,  # likelihood ratio (1.0 unless importance sampling is on)
+    'group': np.int32,     # independent sampling group (engine/sampling.py), named by its first universe
+    'sessions': np.int32,  # sessions played
+    'hands': np.int32,     # hands dealt across those sessions
+}
+# SBM points earned in each career year: (n_universes, career_years) next to the columns,
+# so every status threshold can be checked after a single run (engine/analysis.py)
+YEAR_POINTS_DTYPE = np.float64
+
+
+def career_years(total_months: int) -> int:
+    return -(-total_months // 12)
+
+
+def run_careers(n_universes: int, start_ga: float, total_months: int, sessions_per_year: int,
+                contrib_win: float, contrib_loss: float, overrides, use_ratchet: bool,
+                use_tax: bool, use_holiday: bool, safety_factor: int,
+                target_points: float, earn_rate: float, ladder_mode: str = 'Standard',
+                rng: np.random.Generator = None, should_stop=None, tilt=None,
+                trajectory_out: np.ndarray = None, columns_out: dict = None,
+                corpus=None, block_shoes: int = 1, session_outcomes: np.ndarray = None,
+                sampling: str = 'Plain', first_universe: int = 0, trace=None) -> dict:
+    """
+    Batched career engine: every universe advances month by month as array state.
+    Only universes with a session due (and past the play gate) are sent to the kernel.
+    Each universe carries its active tier level, so Titan hysteresis is honoured per universe.
+    With a `tilt` (engine/importance.py) hands are drawn from the tilted table and
+    'weight' holds each universe's likelihood ratio back to the real one.
+    With a `corpus` (engine/corpus.py) sessions replay recorded shoes instead,
+    drawn in runs of `block_shoes` consecutive shoes (tilt is then ignored).
+    `session_outcomes` (n_universes, sessions, hands) pre-draws every universe's
+    hands by session number, so runs with different settings see the same cards
+    (common random numbers, see engine/sensitivity.py).
+    `sampling` (engine/sampling.py SAMPLING_MODES) pre-draws them the same way with
+    stratified, antithetic or Sobol uniforms; 'group' then ties together universes
+    that share a stratification. `first_universe` is this batch's offset in the run
+    so group ids stay unique across batches.
+    With a `trace` (engine/tracing.py TraceRing) the sampled universes' sessions
+    are replayed hand by hand into its ring buffer.
+    GA per month is written straight into `trajectory_out` (e.g. a TrajectoryBuffer
+    row slice) when given, otherwise into a fresh float32 array. Likewise the
+    summary columns go into `columns_out` views (e.g. shared memory) when given.
+    Returns RESULT_COLUMNS arrays plus 'trajectory' (n_universes, total_months) and
+    'year_points' (n_universes, career_years), or None if `should_stop()` turned true
+    mid-run. 'gold_year' is the first year `target_points` was reached.
+    """
+    rng = rng or np.random.default_rng()
+    n = n_universes
+    rules = compile_rules(overrides, use_ratchet)
+    ladder = get_ladder(safety_factor, ladder_mode)
+    tax_thresh = overrides.tax_threshold
+    tax_rate = overrides.tax_rate / 100.0
+    points_per_euro = earn_rate / 100
+
+    ga = np.full(n, float(start_ga))
+    last_won = np.zeros(n, dtype=bool)
+    active_level = np.ones(n, dtype=np.int16)
+    sessions_played = np.zeros(n, dtype=np.int64)
+    if columns_out is not None and 'year_points' in columns_out:
+        year_points = columns_out['year_points']
+        year_points[:] = 0
+    else:
+        year_points = np.zeros((n, career_years(total_months)), dtype=YEAR_POINTS_DTYPE)
+    if columns_out is None:
+        out = {name: np.zeros(n, dtype=dtype) for name, dtype in RESULT_COLUMNS.items()}
+    else:
+        out = {name: columns_out[name] for name in RESULT_COLUMNS}
+        for column in out.values():
+            column[:] = 0
+    out['gold_year'][:] = -1
+    log_weight = np.zeros(n)
+    out['group'][:] = first_universe + np.arange(n)
+    if corpus is None and session_outcomes is None and uses_predraw(sampling):
+        total_sessions = int(total_months * (sessions_per_year / 12))
+        session_outcomes, groups = sample_outcomes(sampling, rng, n, total_sessions, P_BANKER, P_PLAYER)
+        out['group'][:] = first_universe + groups
+    if corpus is not None or session_outcomes is not None:
+        tilt = None
+    if tilt is None:
+        p_win, p_loss = P_BANKER, P_PLAYER
+    else:
+        p_win, p_loss = tilt.p_win, tilt.p_loss
+    trajectory = np.zeros((n, total_months), dtype=TRAJECTORY_DTYPE) if trajectory_out is None else trajectory_out
+
+    for m in range(total_months):
+        if should_stop is not None and should_stop():
+            return None
+        year = m // 12
+
+        # A. Luxury Tax
+        if use_tax:
+            tax = calculate_luxury_tax(ga, threshold=tax_thresh, rate=tax_rate)
+            ga -= tax
+            out['tax'] += tax
+
+        # B. Contribution
+        amount, on_holiday = monthly_contribution(ga, last_won, contrib_win, contrib_loss, use_holiday)
+        ga += amount
+        out['contrib'] += amount
+        out['holidays'] += on_holiday
+
+        # C. Play (gate checked once per month, like the table)
+        playing = can_play(ga)
+        out['insolvent_months'] += ~playing
+
+        expected_sessions = int((m + 1) * (sessions_per_year / 12))
+        sessions_due = np.where(playing, expected_sessions - sessions_played, 0)
+
+        for slot in range(int(sessions_due.max(initial=0))):
+            idx = np.flatnonzero(sessions_due > slot)
+            rung = ladder.indices_of(ga[idx], active_level[idx])
+            active_level[idx] = ladder.level_array[rung]
+            if session_outcomes is not None:
+                outcomes = session_outcomes[idx, sessions_played[idx]]
+                shoe_lengths = None
+            elif corpus is None:
+                outcomes = draw_outcomes(rng, len(idx), p_win, p_loss)
+                shoe_lengths = None
+            else:
+                outcomes, shoe_lengths = corpus.draw_sessions(rng, len(idx), block_shoes)
+            pnl, vol, hands = run_sessions(outcomes, ladder.base_units[rung], ladder.press_units[rung], rules, shoe_lengths)
+            if trace is not None:
+                traced = np.flatnonzero(trace.select(first_universe + idx, sessions_played[idx]))
+                if len(traced):
+                    trace_sessions(outcomes[traced], ladder.base_units[rung][traced], ladder.press_units[rung][traced], rules,
+                                   None if shoe_lengths is None else shoe_lengths[traced], trace.data, trace.cursor,
+                                   first_universe + idx[traced], sessions_played[idx][traced])
+            if tilt is not None:
+                log_weight[idx] += session_log_weights(outcomes, hands, tilt)
+
+            ga[idx] += pnl
+            out['play_pnl'][idx] += pnl
+            out['total_volume'][idx] += vol
+            out['hands'][idx] += hands
+            sessions_played[idx] += 1
+            last_won[idx] = pnl > 0
+            year_points[idx, year] += vol * points_per_euro
+
+        newly_gold = (out['gold_year'] == -1) & (year_points[:, year] >= target_points)
+        out['gold_year'][newly_gold] = year + 1
+
+        trajectory[:, m] = ga
+
+    out['final_ga'][:] = ga
+    out['sessions'][:] = sessions_played
+    out['weight'][:] = np.exp(log_weight)
+    out['trajectory'] = trajectory
+    out['year_points'] = year_points
+    return out
+
+
+def merge_results(batches: list, trajectories=None) -> dict:
+    """
+    Concatenates per-batch column dicts into one set of columns.
+    With a TrajectoryBuffer the trajectories are read from it (no copy) instead
+    of being concatenated.
+    """
+    batches = [b for b in batches if b is not None]
+    if not batches:
+        return {}
+    merged = {key: np.concatenate([b[key] for b in batches]) for key in batches[0] if key != 'trajectory'}
+    if trajectories is not None:
+        merged['trajectory'] = trajectories.gather([b['trajectory'] for b in batches])
+    else:
+        merged['trajectory'] = np.concatenate([b['trajectory'] for b in batches])
+    return merged
@@ -0,0 +1,203 @@
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process registry alone guards a run directory
+    fcntl = None
+
+# --- CHECKPOINTS ---
+# A long run is a fixed grid of batches, and batch i always draws from
+# SeedSequence(run_seed, spawn_key=(i,)), so its result depends only on the
+# config, the run seed and i. Each finished batch is written once to its own
+# .npz (tmp file + os.replace, so a crash never leaves a half-written batch) and
+# the manifest (config key, seed, finished batches, running totals) is replaced
+# atomically after it. Resuming re-submits only the missing batches and gives
+# bit-identical results to an uninterrupted run with the same seed.
+CHECKPOINT_DIR = os.environ.get('BACCARAT_CHECKPOINTS', 'checkpoints')
+CHECKPOINT_VERSION = 2   # bump when RESULT_COLUMNS change (older runs restart)
+CHECKPOINT_MIN_UNIVERSES = 2000   # smaller runs are quicker to redo than to checkpoint
+CHECKPOINT_KEEP = 5               # unfinished runs kept on disk (oldest pruned first)
+MANIFEST = 'manifest.json'
+LOCK_FILE = '.lock'
+
+# A run directory belongs to one live RunCheckpoint at a time: two clients with
+# the same settings and a blank seed share a key, and must not write the same
+# manifest or discard the directory under each other. Held by this process
+# (registry) and, where available, across processes (flock on LOCK_FILE).
+_active = set()
+_active_lock = threading.Lock()
+
+
+class CheckpointInUse(RuntimeError):
+    """Another run is already using this checkpoint directory."""
+
+
+def _try_lock(directory: str):
+    """Open + exclusively locked LOCK_FILE handle, or None if someone else holds it."""
+    handle = open(os.path.join(directory, LOCK_FILE), 'a')
+    if fcntl is None:
+        return handle
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+def config_key(config: dict, overrides, batch_size: int) -> str:
+    """Hash of everything that decides the batch grid and its results."""
+    payload = {
+        'version': CHECKPOINT_VERSION,
+        'config': config,
+        'overrides': dataclasses.asdict(overrides),
+        'batch_size': batch_size,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def batch_seed(run_seed: int, index: int) -> np.random.SeedSequence:
+    return np.random.SeedSequence(run_seed, spawn_key=(index,))
+
+
+def _atomic_write(path: str, write):
+    fd, tmp = tempfile.mkstemp(prefix='.tmp_', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class RunCheckpoint:
+    """
+    On-disk state of one run: finished batches plus a manifest. Holds the run
+    directory exclusively until discard() / close(); raises CheckpointInUse if
+    another live run already holds it.
+    """
+    def __init__(self, key: str, n_batches: int, batch_size: int, seed: int = None, directory: str = None):
+        self.directory = os.path.join(directory or CHECKPOINT_DIR, key)
+        self._lock = threading.Lock()
+        self._handle = None
+        with _active_lock:
+            if self.directory in _active:
+                raise CheckpointInUse(self.directory)
+            os.makedirs(self.directory, exist_ok=True)
+            self._handle = _try_lock(self.directory)
+            if self._handle is None:
+                raise CheckpointInUse(self.directory)
+            _active.add(self.directory)
+        try:
+            self._attach(key, n_batches, batch_size, seed)
+        except BaseException:
+            self.close()
+            raise
+
+    def _attach(self, key: str, n_batches: int, batch_size: int, seed):
+        manifest = self._read_manifest()
+        if manifest and manifest['n_batches'] == n_batches and (seed is None or manifest['seed'] == seed):
+            self.manifest = manifest
+        else:
+            self._clear()
+            self.manifest = {
+                'key': key, 'version': CHECKPOINT_VERSION,
+                'seed': seed if seed is not None else int(np.random.SeedSequence().entropy % (2 ** 63)),
+                'n_batches': n_batches, 'batch_size': batch_size,
+                'completed': [],
+                'totals': {'universes': 0, 'final_ga_sum': 0.0, 'ruined': 0},
+                'updated': time.time(),
+            }
+        self.resumed = self.manifest['totals']['universes']   # universes already on disk at (re)start
+        _prune(os.path.dirname(self.directory), keep=self.directory)
+
+    @property
+    def seed(self) -> int:
+        return self.manifest['seed']
+
+    @property
+    def completed(self) -> set:
+        return set(self.manifest['completed'])
+
+    def _batch_path(self, index: int) -> str:
+        return os.path.join(self.directory, f'batch_{index:06d}.npz')
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.directory, MANIFEST)) as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return manifest if manifest.get('version') == CHECKPOINT_VERSION else None
+
+    def save_batch(self, index: int, result: dict, play_gate: float):
+        """Persists one finished batch (RESULT_COLUMNS + 'trajectory'), then the manifest."""
+        arrays = {name: np.asarray(values) for name, values in result.items()}
+        _atomic_write(self._batch_path(index), lambda f: np.savez(f, **arrays))
+        with self._lock:
+            totals = self.manifest['totals']
+            totals['universes'] += len(arrays['final_ga'])
+            totals['final_ga_sum'] += float(arrays['final_ga'].sum())
+            totals['ruined'] += int((arrays['final_ga'] < play_gate).sum())
+            self.manifest['completed'].append(index)
+            self.manifest['updated'] = time.time()
+            text = json.dumps(self.manifest).encode()
+            _atomic_write(os.path.join(self.directory, MANIFEST), lambda f: f.write(text))
+
+    def load_batch(self, index: int) -> dict:
+        with np.load(self._batch_path(index)) as data:
+            return {name: data[name] for name in data.files}
+
+    def _clear(self):
+        """Removes every file but the held lock file."""
+        for name in os.listdir(self.directory):
+            if name != LOCK_FILE:
+                os.remove(os.path.join(self.directory, name))
+
+    def close(self):
+        """Releases the directory, keeping its batches for a later resume."""
+        with _active_lock:
+            if self._handle is None:
+                return
+            self._handle.close()  # drops the flock
+            self._handle = None
+            _active.discard(self.directory)
+
+    def discard(self):
+        """Deletes the run's batches (finished run), then releases the directory."""
+        with _active_lock:
+            if self._handle is not None:
+                shutil.rmtree(self.directory, ignore_errors=True)
+        self.close()
+
+
+def _prune(root: str, keep: str):
+    """Drops the oldest unfinished runs beyond CHECKPOINT_KEEP (never one that is in use)."""
+    runs = [os.path.join(root, d) for d in os.listdir(root) if os.path.isdir(os.path.join(root, d))]
+    runs = [r for r in runs if r != keep]
+    runs.sort(key=lambda r: os.path.getmtime(r), reverse=True)
+    for stale in runs[CHECKPOINT_KEEP - 1:]:
+        with _active_lock:
+            if stale in _active:
+                continue
+            handle = _try_lock(stale)
+            if handle is None:
+                continue
+            try:
+                shutil.rmtree(stale, ignore_errors=True)
+            finally:
+                handle.close()
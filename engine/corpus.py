@@ -0,0 +1,165 @@
+import csv
+import os
+from functools import lru_cache
+import numpy as np
+from .kernel import OUT_LOSS, OUT_WIN, OUT_TIE, SHOES_PER_SESSION
+from .roads import iter_shoes
+
+# --- CORPUS FORMAT ---
+# <name>.hands      raw bytes, 4 hands per byte (2 bits each, low bits first),
+#                   codes = kernel outcome codes (0 Player, 1 Banker, 2 Tie)
+# <name>.shoes.npy  int64 hand offsets, one per shoe plus the end (n_shoes + 1)
+# Both are memory-mapped on open, so even multi-GB archives load instantly and
+# only the pages of the shoes actually drawn are ever read.
+CORPUS_DIR = 'corpora'
+HANDS_EXT = '.hands'
+SHOES_EXT = '.shoes.npy'
+HAND_CODES = {'P': OUT_LOSS, 'B': OUT_WIN, 'T': OUT_TIE}
+
+# Hands buffered by the writer before a packed chunk hits the disk
+WRITE_CHUNK = 1 << 20
+
+
+def pack_hands(codes: np.ndarray) -> np.ndarray:
+    """2-bit packing; len(codes) must be a multiple of 4."""
+    c = codes.astype(np.uint8).reshape(-1, 4)
+    return c[:, 0] | (c[:, 1] << 2) | (c[:, 2] << 4) | (c[:, 3] << 6)
+
+
+class CorpusWriter:
+    """Streams shoes into a corpus without holding the archive in memory."""
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path + HANDS_EXT, 'wb')
+        self._pending = []
+        self._pending_len = 0
+        self._offsets = [0]
+
+    def add_shoe(self, hands):
+        """hands: 'B'/'P'/'T' sequence or kernel outcome codes."""
+        if len(hands) and isinstance(hands[0], str):
+            codes = np.fromiter((HAND_CODES[h] for h in hands), dtype=np.uint8, count=len(hands))
+        else:
+            codes = np.asarray(hands, dtype=np.uint8)
+        self._pending.append(codes)
+        self._pending_len += len(codes)
+        self._offsets.append(self._offsets[-1] + len(codes))
+        if self._pending_len >= WRITE_CHUNK:
+            self._flush()
+
+    def _flush(self, final: bool = False):
+        codes = np.concatenate(self._pending) if self._pending else np.zeros(0, dtype=np.uint8)
+        whole = len(codes) - len(codes) % 4
+        if final and whole < len(codes):
+            codes = np.concatenate([codes, np.zeros(4 - len(codes) % 4, dtype=np.uint8)])
+            whole = len(codes)
+        self._file.write(pack_hands(codes[:whole]).tobytes())
+        rest = codes[whole:]
+        self._pending = [rest] if len(rest) else []
+        self._pending_len = len(rest)
+
+    def close(self):
+        self._flush(final=True)
+        self._file.close()
+        np.save(self.path + SHOES_EXT, np.asarray(self._offsets, dtype=np.int64))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def import_csv(source: str, path: str, shoe_per_row: bool = False) -> int:
+    """
+    Streams a CSV/road export (see engine/roads.py for the accepted tokens) into a
+    corpus at `path`. Returns the number of shoes written.
+    """
+    n_shoes = 0
+    with open(source, newline='') as f, CorpusWriter(path) as writer:
+        sample = f.read(4096)
+        f.seek(0)
+        delimiter = max((',', ';', '\t'), key=sample.count)
+        for shoe in iter_shoes(csv.reader(f, delimiter=delimiter), skip_header=True, shoe_per_row=shoe_per_row):
+            writer.add_shoe(shoe)
+            n_shoes += 1
+    return n_shoes
+
+
+# --- READER ---
+class ShoeCorpus:
+    def __init__(self, path: str):
+        self.path = path
+        self.offsets = np.load(path + SHOES_EXT, mmap_mode='r')
+        self.n_shoes = len(self.offsets) - 1
+        if self.n_shoes < 1:
+            raise ValueError(f"{path}: corpus has no shoes")
+        self.packed = np.memmap(path + HANDS_EXT, dtype=np.uint8, mode='r')
+        self.lengths = np.diff(self.offsets)
+        self.max_shoe = int(self.lengths.max())
+
+    def __reduce__(self):
+        # Reopen by path in worker processes instead of pickling the mapped data
+        return (open_corpus, (self.path,))
+
+    @property
+    def n_hands(self) -> int:
+        return int(self.offsets[-1])
+
+    def hands(self, index: np.ndarray) -> np.ndarray:
+        """Outcome codes at absolute hand positions (any shape)."""
+        byte = self.packed[index >> 2]
+        return ((byte >> ((index & 3) << 1).astype(np.uint8)) & 3).astype(np.int8)
+
+    def shoe(self, i: int) -> np.ndarray:
+        return self.hands(np.arange(self.offsets[i], self.offsets[i + 1]))
+
+    def draw_sessions(self, rng: np.random.Generator, n_sessions: int, block: int = 1):
+        """
+        Outcome rows (n_sessions, 3 * longest shoe) plus shoe lengths (n_sessions, 3)
+        for the kernel. block=1 draws every shoe independently; block=b draws runs of
+        b consecutive recorded shoes (moving-block bootstrap), so block=3 replays real
+        3-shoe stretches.
+        """
+        block = max(1, min(block, self.n_shoes))
+        slot = np.arange(SHOES_PER_SESSION)
+        n_blocks = -(-SHOES_PER_SESSION // block)
+        starts = rng.integers(0, self.n_shoes - block + 1, size=(n_sessions, n_blocks))
+        shoes = starts[:, slot // block] + slot % block
+
+        lengths = self.lengths[shoes].astype(np.int32)
+        width = SHOES_PER_SESSION * self.max_shoe
+        # Row layout: shoe 1 hands, then shoe 2, then shoe 3, padded with ties past the end
+        session_start = np.concatenate([np.zeros((n_sessions, 1), dtype=np.int64), np.cumsum(lengths, axis=1)[:, :-1]], axis=1)
+        k = np.arange(width)
+        which = (k[None, :, None] >= session_start[:, None, :]).sum(axis=2) - 1
+        pos = k[None, :] - np.take_along_axis(session_start, which, axis=1)
+        valid = pos < np.take_along_axis(lengths, which, axis=1)
+        index = np.take_along_axis(self.offsets[shoes], which, axis=1) + np.where(valid, pos, 0)
+        outcomes = np.where(valid, self.hands(index), OUT_TIE).astype(np.int8)
+        return outcomes, lengths
+
+
+@lru_cache(maxsize=8)
+def open_corpus(path: str) -> ShoeCorpus:
+    return ShoeCorpus(path)
+
+
+def list_corpora(directory: str = CORPUS_DIR) -> list:
+    """Corpus paths (without extension) found in `directory`."""
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(f[:-len(SHOES_EXT)] for f in os.listdir(directory) if f.endswith(SHOES_EXT))
+    return [os.path.join(directory, name) for name in names if os.path.exists(os.path.join(directory, name + HANDS_EXT))]
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Import a shoe CSV/road export into a packed corpus.')
+    parser.add_argument('source')
+    parser.add_argument('name', help=f'corpus name (written to {CORPUS_DIR}/)')
+    parser.add_argument('--shoe-per-row', action='store_true', help='every CSV row is one shoe')
+    args = parser.parse_args()
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    count = import_csv(args.source, os.path.join(CORPUS_DIR, args.name), args.shoe_per_row)
+    print(f"Imported {count} shoes into {CORPUS_DIR}/{args.name}")
@@ -1,5 +1,11 @@
 from dataclasses import dataclass
 from typing import List
+import numpy as np
+
+# --- ECOSYSTEM CONSTANTS ---
+PLAY_GATE = 1500           # Minimum GA to sit down for a session
+HOLIDAY_THRESHOLD = 10000  # GA above which monthly contributions pause
+INSOLVENCY_LINE = 1000     # Hard floor: stop the year
 
 @dataclass
 class YearState:
@@ -16,21 +22,35 @@ class YearState:
     def ytd_pnl(self) -> float:
         return self.play_pnl - self.luxury_tax
 
-def calculate_luxury_tax(ga: float, current_lt: float) -> float:
+def calculate_luxury_tax(ga, current_lt: float = 0.0, threshold: float = 12500, rate: float = 0.25):
     """
     6. LUXURY TAX
     If GA > 12,500 -> Withdraw 25% of surplus.
+    Works on a scalar GA or an array of GAs (one per universe).
+    """
+    tax = np.maximum(np.asarray(ga, dtype=np.float64) - threshold, 0.0) * rate
+    return float(tax) if tax.ndim == 0 else tax
+
+def monthly_contribution(ga, last_session_won, contrib_win: float, contrib_loss: float, use_holiday: bool = True):
     """
-    threshold = 12500
-    if ga > threshold:
-        surplus = ga - threshold
-        tax = surplus * 0.25
-        return tax
-    return 0.0
+    Monthly top-up: Win/Loss amount depending on the last session.
+    Holiday: no contribution while GA >= 10,000.
+    Returns (amount, on_holiday), scalar or per-universe arrays.
+    """
+    ga = np.asarray(ga, dtype=np.float64)
+    on_holiday = (ga >= HOLIDAY_THRESHOLD) if use_holiday else np.zeros(ga.shape, dtype=bool)
+    amount = np.where(on_holiday, 0.0, np.where(last_session_won, contrib_win, contrib_loss))
+    if amount.ndim == 0:
+        return float(amount), bool(on_holiday)
+    return amount, on_holiday
+
+def can_play(ga):
+    """Play gate: a session needs GA >= 1,500."""
+    return np.asarray(ga) >= PLAY_GATE
 
 def check_insolvency(ga: float) -> bool:
     """
     4.2 FINANCIAL DEFENSE
     Trigger: GA < 1,000 -> STOP YEAR.
     """
-    return ga < 1000
+    return ga < INSOLVENCY_LINE
@@ -0,0 +1,124 @@
+import math
+from dataclasses import dataclass
+import numpy as np
+from .kernel import P_BANKER, P_PLAYER, HANDS_PER_SESSION, OUT_LOSS, OUT_WIN, OUT_TIE
+
+# --- IMPORTANCE SAMPLING ---
+# Hands are drawn from tilted Banker/Player probabilities (tie rate unchanged) and
+# every universe carries the likelihood ratio true/tilted of the hands it consumed.
+# Weighted averages over universes are then unbiased for the real table.
+
+# Tilt size per unit of 1/sqrt(hands): strong enough to hit the tail, mild enough to keep the weights stable
+TILT_SCALE = 1.0
+MAX_SHIFT = 0.02
+
+# Rare-event targets: which way the hands are pushed
+TARGETS = {
+    'Off': 0,
+    'Ruin': -1,     # more Player hands -> more insolvency paths
+    'Status': +1,   # more Banker hands -> bigger tiers -> more volume/points
+}
+
+
+@dataclass(frozen=True)
+class Tilt:
+    p_win: float
+    p_loss: float
+
+    @property
+    def p_tie(self) -> float:
+        return 1.0 - self.p_win - self.p_loss
+
+    @property
+    def log_ratios(self) -> np.ndarray:
+        """log(p_true / p_tilted) indexed by outcome code."""
+        ratios = np.zeros(3)
+        ratios[OUT_LOSS] = math.log(P_PLAYER / self.p_loss)
+        ratios[OUT_WIN] = math.log(P_BANKER / self.p_win)
+        ratios[OUT_TIE] = 0.0
+        return ratios
+
+
+def make_tilt(target: str, total_sessions: int):
+    """Tilt for a rare-event target sized to the career length, or None when off."""
+    direction = TARGETS.get(target, 0)
+    if direction == 0 or total_sessions <= 0:
+        return None
+    shift = min(MAX_SHIFT, TILT_SCALE / math.sqrt(total_sessions * HANDS_PER_SESSION))
+    return Tilt(p_win=P_BANKER + direction * shift, p_loss=P_PLAYER - direction * shift)
+
+
+def session_log_weights(outcomes: np.ndarray, hands: np.ndarray, tilt: Tilt) -> np.ndarray:
+    """Log likelihood ratio of each session, counting only the hands it actually consumed."""
+    consumed = np.arange(outcomes.shape[1]) < np.asarray(hands)[:, None]
+    return np.where(consumed, tilt.log_ratios[outcomes], 0.0).sum(axis=1)
+
+
+# --- WEIGHTED ESTIMATORS ---
+def universe_weights(results: dict) -> np.ndarray:
+    """Likelihood-ratio weight per universe (all ones for plain Monte Carlo)."""
+    if 'weight' in results:
+        return results['weight']
+    return np.ones(len(results['final_ga']))
+
+
+def universe_groups(results: dict):
+    """Independent sampling group per universe (engine/sampling.py), or None when every universe is its own."""
+    groups = results.get('group')
+    if groups is None or len(np.unique(groups)) in (0, len(groups)):
+        return None
+    return groups
+
+
+def group_sums(columns: np.ndarray, groups) -> tuple:
+    """(per-group column sums, group sizes); identity when groups is None."""
+    if groups is None:
+        return columns, np.ones(len(columns))
+    _, inverse, sizes = np.unique(groups, return_inverse=True, return_counts=True)
+    sums = np.zeros((len(sizes),) + columns.shape[1:])
+    np.add.at(sums, inverse, columns)
+    return sums, sizes.astype(float)
+
+
+def weighted_rate(event: np.ndarray, weights: np.ndarray, groups=None):
+    """
+    Unbiased P(event) and its standard error. With sampling `groups` the error is
+    computed over the independent groups (cluster formula) instead of universes.
+    """
+    values = weights * event
+    n = len(values)
+    if n == 0:
+        return 0.0, 0.0
+    rate = float(values.mean())
+    sums, sizes = group_sums(values, groups)
+    g = len(sums)
+    se = math.sqrt(g / (g - 1) * np.sum((sums - rate * sizes) ** 2)) / n if g > 1 else 0.0
+    return rate, float(se)
+
+
+def weighted_mean(values: np.ndarray, weights: np.ndarray, axis: int = 0):
+    """Self-normalized weighted mean (equals the plain mean when all weights are 1)."""
+    return np.sum(values * _expand(weights, values, axis), axis=axis) / np.sum(weights)
+
+
+def weighted_percentile(values: np.ndarray, weights: np.ndarray, q: float, axis: int = 0):
+    """Percentile q (0-100) of `values` along `axis` under per-universe weights."""
+    order = np.argsort(values, axis=axis)
+    sorted_values = np.take_along_axis(values, order, axis=axis)
+    cum = np.cumsum(np.take(weights, order), axis=axis)
+    target = q / 100.0 * cum.take(-1, axis=axis)
+    idx = np.sum(cum < np.expand_dims(target, axis), axis=axis)
+    idx = np.minimum(idx, values.shape[axis] - 1)
+    return np.take_along_axis(sorted_values, np.expand_dims(idx, axis), axis=axis).squeeze(axis)
+
+
+def effective_sample_size(weights: np.ndarray) -> float:
+    """Kish effective sample size: how many plain universes the weighted run is worth."""
+    total = weights.sum()
+    return float(total * total / np.sum(weights * weights)) if total > 0 else 0.0
+
+
+def _expand(weights, values, axis):
+    shape = [1] * values.ndim
+    shape[axis] = len(weights)
+    return weights.reshape(shape)
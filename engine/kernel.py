@@ -0,0 +1,385 @@
+import math
+import os
+import numpy as np
+from .progressions import get_progression, KIND_CODES, MAX_SEQUENCE
+
+# --- OPTIONAL JIT ---
+# Numba is auto-detected. Without it (or with BACCARAT_NO_JIT=1) the exact same
+# kernel source runs as plain Python, so results never depend on the backend.
+try:
+    if os.environ.get('BACCARAT_NO_JIT'):
+        raise ImportError
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+KERNEL_BACKEND = 'numba' if HAS_NUMBA else 'python'
+
+# --- TABLE MODEL ---
+P_BANKER = 0.4586
+P_PLAYER = 0.4462
+BANKER_PAYOUT = 0.95
+HANDS_PER_SHOE = 80
+SHOES_PER_SESSION = 3
+HANDS_PER_SESSION = HANDS_PER_SHOE * SHOES_PER_SESSION  # every hand (ties too) advances the shoe
+
+# Hand outcome codes (we always bet Banker)
+OUT_LOSS = 0
+OUT_WIN = 1
+OUT_TIE = 2
+
+# --- RULES VECTOR (primitive layout shared by every backend) ---
+R_STOP_UNITS = 0
+R_PROFIT_UNITS = 1
+R_IRON_GATE = 2
+R_PRESS_TRIGGER = 3
+R_PRESS_DEPTH = 4
+R_RATCHET = 5
+R_RATCHET_PCT = 6
+R_PROG_KIND = 7       # engine/progressions.py KIND_CODES (0 = Sniper)
+R_PROG_STEP = 8
+R_PROG_MAX = 9
+R_PROG_LEN = 10
+R_PROG_UNITS = 11     # MAX_SEQUENCE slots
+N_RULES = R_PROG_UNITS + MAX_SEQUENCE
+
+# --- TRACE CODES (hand-level tracing, engine/tracing.py) ---
+MODE_NORMAL = 0
+MODE_WATCHER = 1
+MODE_COOLDOWN = 2
+# Why the bet was sized as it was
+REASON_BASE = 0
+REASON_PRESS = 1
+REASON_PROGRESSION = 2
+REASON_WATCH = 3       # iron gate tripped: watching, no bet
+REASON_COOLDOWN = 4
+# Why the session ended (on the closing row, outcome = -1)
+END_STOP_LOSS = 10
+END_PROFIT_LOCK = 11
+END_SHOE3_TRAIL = 12
+END_RATCHET = 13
+END_SHOES_DONE = 14
+
+PROG_SNIPER = KIND_CODES['sniper']
+PROG_SEQUENCE = KIND_CODES['sequence']
+PROG_ADDITIVE = KIND_CODES['additive']
+PROG_OSCAR = KIND_CODES['oscar']
+
+
+def compile_rules(overrides, use_ratchet: bool = False) -> np.ndarray:
+    """Packs StrategyOverrides (and its progression spec) into the flat float64 rules vector the kernel reads."""
+    rules = np.zeros(N_RULES, dtype=np.float64)
+    rules[R_STOP_UNITS] = overrides.stop_loss_units
+    rules[R_PROFIT_UNITS] = overrides.profit_lock_units
+    rules[R_IRON_GATE] = overrides.iron_gate_limit
+    rules[R_PRESS_TRIGGER] = overrides.press_trigger_wins
+    rules[R_PRESS_DEPTH] = overrides.press_depth
+    rules[R_RATCHET] = 1.0 if use_ratchet else 0.0
+    rules[R_RATCHET_PCT] = overrides.ratchet_lock_pct
+
+    spec = get_progression(overrides.progression)
+    rules[R_PROG_KIND] = KIND_CODES[spec.kind]
+    rules[R_PROG_STEP] = spec.step
+    rules[R_PROG_MAX] = spec.max_units
+    rules[R_PROG_LEN] = len(spec.units)
+    rules[R_PROG_UNITS:R_PROG_UNITS + len(spec.units)] = spec.units
+    return rules
+
+
+def draw_outcomes(rng: np.random.Generator, n_sessions: int, p_win: float = P_BANKER, p_loss: float = P_PLAYER) -> np.ndarray:
+    """(n_sessions, HANDS_PER_SESSION) int8 outcome matrix, one uniform per hand."""
+    u = rng.random((n_sessions, HANDS_PER_SESSION))
+    return uniforms_to_outcomes(u, p_win, p_loss)
+
+
+def uniforms_to_outcomes(u: np.ndarray, p_win: float = P_BANKER, p_loss: float = P_PLAYER) -> np.ndarray:
+    out = np.full(u.shape, OUT_TIE, dtype=np.int8)
+    out[u < (p_win + p_loss)] = OUT_LOSS
+    out[u < p_win] = OUT_WIN
+    return out
+
+
+def _trace_write(trace, cursor, universe, session, hand, shoe, bet, reason, outcome, pnl, mode, wins, losses):
+    """Appends one row to a TRACE_DTYPE ring buffer (cursor[0] counts every row ever written)."""
+    row = trace[cursor[0] % trace.shape[0]]
+    cursor[0] += 1
+    row['universe'] = universe
+    row['session'] = session
+    row['hand'] = hand
+    row['shoe'] = shoe
+    row['bet'] = bet
+    row['reason'] = reason
+    row['outcome'] = outcome
+    row['pnl'] = pnl
+    row['mode'] = mode
+    row['wins'] = wins
+    row['losses'] = losses
+
+
+if HAS_NUMBA:
+    _trace_write = njit(cache=True)(_trace_write)
+
+
+def _session_core(outcomes, base, press, rules, shoe_lengths, trace=None, cursor=None, universe=0, session=0):
+    """
+    One 3-shoe session, same semantics as SimulationWorker.run_session with overrides.
+    shoe_lengths[s] is the number of hands in shoe s+1 (HANDS_PER_SHOE for synthetic
+    shoes, the recorded length when backtesting a corpus).
+    With a `trace` ring (engine/tracing.py) every hand and the end of the session
+    are recorded; the untraced path never touches it.
+    Returns (session_pnl, volume, hands_consumed).
+    """
+    stop_limit = base * -rules[R_STOP_UNITS]
+    use_ratchet = rules[R_RATCHET] > 0
+    if use_ratchet:
+        profit_limit = base * 1000
+        trigger_amount = rules[R_PROFIT_UNITS] * base
+        lock_floor = trigger_amount * (rules[R_RATCHET_PCT] / 100.0)
+    else:
+        profit_limit = base * rules[R_PROFIT_UNITS]
+        trigger_amount = 0.0
+        lock_floor = 0.0
+    iron_limit = rules[R_IRON_GATE]
+    trigger_wins = rules[R_PRESS_TRIGGER]
+    max_depth = rules[R_PRESS_DEPTH] if rules[R_PRESS_DEPTH] > 0 else 999
+    prog_kind = int(rules[R_PROG_KIND])
+    prog_step = int(rules[R_PROG_STEP])
+    prog_max = int(rules[R_PROG_MAX])
+    prog_len = int(rules[R_PROG_LEN])
+
+    pnl = 0.0
+    volume = 0.0
+    shoe = 1
+    hands_in_shoe = 0
+    press_streak = 0
+    wins = 0
+    losses = 0
+    watcher = False
+    cooldown = 0
+    shoe3_start = 0.0
+    ratchet_on = False
+    prog_index = 0
+    prog_units = 1
+    prog_cycle = 0.0
+    i = 0
+    end_reason = END_SHOES_DONE
+    mode = MODE_NORMAL
+
+    while shoe <= SHOES_PER_SESSION:
+        # 1. STOP CONDITIONS
+        if pnl <= stop_limit:
+            end_reason = END_STOP_LOSS
+            break
+        if pnl >= profit_limit:
+            end_reason = END_PROFIT_LOCK
+            break
+        if shoe == 3 and shoe3_start >= base * 5 and pnl <= base:
+            end_reason = END_SHOE3_TRAIL
+            break
+
+        # 2. BET SIZING
+        prog_active = prog_kind != PROG_SNIPER and not watcher and cooldown == 0
+        reason = REASON_BASE
+        if watcher:
+            bet = 0.0
+            reason = REASON_WATCH
+        elif cooldown > 0:
+            bet = base
+            reason = REASON_COOLDOWN
+        elif prog_active:
+            reason = REASON_PROGRESSION
+            if prog_kind == PROG_SEQUENCE:
+                bet = base * rules[R_PROG_UNITS + prog_index]
+            else:
+                bet = base * prog_units
+        else:
+            bet = base
+            if trigger_wins > 0 and wins >= trigger_wins and press_streak < max_depth:
+                bet = press
+                reason = REASON_PRESS
+        volume += bet
+
+        if use_ratchet:
+            if not ratchet_on and pnl >= trigger_amount:
+                ratchet_on = True
+            if ratchet_on and pnl <= lock_floor:
+                end_reason = END_RATCHET
+                break
+        mode = MODE_WATCHER if watcher else MODE_COOLDOWN if cooldown > 0 else MODE_NORMAL
+
+        # 3. HAND
+        o = outcomes[i]
+        i += 1
+        if o == OUT_TIE:
+            hands_in_shoe += 1
+        else:
+            won = o == OUT_WIN
+            amount = bet * BANKER_PAYOUT if won else -bet
+            pnl += amount
+            hands_in_shoe += 1
+            if watcher:
+                if won:
+                    watcher = False
+                    wins = 0
+                    losses = 0
+                    cooldown = 3
+            else:
+                if prog_active:
+                    if prog_kind == PROG_SEQUENCE:
+                        prog_index = prog_index + 1 if won else 0
+                        if prog_index >= prog_len:
+                            prog_index = 0
+                    elif prog_kind == PROG_ADDITIVE:
+                        if won:
+                            prog_units = max(1, prog_units - prog_step)
+                        else:
+                            prog_units = min(prog_max, prog_units + prog_step)
+                    elif prog_kind == PROG_OSCAR:
+                        prog_cycle += amount
+                        if won:
+                            if prog_cycle >= base:
+                                prog_cycle = 0.0
+                                prog_units = 1
+                            else:
+                                needed = math.ceil((base - prog_cycle) / base)
+                                prog_units = max(1, min(prog_units + 1, prog_max, needed))
+
+                if won:
+                    wins += 1
+                    losses = 0
+                    if cooldown > 0:
+                        cooldown -= 1
+                    if amount > base:
+                        press_streak += 1
+                else:
+                    losses += 1
+                    wins = 0
+                    press_streak = 0
+                    if losses >= iron_limit:
+                        watcher = True
+                        prog_index = 0
+                        prog_units = 1
+                        prog_cycle = 0.0
+
+        if trace is not None:
+            _trace_write(trace, cursor, universe, session, i, shoe, bet, reason, o, pnl, mode, wins, losses)
+
+        # 4. SHOE CHANGE
+        if hands_in_shoe >= shoe_lengths[shoe - 1]:
+            shoe += 1
+            hands_in_shoe = 0
+            if shoe == 3:
+                shoe3_start = pnl
+
+    if trace is not None:
+        mode = MODE_WATCHER if watcher else MODE_COOLDOWN if cooldown > 0 else MODE_NORMAL
+        _trace_write(trace, cursor, universe, session, i, min(shoe, SHOES_PER_SESSION), 0.0, end_reason, -1, pnl, mode, wins, losses)
+    return pnl, volume, i
+
+
+def _run_sessions_core(outcomes, bases, presses, rules, shoe_lengths, pnl_out, vol_out, hands_out):
+    for k in range(outcomes.shape[0]):
+        pnl, vol, hands = session_kernel(outcomes[k], bases[k], presses[k], rules, shoe_lengths[k])
+        pnl_out[k] = pnl
+        vol_out[k] = vol
+        hands_out[k] = hands
+
+
+if HAS_NUMBA:
+    session_kernel = njit(cache=True)(_session_core)
+    _run_sessions_jit = njit(cache=True)(_run_sessions_core)
+else:
+    session_kernel = _session_core
+
+
+def run_sessions(outcomes: np.ndarray, bases: np.ndarray, presses: np.ndarray, rules: np.ndarray,
+                 shoe_lengths: np.ndarray = None):
+    """
+    Batched kernel: row k of `outcomes` is played at bases[k]/presses[k].
+    shoe_lengths (n, 3) gives per-session shoe sizes (default HANDS_PER_SHOE each).
+    Returns (pnl, volume, hands) arrays.
+    """
+    n = outcomes.shape[0]
+    if shoe_lengths is None:
+        shoe_lengths = np.full((n, SHOES_PER_SESSION), HANDS_PER_SHOE, dtype=np.int32)
+    pnl = np.zeros(n, dtype=np.float64)
+    vol = np.zeros(n, dtype=np.float64)
+    hands = np.zeros(n, dtype=np.int32)
+    if n == 0:
+        return pnl, vol, hands
+
+    if HAS_NUMBA:
+        _run_sessions_jit(outcomes, np.asarray(bases, dtype=np.float64), np.asarray(presses, dtype=np.float64), rules, np.asarray(shoe_lengths, dtype=np.int32), pnl, vol, hands)
+    else:
+        # Python lists index ~10x faster than numpy scalars
+        rows = outcomes.tolist()
+        b = np.asarray(bases, dtype=np.float64).tolist()
+        p = np.asarray(presses, dtype=np.float64).tolist()
+        r = rules.tolist()
+        lengths = np.asarray(shoe_lengths).tolist()
+        for k in range(n):
+            pnl[k], vol[k], hands[k] = _session_core(rows[k], b[k], p[k], r, lengths[k])
+    return pnl, vol, hands
+
+
+def trace_sessions(outcomes: np.ndarray, bases: np.ndarray, presses: np.ndarray, rules: np.ndarray,
+                   shoe_lengths, trace: np.ndarray, cursor: np.ndarray, universes: np.ndarray, sessions: np.ndarray):
+    """
+    Replays sessions (already played by run_sessions) with hand-level tracing into
+    a TRACE_DTYPE ring. Only the sampled few come through here.
+    """
+    n = outcomes.shape[0]
+    if shoe_lengths is None:
+        shoe_lengths = np.full((n, SHOES_PER_SESSION), HANDS_PER_SHOE, dtype=np.int32)
+    for k in range(n):
+        session_kernel(outcomes[k], float(bases[k]), float(presses[k]), rules, np.asarray(shoe_lengths[k], dtype=np.int32),
+                       trace, cursor, int(universes[k]), int(sessions[k]))
+
+
+def self_check(n_sessions: int = 2000, seed: int = 7) -> dict:
+    """
+    Plays the same hand draws through the reference BaccaratStrategist path and
+    the kernel, for several rule sets/tiers. Identical draws must give identical
+    sessions, which makes the two engines statistically identical by construction.
+    """
+    from .simulation import SimulationWorker
+    from .strategy_rules import StrategyOverrides
+    from .tier_params import get_ladder
+
+    rng = np.random.default_rng(seed)
+    cases = [
+        (StrategyOverrides(), False, 'Standard', 1700.0),
+        (StrategyOverrides(iron_gate_limit=2, press_trigger_wins=1, press_depth=0), False, 'Titan', 2500.0),
+        (StrategyOverrides(stop_loss_units=8, profit_lock_units=10, ratchet_lock_pct=40), True, 'Titan', 6000.0),
+        (StrategyOverrides(press_trigger_wins=0), True, 'Standard', 5000.0),
+        (StrategyOverrides(progression='Paroli'), False, 'Standard', 1700.0),
+        (StrategyOverrides(progression='1-3-2-6', iron_gate_limit=4), True, 'Standard', 3000.0),
+        (StrategyOverrides(progression="D'Alembert", stop_loss_units=20), False, 'Titan', 2500.0),
+        (StrategyOverrides(progression="Oscar's Grind", stop_loss_units=15), False, 'Standard', 1700.0),
+        (StrategyOverrides(progression='Flat'), True, 'Fortress', 2500.0),
+    ]
+
+    report = {'backend': KERNEL_BACKEND, 'identical': True, 'cases': []}
+    for overrides, use_ratchet, mode, ga in cases:
+        tier = get_ladder(20, mode).lookup(ga)
+        u = rng.random((n_sessions, HANDS_PER_SESSION))
+
+        ref = np.zeros(n_sessions)
+        ref_vol = np.zeros(n_sessions)
+        for k in range(n_sessions):
+            draw = iter(u[k].tolist()).__next__
+            ref[k], ref_vol[k] = SimulationWorker.run_session(ga, overrides, {tier.level: tier}, use_ratchet, draw=draw)
+
+        rules = compile_rules(overrides, use_ratchet)
+        outcomes = uniforms_to_outcomes(u)
+        fast, fast_vol, _ = run_sessions(outcomes, np.full(n_sessions, tier.base_unit), np.full(n_sessions, tier.press_unit), rules)
+
+        same = bool(np.allclose(ref, fast, atol=1e-9) and np.allclose(ref_vol, fast_vol, atol=1e-9))
+        report['identical'] &= same
+        report['cases'].append({
+            'mode': mode, 'tier': tier.level, 'progression': overrides.progression, 'ratchet': use_ratchet, 'identical': same,
+            'ref_mean': float(ref.mean()), 'kernel_mean': float(fast.mean()),
+            'ref_std': float(ref.std()), 'kernel_std': float(fast.std()),
+        })
+    return report
@@ -0,0 +1,279 @@
+from dataclasses import dataclass
+from functools import lru_cache
+import numpy as np
+from .ecosystem import PLAY_GATE, HOLIDAY_THRESHOLD, calculate_luxury_tax
+from .kernel import compile_rules, draw_outcomes, run_sessions
+from .tier_params import get_ladder
+
+# --- GRID ---
+MAX_BUCKETS = 1200     # GA grid resolution cap (bucket width adapts)
+MIN_BUCKETS = 300
+FULL_RES_SESSIONS = 200 # runs up to this many sessions get MAX_BUCKETS (see _grid_size)
+MIN_BUCKET_WIDTH = 50  # €
+SESSION_SAMPLES = 10000 # kernel sessions per tier used to estimate the session PnL law (cached)
+PERCENTILES = (10, 25, 50, 75, 90)
+MAX_BACKLOG = 36       # sessions owed while below the play gate (caught up on return)
+MIN_BACKLOG = 12
+PLAY_BUDGET = 5000     # session steps per preview (months x rounds), bounds the backlog cap
+NEGLIGIBLE = 1e-12     # probability mass treated as empty
+CLIP_TOLERANCE = 0.01  # share of careers clipped that marks the preview approximate / out of range
+
+
+@dataclass
+class MarkovPreview:
+    """Analytic career forecast from propagating the GA distribution month by month."""
+    bucket_values: np.ndarray      # GA value of each bucket
+    final_pmf: np.ndarray          # P(final GA in bucket)
+    mean: np.ndarray               # (months,) expected GA
+    bands: dict                    # percentile -> (months,) GA
+    prob_insolvent: float          # P(final GA < play gate) = 1 - survival
+    expected_final_ga: float
+    expected_insolvent_months: float
+    clipped_mass: float = 0.0      # share of careers folded onto the grid edges / backlog cap at least once (upper bound)
+
+    @property
+    def approximate(self) -> bool:
+        """True when grid / backlog clipping is large enough to move the numbers noticeably."""
+        return self.clipped_mass > CLIP_TOLERANCE
+
+
+@lru_cache(maxsize=64)
+def _session_law(rules_key: tuple, press_ratio: float, n_samples: int = SESSION_SAMPLES):
+    """
+    Sampled session PnL at a 1-unit base. Every limit in the session rules is in
+    base units, so a tier's PnL is just this law times its base unit.
+    Fixed seed so previews don't jitter between slider moves.
+    """
+    rng = np.random.default_rng(12345)
+    outcomes = draw_outcomes(rng, n_samples)
+    pnl, _, _ = run_sessions(outcomes, np.ones(n_samples), np.full(n_samples, press_ratio), np.array(rules_key))
+    return pnl
+
+
+def _session_transition(ladder, rules, grid, width):
+    """
+    Session kernel per tier: [(lo, hi, first_offset, k_all, k_win)] for the tier's
+    buckets grid[lo:hi] (tiers are GA ranges, so contiguous). Inside a tier the
+    move is shift-invariant, so the sparse mat-vec is a short 1-D convolution.
+    """
+    rung = ladder.indices_of(grid)
+    rules_key = tuple(rules.tolist())
+    kernels = []
+    starts = np.flatnonzero(np.diff(rung, prepend=-1))
+    for lo, hi in zip(starts, (*starts[1:], len(grid))):
+        r = rung[lo]
+        base = float(ladder.base_units[r])
+        pnl = base * _session_law(rules_key, float(ladder.press_units[r]) / base)
+        # Linear split between the two neighbouring buckets keeps the mean PnL exact
+        pos = pnl / width
+        low = np.floor(pos).astype(np.int64)
+        frac = pos - low
+        first = int(low.min())
+        cells = np.concatenate([low, low + 1]) - first
+        mass = np.concatenate([1 - frac, frac]) / len(pnl)
+        won = np.concatenate([pnl > 0, pnl > 0])
+        k_all = np.bincount(cells, weights=mass)
+        k_win = np.bincount(cells, weights=mass * won, minlength=len(k_all))
+        kernels.append((int(lo), int(hi), first, k_all, k_win))
+    return kernels
+
+
+def _grid_size(total_sessions: int) -> int:
+    """
+    Bucket count for a run. Each session step convolves ~buckets x kernel length
+    (both scale with the bucket count), so long / busy runs get a coarser grid to
+    keep the preview interactive.
+    """
+    scale = np.sqrt(FULL_RES_SESSIONS / max(total_sessions, 1))
+    return int(np.clip(MAX_BUCKETS * scale, MIN_BUCKETS, MAX_BUCKETS))
+
+
+def _backlog_cap(total_months: int, sessions_per_year: int) -> int:
+    """Sessions owed that are caught up on return, so that months x rounds stays within PLAY_BUDGET."""
+    rounds = PLAY_BUDGET // max(total_months, 1) - int(np.ceil(sessions_per_year / 12))
+    return int(np.clip(rounds, MIN_BACKLOG, MAX_BACKLOG))
+
+
+def _deterministic_move(values, grid_lo, width, n):
+    """Bucket map for a GA -> GA' function, split linearly between neighbours: (dst_low, w_low, dst_high, w_high)."""
+    pos = np.clip((values - grid_lo) / width, 0, n - 1)
+    low = np.floor(pos).astype(np.int64)
+    frac = pos - low
+    return low, 1 - frac, np.minimum(low + 1, n - 1), frac
+
+
+def _outside(values, grid_lo, width, n):
+    """Buckets whose GA -> GA' target falls off the grid (clipped by _deterministic_move)."""
+    pos = (values - grid_lo) / width
+    return (pos < 0) | (pos > n - 1)
+
+
+def _apply_move(dist, move):
+    """Moves every row of `dist` (..., n) through the same bucket map (flat bincounts)."""
+    dst_low, w_low, dst_high, w_high = move
+    flat = dist.reshape(-1, dist.shape[-1])
+    n = flat.shape[1]
+    used = np.flatnonzero(flat.any(axis=1))  # most backlog rows are empty
+    rows = flat[used]
+    row_base = np.arange(len(rows))[:, None] * n
+    moved = np.bincount((row_base + dst_low).ravel(), weights=(rows * w_low).ravel(), minlength=rows.size)
+    moved += np.bincount((row_base + dst_high).ravel(), weights=(rows * w_high).ravel(), minlength=rows.size)
+    out = np.zeros_like(flat)
+    out[used] = moved.reshape(rows.shape)
+    return out.reshape(dist.shape)
+
+
+def forecast_career(start_ga: float, total_months: int, sessions_per_year: int,
+                    contrib_win: float, contrib_loss: float, overrides, use_ratchet: bool,
+                    use_tax: bool, use_holiday: bool, safety_factor: int,
+                    ladder_mode: str = 'Standard') -> MarkovPreview:
+    """
+    Discretized-GA Markov chain over (sessions owed, last session won, GA bucket).
+    Each month: luxury tax -> contribution/holiday -> play gate -> sessions due
+    (plus any backlog from months spent below the gate, like the Monte Carlo).
+    Approximations: GA is bucketed, the session law is sampled per tier, the
+    backlog is capped (MAX_BACKLOG, lower for very long runs) and Titan uses
+    upgrade-only thresholds. The grid coarsens for runs with many sessions
+    (_grid_size) so the preview stays fast. The share of careers that the grid
+    edges or the backlog cap clip is measured (clipped_mass), so callers can
+    tell when those approximations stop being small (e.g. long catch-up runs at
+    high session frequencies).
+    """
+    ladder = get_ladder(safety_factor, ladder_mode)
+    rules = compile_rules(overrides, use_ratchet)
+    tax_thresh = overrides.tax_threshold
+    tax_rate = overrides.tax_rate / 100.0
+
+    # GA grid wide enough for the deepest stop loss and a long untaxed climb
+    worst_loss = float(ladder.base_units.max()) * (overrides.stop_loss_units + 12)
+    grid_lo = min(0.0, PLAY_GATE - worst_loss, start_ga - worst_loss)
+    growth = total_months * max(contrib_win, contrib_loss, 0)
+    grid_hi = max(60000.0, 4 * tax_thresh, 4 * start_ga) if use_tax else max(60000.0, 4 * start_ga, 3 * (start_ga + growth))
+    width = max(MIN_BUCKET_WIDTH, (grid_hi - grid_lo) / _grid_size(total_months * sessions_per_year // 12))
+    max_backlog = _backlog_cap(total_months, sessions_per_year)
+    n = int(np.ceil((grid_hi - grid_lo) / width)) + 1
+    grid = grid_lo + width * np.arange(n)
+    playable = grid >= PLAY_GATE
+
+    # Fixed per-bucket moves (sparse permutations)
+    after_tax = grid - calculate_luxury_tax(grid, threshold=tax_thresh, rate=tax_rate) if use_tax else grid
+    tax_dst = _deterministic_move(after_tax, grid_lo, width, n)
+    tax_clip = _outside(after_tax, grid_lo, width, n)
+    holiday = (grid >= HOLIDAY_THRESHOLD) if use_holiday else np.zeros(n, dtype=bool)
+    contributed = [np.where(holiday, grid, grid + (contrib_win if won else contrib_loss)) for won in (False, True)]
+    contrib_dst = [_deterministic_move(values, grid_lo, width, n) for values in contributed]
+    contrib_clip = [_outside(values, grid_lo, width, n) for values in contributed]
+    clipped = 0.0
+    kernels = _session_transition(ladder, rules, grid, width)
+
+    # Convolutions land in a padded buffer; whatever falls past the grid is folded onto the edge buckets
+    pad = max(max(-first, first + len(k_all)) for _, _, first, k_all, _ in kernels) + 1
+
+    def fold(buf, count=True):
+        nonlocal clipped
+        below, above = buf[:pad].sum(), buf[pad + n:].sum()
+        if count:
+            clipped += below + above
+        out = buf[pad:pad + n].copy()
+        out[0] += below
+        out[-1] += above
+        return out
+
+    def play(mass, split=False):
+        """One session for all mass. split=True also returns the won part (needed after the last round)."""
+        total = np.zeros(n + 2 * pad)
+        won = np.zeros(n + 2 * pad) if split else None
+        occupied = np.flatnonzero(mass > NEGLIGIBLE)
+        for tier_lo, tier_hi, first, k_all, k_win in kernels:
+            # Convolve only the occupied span of this tier
+            if len(occupied) == 0:
+                break
+            lo, hi = max(tier_lo, occupied[0]), min(tier_hi, occupied[-1] + 1)
+            if lo >= hi:
+                continue
+            tier_mass = mass[lo:hi]
+            at = pad + lo + first
+            total[at:at + hi - lo + len(k_all) - 1] += np.convolve(tier_mass, k_all)
+            if split:
+                won[at:at + hi - lo + len(k_all) - 1] += np.convolve(tier_mass, k_win)
+        if not split:
+            return fold(total)
+        won = fold(won, count=False)  # a share of `total`, counted there
+        return fold(total) - won, won
+
+    # State: backlog x [last_won=False, last_won=True] x buckets
+    dist = np.zeros((max_backlog + 1, 2, n))
+    start_low, start_wl, start_high, start_wh = _deterministic_move(np.array([float(start_ga)]), grid_lo, width, n)
+    dist[0, 0, start_low[0]] += start_wl[0]
+    dist[0, 0, start_high[0]] += start_wh[0]
+
+    mean = np.zeros(total_months)
+    cdfs = np.zeros((total_months, n))
+    insolvent_months = 0.0
+    sessions_before = 0
+
+    for m in range(total_months):
+        # A. Luxury Tax
+        if use_tax:
+            clipped += dist[..., tax_clip].sum()
+            dist = _apply_move(dist, tax_dst)
+        # B. Contribution (depends on last session won)
+        clipped += sum(dist[:, f][..., contrib_clip[f]].sum() for f in (0, 1))
+        dist = np.stack([_apply_move(dist[:, f], contrib_dst[f]) for f in (0, 1)], axis=1)
+        # C. Play gate (checked once per month)
+        insolvent_months += dist[..., ~playable].sum()
+
+        expected_sessions = int((m + 1) * (sessions_per_year / 12))
+        sessions_due = expected_sessions - sessions_before
+        sessions_before = expected_sessions
+
+        if sessions_due > 0 or dist[1:, :, playable].sum() > NEGLIGIBLE:
+            idle = dist * ~playable
+            owed = idle.sum(axis=(1, 2)) > NEGLIGIBLE
+            # Below the gate: backlog grows (capped)
+            shifted = np.zeros_like(idle)
+            for b in np.flatnonzero(owed):
+                if b < max_backlog < b + sessions_due:
+                    clipped += idle[b].sum()  # newly capped (mass already at the cap was counted then)
+                shifted[min(b + sessions_due, max_backlog)] += idle[b]
+            # Below-gate rows are already moved; playable rows are rebuilt below
+
+            # Playable mass owing r sessions joins the pool at round r, so it plays exactly r times
+            active = (dist * playable).sum(axis=1)
+            max_owed = int(np.flatnonzero(active.sum(axis=1) > NEGLIGIBLE).max(initial=0))
+            pool = np.zeros(n)
+            for r in range(sessions_due + max_owed, 0, -1):
+                b = r - sessions_due
+                if 0 <= b <= max_backlog:
+                    pool = pool + active[b]
+                if r > 1:
+                    pool = play(pool)
+            pool_lost, pool_won = play(pool, split=True)
+
+            if sessions_due == 0:
+                # Nothing owed: playable rows without backlog sit this month out
+                shifted[0] += dist[0] * playable
+            dist = shifted
+            dist[0, 0] += pool_lost
+            dist[0, 1] += pool_won
+
+        total = dist.sum(axis=(0, 1))
+        mean[m] = total @ grid
+        cdfs[m] = np.cumsum(total)
+
+    bands = {}
+    for q in PERCENTILES:
+        idx = np.array([np.searchsorted(row, q / 100.0 * row[-1]) for row in cdfs])
+        bands[q] = grid[np.minimum(idx, n - 1)]
+
+    final_pmf = dist.sum(axis=(0, 1))
+    return MarkovPreview(
+        bucket_values=grid,
+        final_pmf=final_pmf,
+        mean=mean,
+        bands=bands,
+        prob_insolvent=float(final_pmf[~playable].sum()),
+        expected_final_ga=float(final_pmf @ grid),
+        expected_insolvent_months=float(insolvent_months),
+        clipped_mass=min(float(clipped), 1.0),  # a career clipped twice counts twice: cap the bound
+    )
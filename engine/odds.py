@@ -0,0 +1,225 @@
+import math
+from functools import lru_cache
+import numpy as np
+from .kernel import P_BANKER, P_PLAYER, HANDS_PER_SHOE, SHOES_PER_SESSION
+from .progressions import get_progression
+from .strategy_rules import SessionState, BaccaratStrategist, PlayMode
+from .tier_params import TierConfig
+
+# --- ODDS ADVISOR ---
+# Backward induction over (hand of the session, behaviour state, shoe-3 flag, PnL)
+# for one tier + ruleset. Behaviour states (streaks, watcher/penalty, tripwire,
+# progression step) are enumerated by running BaccaratStrategist itself, so the
+# table follows the same rules as the HUD. Lookups are O(1) array reads.
+HANDS_PER_SESSION = HANDS_PER_SHOE * SHOES_PER_SESSION
+P_TIE = 1.0 - P_BANKER - P_PLAYER
+MAX_CELLS = 96         # PnL lattice cap (coarser lattices interpolate)
+MAX_STATES = 4000      # behaviour states before we give up (e.g. exotic progressions)
+
+Q_PROFIT, Q_STOP, Q_VOLUME = 0, 1, 2
+
+
+class OddsTable:
+    def __init__(self, tier, keys, values, shoe3_values, grid, stop_limit, profit_limit):
+        self.tier = tier
+        self.index = {key: i for i, key in enumerate(keys)}
+        self.values = values              # shoes 1-2: (hands, 3, states, cells) float32
+        self.shoe3_values = shoe3_values  # shoe 3: (hands, 3, trailing flag, states, cells)
+        self.grid = grid
+        self.step = grid[1] - grid[0] if len(grid) > 1 else 1.0
+        self.stop_limit = stop_limit
+        self.profit_limit = profit_limit
+
+    def lookup(self, state: SessionState):
+        """P(profit lock), P(stop loss) and expected remaining volume from `state`, or None if off-table."""
+        k = self.index.get(_behaviour_key(state))
+        if k is None:
+            return None
+        hand = min(state.hands_played_in_shoe, HANDS_PER_SHOE - 1)
+        if state.current_shoe >= 3:
+            flag = int(state.shoe3_start_pnl >= self.tier.base_unit * 5)
+            row = self.shoe3_values[hand, :, flag, k]
+        else:
+            row = self.values[(max(state.current_shoe, 1) - 1) * HANDS_PER_SHOE + hand, :, k]
+
+        pos = (state.session_pnl - self.grid[0]) / self.step
+        pos = min(max(pos, 0.0), len(self.grid) - 1.0)
+        low = int(pos)
+        frac = pos - low
+        high = min(low + 1, len(self.grid) - 1)
+        p_profit, p_stop, volume = (1 - frac) * row[:, low] + frac * row[:, high]
+        return {
+            'p_profit': float(p_profit),
+            'p_stop': float(p_stop),
+            'p_other': float(max(0.0, 1.0 - p_profit - p_stop)),
+            'exp_volume': float(volume),
+        }
+
+
+def get_odds_table(tier: TierConfig, progression: str = 'Sniper') -> OddsTable:
+    """Cached per tier + progression, so it is built once per server process."""
+    return _build_table(
+        (tier.level, tier.min_ga, tier.max_ga, tier.base_unit, tier.press_unit,
+         tier.stop_loss, tier.profit_lock, tier.catastrophic_cap),
+        progression or 'Sniper',
+    )
+
+
+# --- BEHAVIOUR STATES ---
+def _behaviour_key(state: SessionState) -> tuple:
+    """Everything that drives the next bet except PnL and position in the shoe."""
+    trigger = state.overrides.press_trigger_wins if state.overrides else 2
+    depth = state.overrides.press_depth if state.overrides and state.overrides.press_depth > 0 else 0
+    return (
+        min(state.consecutive_wins, max(trigger, 0)),
+        state.consecutive_losses,
+        state.mode == PlayMode.WATCHER,
+        state.penalty_cooldown,
+        min(state.current_press_streak, depth),   # unlimited depth: streak never matters
+        state.shoe1_tripwire_triggered,
+        state.prog_index,
+        state.prog_units,
+        round(state.prog_cycle_pnl, 6),
+    )
+
+
+def _make_state(key: tuple, tier: TierConfig, spec) -> SessionState:
+    state = SessionState(tier=tier)
+    state.progression = spec
+    (state.consecutive_wins, state.consecutive_losses, watcher, state.penalty_cooldown,
+     state.current_press_streak, state.shoe1_tripwire_triggered,
+     state.prog_index, state.prog_units, state.prog_cycle_pnl) = key
+    state.mode = PlayMode.WATCHER if watcher else PlayMode.ACTIVE
+    state.current_shoe = 2  # keeps the strategist from judging the tripwire; handled per PnL below
+    return state
+
+
+def _step(key, tier, spec, won):
+    """(next key, tripwire-eligible) after a decided hand."""
+    state = _make_state(key, tier, spec)
+    bet = BaccaratStrategist.get_next_decision(state, ytd_pnl=0.0)['bet_amount']
+    was_watching = state.mode == PlayMode.WATCHER
+    BaccaratStrategist.update_state_after_hand(state, won, bet if won else -bet)
+    eligible = not was_watching and state.mode != PlayMode.WATCHER and not state.shoe1_tripwire_triggered
+    return _behaviour_key(state), eligible
+
+
+def _advance(key, tier, spec):
+    state = _make_state(key, tier, spec)
+    BaccaratStrategist.advance_shoe(state)
+    return _behaviour_key(state)
+
+
+def _with_tripwire(key):
+    return key[:5] + (True,) + key[6:]
+
+
+@lru_cache(maxsize=8)
+def _build_table(tier_key: tuple, progression: str) -> OddsTable:
+    tier = TierConfig(*tier_key)
+    spec = get_progression(progression)
+    spec = None if spec.kind == 'sniper' else spec
+
+    # 1. Reachable behaviour states and their transitions
+    start = _behaviour_key(SessionState(tier=tier))
+    keys, index, queue, trans = [], {}, [], {}
+
+    def add(key):
+        if key not in index:
+            if len(keys) >= MAX_STATES:
+                raise ValueError(f"Odds table: more than {MAX_STATES} behaviour states for {progression}")
+            index[key] = len(keys)
+            keys.append(key)
+            queue.append(key)
+
+    add(start)
+    while queue:
+        key = queue.pop()
+        state = _make_state(key, tier, spec)
+        bet = BaccaratStrategist.get_next_decision(state, ytd_pnl=0.0)['bet_amount']
+        win, win_trip = _step(key, tier, spec, True)
+        loss, loss_trip = _step(key, tier, spec, False)
+        adv = _advance(key, tier, spec)
+        entry = {'bet': bet, 'win': win, 'loss': loss, 'adv': adv,
+                 'win_trip': _with_tripwire(win) if win_trip else None,
+                 'loss_trip': _with_tripwire(loss) if loss_trip else None}
+        trans[key] = entry
+        for nxt in (win, loss, adv, entry['win_trip'], entry['loss_trip']):
+            if nxt is not None:
+                add(nxt)
+
+    n_states = len(keys)
+    bets = np.array([trans[k]['bet'] for k in keys], dtype=float)
+    win_i = np.array([index[trans[k]['win']] for k in keys])
+    loss_i = np.array([index[trans[k]['loss']] for k in keys])
+    adv_i = np.array([index[trans[k]['adv']] for k in keys])
+    win_trip_i = np.array([index[trans[k]['win_trip']] if trans[k]['win_trip'] else -1 for k in keys])
+    loss_trip_i = np.array([index[trans[k]['loss_trip']] if trans[k]['loss_trip'] else -1 for k in keys])
+
+    # 2. PnL lattice between the stop loss and the profit lock (both absorbing)
+    stop_limit, profit_limit = tier.stop_loss, tier.profit_lock
+    amounts = [int(b) for b in set(bets.tolist()) if b > 0] + [int(tier.base_unit)]
+    step = float(math.gcd(*amounts)) if all(float(b).is_integer() for b in bets) else tier.base_unit
+    n_cells = int(round((profit_limit - stop_limit) / step)) + 1
+    if n_cells > MAX_CELLS:
+        n_cells = MAX_CELLS
+    grid = np.linspace(stop_limit, profit_limit, n_cells)
+    step = grid[1] - grid[0]
+    trip_threshold = tier.stop_loss * 0.5
+    below_trip = grid < trip_threshold
+    stop_cells = grid <= stop_limit
+    profit_cells = grid >= profit_limit
+    trailing_cells = grid <= tier.base_unit
+    shoe3_flag = grid >= tier.base_unit * 5
+
+    def shift(values, amount):
+        """values(pnl + amount) on the lattice, clamped into the absorbing ends."""
+        pos = np.clip(np.arange(n_cells) + amount / step, 0, n_cells - 1)
+        low = np.floor(pos).astype(int)
+        frac = pos - low
+        high = np.minimum(low + 1, n_cells - 1)
+        return values[..., low] * (1 - frac) + values[..., high] * frac
+
+    # 3. Backward induction, hand 239 -> 0
+    early_hands = HANDS_PER_SESSION - HANDS_PER_SHOE
+    out = np.zeros((early_hands, 3, n_states, n_cells), dtype=np.float32)
+    out3 = np.zeros((HANDS_PER_SHOE, 3, 2, n_states, n_cells), dtype=np.float32)
+    nxt = np.zeros((3, 2, n_states, n_cells))  # after the last hand: session over
+    for t in range(HANDS_PER_SESSION - 1, -1, -1):
+        shoe = t // HANDS_PER_SHOE + 1
+        # Values right after hand t, before any shoe change
+        if (t + 1) % HANDS_PER_SHOE == 0 and t + 1 < HANDS_PER_SESSION:
+            cont = nxt[:, :, adv_i]
+            if shoe + 1 == 3:
+                cont = np.where(shoe3_flag, cont[:, 1:2], cont[:, 0:1]).repeat(2, axis=1)
+        else:
+            cont = nxt
+
+        cur = np.empty_like(nxt)
+        for k in range(n_states):
+            bet = bets[k]
+            win_next = cont[:, :, win_i[k]]
+            loss_next = cont[:, :, loss_i[k]]
+            if shoe == 1:
+                if win_trip_i[k] >= 0:
+                    win_next = np.where(below_trip, cont[:, :, win_trip_i[k]], win_next)
+                if loss_trip_i[k] >= 0:
+                    loss_next = np.where(below_trip, cont[:, :, loss_trip_i[k]], loss_next)
+            cur[:, :, k] = (P_BANKER * shift(win_next, bet) + P_PLAYER * shift(loss_next, -bet)
+                            + P_TIE * cont[:, :, k])
+            cur[Q_VOLUME, :, k] += bet
+
+        # Absorbing PnL (checked before every bet, like get_next_decision)
+        cur[:, :, :, stop_cells] = 0.0
+        cur[Q_STOP, :, :, stop_cells] = 1.0
+        cur[:, :, :, profit_cells] = 0.0
+        cur[Q_PROFIT, :, :, profit_cells] = 1.0
+        if shoe == 3:
+            cur[:, 1, :, trailing_cells & ~stop_cells] = 0.0
+        if shoe == 3:
+            out3[t - early_hands] = cur
+        else:
+            out[t] = cur[:, 0]  # the trailing flag only exists in shoe 3
+        nxt = cur
+
+    return OddsTable(tier, keys, out, out3, grid, stop_limit, profit_limit)
@@ -0,0 +1,148 @@
+import atexit
+import os
+import threading
+import weakref
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from .career import RESULT_COLUMNS, YEAR_POINTS_DTYPE, career_years, run_careers
+from .trajectory import TRAJECTORY_DTYPE, TrajectoryBuffer
+
+# --- PROCESS POOL ---
+# Careers are CPU bound, so large runs go to worker processes. Workers write
+# straight into shared memory owned by the coordinator and only send back a
+# tiny completion notice. BACCARAT_PROCESSES=0 keeps everything in threads.
+PROCESS_WORKERS = int(os.environ.get('BACCARAT_PROCESSES', max(1, (os.cpu_count() or 2) - 1)))
+USE_PROCESSES = PROCESS_WORKERS > 0
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Shared process pool (spawn: safe next to the web server threads)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._broken:
+            # (Re)start after first use or after a worker crashed
+            _pool = ProcessPoolExecutor(max_workers=PROCESS_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+@atexit.register
+def _shutdown_pool():
+    """One exit hook for whichever pool is current (pools are recreated after crashes)."""
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+
+
+# --- SHARED RESULT BLOCK ---
+class SharedCareerBlock:
+    """
+    Summary columns, yearly points, trajectory and a cancel flag for a whole run, each in its own
+    shared memory segment. The coordinator creates and unlinks them; workers attach.
+    """
+    def __init__(self, n_universes: int, n_months: int):
+        self.n_universes = n_universes
+        self.n_months = n_months
+        layout = {name: (np.dtype(dtype).str, (n_universes,)) for name, dtype in RESULT_COLUMNS.items()}
+        layout['trajectory'] = (np.dtype(TRAJECTORY_DTYPE).str, (n_universes, n_months))
+        layout['year_points'] = (np.dtype(YEAR_POINTS_DTYPE).str, (n_universes, career_years(n_months)))
+        layout['cancel'] = (np.dtype(np.int8).str, (1,))
+
+        self._segments = []
+        self.arrays = {}
+        self._spec = {}
+        try:
+            for name, (dtype, shape) in layout.items():
+                size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+                shm = shared_memory.SharedMemory(create=True, size=size)
+                self._segments.append(shm)
+                self._spec[name] = (shm.name, dtype, shape)
+                self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        finally:
+            # Unlinks even on a failed allocation, an exception mid-run or a forgotten close()
+            self._finalizer = weakref.finalize(self, _release, self._segments)
+        self.arrays['cancel'][0] = 0
+        self.trajectories = TrajectoryBuffer(n_universes, n_months, data=self.arrays['trajectory'])
+
+    @property
+    def spec(self) -> dict:
+        """Picklable segment names/dtypes/shapes for workers."""
+        return self._spec
+
+    def cancel(self):
+        self.arrays['cancel'][0] = 1
+
+    def batch(self, start: int, count: int) -> dict:
+        """Result columns of one batch as views (same layout as run_careers returns)."""
+        views = {name: self.arrays[name][start:start + count] for name in (*RESULT_COLUMNS, 'year_points')}
+        views['trajectory'] = self.trajectories.rows(start, count)
+        return views
+
+    def close(self):
+        self.arrays = {}
+        self.trajectories = None
+        self._finalizer()
+
+
+def _release(segments):
+    for shm in segments:
+        try:
+            shm.close()
+        except BufferError:
+            pass  # a view is still alive; the mapping goes when it does
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _attach(spec: dict):
+    segments, arrays = [], {}
+    for name, (shm_name, dtype, shape) in spec.items():
+        # Spawned workers share the coordinator's resource tracker, so attaching
+        # here does not hand ownership (or the unlink) to the worker
+        shm = shared_memory.SharedMemory(name=shm_name)
+        segments.append(shm)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return segments, arrays
+
+
+# --- WORKER ---
+def _career_batch(spec: dict, start: int, count: int, params: dict, seed):
+    """
+    Runs in a worker process. Returns a small notice: (start, count, completed, traces)
+    where traces are the batch's hand-trace rows when tracing is on (else None).
+    """
+    segments, arrays = _attach(spec)
+    try:
+        completed = _run_into(arrays, start, count, params, seed)
+    finally:
+        arrays.clear()
+        for shm in segments:
+            try:
+                shm.close()
+            except BufferError:
+                pass  # views pinned by a traceback; freed with the process
+    trace = params.get('trace')
+    return start, count, completed, trace.records() if trace is not None and completed else None
+
+
+def _run_into(arrays: dict, start: int, count: int, params: dict, seed) -> bool:
+    cancel = arrays['cancel']
+    result = run_careers(
+        count, rng=np.random.default_rng(seed), first_universe=start,
+        should_stop=lambda: cancel[0] != 0,
+        trajectory_out=arrays['trajectory'][start:start + count],
+        columns_out={name: arrays[name][start:start + count] for name in (*RESULT_COLUMNS, 'year_points')},
+        **params
+    )
+    return result is not None
+
+
+def submit_batch(block: SharedCareerBlock, start: int, count: int, params: dict, seed=None):
+    """Queues one career batch on the process pool. `params` are run_careers keyword arguments."""
+    return get_pool().submit(_career_batch, block.spec, start, count, params, seed)
@@ -0,0 +1,105 @@
+import math
+from dataclasses import dataclass
+
+# --- PROGRESSION KINDS ---
+# sniper:   built-in press after N wins (press_trigger_wins / press_depth)
+# sequence: walk a unit sequence on wins, back to step 1 on a loss or after the last step
+# additive: +step units after a loss, -step after a win (floor 1, cap max_units)
+# oscar:    grind +1 unit after a win until the cycle is +1 unit up, never raise after a loss
+KINDS = ('sniper', 'sequence', 'additive', 'oscar')
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+
+MAX_SEQUENCE = 8  # longest unit sequence the kernel carries
+
+@dataclass(frozen=True)
+class ProgressionSpec:
+    name: str
+    kind: str = 'sniper'
+    units: tuple = (1,)
+    step: int = 1
+    max_units: int = 10
+    description: str = ''
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ProgressionSpec':
+        spec = cls(
+            name=str(data['name']),
+            kind=data.get('kind', 'sniper'),
+            units=tuple(int(u) for u in data.get('units', (1,))),
+            step=int(data.get('step', 1)),
+            max_units=int(data.get('max_units', 10)),
+            description=data.get('description', ''),
+        )
+        spec.validate()
+        return spec
+
+    def validate(self):
+        if self.kind not in KINDS:
+            raise ValueError(f"{self.name}: unknown progression kind '{self.kind}'")
+        if not self.units or len(self.units) > MAX_SEQUENCE:
+            raise ValueError(f"{self.name}: sequence needs 1-{MAX_SEQUENCE} steps")
+        if any(u < 1 for u in self.units):
+            raise ValueError(f"{self.name}: sequence units must be >= 1")
+        if self.step < 1 or self.max_units < 1:
+            raise ValueError(f"{self.name}: step and max_units must be >= 1")
+
+    # --- STATE MACHINE (reference path, mirrored in engine/kernel.py) ---
+    def bet_units(self, state) -> int:
+        if self.kind == 'sequence':
+            return self.units[state.prog_index]
+        return state.prog_units
+
+    def advance(self, state, won: bool, amount: float):
+        if self.kind == 'sequence':
+            state.prog_index = state.prog_index + 1 if won else 0
+            if state.prog_index >= len(self.units):
+                state.prog_index = 0
+        elif self.kind == 'additive':
+            if won:
+                state.prog_units = max(1, state.prog_units - self.step)
+            else:
+                state.prog_units = min(self.max_units, state.prog_units + self.step)
+        elif self.kind == 'oscar':
+            base = state.tier.base_unit
+            state.prog_cycle_pnl += amount
+            if won:
+                if state.prog_cycle_pnl >= base:
+                    state.prog_cycle_pnl = 0.0
+                    state.prog_units = 1
+                else:
+                    needed = math.ceil((base - state.prog_cycle_pnl) / base)
+                    state.prog_units = max(1, min(state.prog_units + 1, self.max_units, needed))
+
+    @staticmethod
+    def reset(state):
+        state.prog_index = 0
+        state.prog_units = 1
+        state.prog_cycle_pnl = 0.0
+
+
+# --- LIBRARY (declarative) ---
+LIBRARY = [
+    {'name': 'Sniper', 'kind': 'sniper', 'description': 'Built-in: press after N wins, capped by depth'},
+    {'name': 'Flat', 'kind': 'sequence', 'units': (1,), 'description': 'Flat base bet behind the iron gate'},
+    {'name': 'Paroli', 'kind': 'sequence', 'units': (1, 2, 4), 'description': 'Double after each win, bank after 3'},
+    {'name': '1-3-2-6', 'kind': 'sequence', 'units': (1, 3, 2, 6), 'description': 'Classic 4-step positive sequence'},
+    {'name': "D'Alembert", 'kind': 'additive', 'step': 1, 'max_units': 10, 'description': '+1 unit after a loss, -1 after a win'},
+    {'name': "Oscar's Grind", 'kind': 'oscar', 'max_units': 10, 'description': 'Grind to +1 unit per cycle'},
+]
+
+PROGRESSIONS = {}
+
+def register_progression(spec) -> ProgressionSpec:
+    """Adds a spec (ProgressionSpec or dict) to the library after validation."""
+    if isinstance(spec, dict):
+        spec = ProgressionSpec.from_dict(spec)
+    else:
+        spec.validate()
+    PROGRESSIONS[spec.name] = spec
+    return spec
+
+for _entry in LIBRARY:
+    register_progression(_entry)
+
+def get_progression(name: str) -> ProgressionSpec:
+    return PROGRESSIONS.get(name or 'Sniper', PROGRESSIONS['Sniper'])
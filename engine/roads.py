@@ -0,0 +1,117 @@
+import csv
+import io
+import re
+from .strategy_rules import SessionState, BaccaratStrategist, PlayMode
+
+# --- ROAD FORMAT ---
+# One token per hand: B (Banker), P (Player), T (Tie); words work too.
+# Shoes are separated by '|', '/', a blank line or a CSV row reading 'shoe'.
+# Anything else (spaces, commas, hand numbers) is ignored.
+HAND_TOKENS = {'B': 'B', 'BANKER': 'B', 'P': 'P', 'PLAYER': 'P', 'T': 'T', 'TIE': 'T'}
+SHOE_TOKENS = {'|', '/', 'SHOE', '---'}
+
+
+def parse_road(text: str) -> list:
+    """Road string or CSV -> list of shoes, each a list of 'B'/'P'/'T'."""
+    is_csv = ',' in text or ';' in text or '\t' in text
+    if is_csv:
+        rows = csv.reader(io.StringIO(text), delimiter=_sniff_delimiter(text))
+    else:
+        rows = ([line] for line in text.splitlines())
+    return list(iter_shoes(rows, skip_header=is_csv))
+
+
+def iter_shoes(rows, skip_header: bool = False, shoe_per_row: bool = False):
+    """
+    Streams shoes out of rows of cells (e.g. a csv.reader over a file), so
+    archives never have to fit in memory. A first row without hand tokens is
+    skipped as a header when skip_header is set.
+    """
+    shoe = []
+    for row_index, row in enumerate(rows):
+        if not any(cell.strip() for cell in row):
+            if shoe:
+                yield shoe  # blank line
+            shoe = []
+            continue
+        try:
+            tokens = [_classify(token) for cell in row for token in re.findall(r'[A-Za-z]+|[|/]|-{3,}', cell)]
+        except ValueError:
+            if skip_header and row_index == 0:
+                continue
+            raise
+        for token in tokens:
+            if token == 'SHOE':
+                if shoe:
+                    yield shoe
+                shoe = []
+            else:
+                shoe.extend(token)
+        if shoe_per_row and shoe:
+            yield shoe
+            shoe = []
+    if shoe:
+        yield shoe
+
+
+def _classify(token: str) -> str:
+    """'SHOE' for a separator, otherwise the hands it encodes ('B', 'PBT', ...)."""
+    upper = token.upper()
+    if upper in SHOE_TOKENS:
+        return 'SHOE'
+    if upper in HAND_TOKENS:
+        return HAND_TOKENS[upper]
+    if re.fullmatch(r'[BPT]+', upper):
+        return upper  # compact bead plate, e.g. 'BBPTB'
+    raise ValueError(f"Unknown road token '{token}'")
+
+
+def _sniff_delimiter(text: str) -> str:
+    counts = {d: text.count(d) for d in (',', ';', '\t')}
+    return max(counts, key=counts.get)
+
+
+def replay_road(state: SessionState, shoes: list, ytd_pnl: float = 0.0) -> dict:
+    """
+    Runs a parsed road through BaccaratStrategist in one pass, sizing every bet
+    exactly as the live HUD would. Banker wins pay the bet like the WIN button,
+    ties are pushes that still use up a hand. The first shoe continues the current
+    one; every later shoe starts the next (never past shoe 3).
+    Returns counters for the caller to report.
+    """
+    summary = {'hands': 0, 'bets': 0, 'wins': 0, 'losses': 0, 'ties': 0, 'volume': 0.0,
+               'pnl': 0.0, 'ignored': 0, 'shoes': 0}
+    start_pnl = state.session_pnl
+
+    for shoe_index, shoe in enumerate(shoes):
+        if shoe_index > 0:
+            if state.current_shoe >= 3:
+                summary['ignored'] += sum(len(s) for s in shoes[shoe_index:])
+                break
+            BaccaratStrategist.advance_shoe(state)
+        summary['shoes'] += 1
+
+        for i, hand in enumerate(shoe):
+            decision = BaccaratStrategist.get_next_decision(state, ytd_pnl=ytd_pnl)
+            if decision['mode'] == PlayMode.STOPPED:
+                summary['ignored'] += len(shoe) - i + sum(len(s) for s in shoes[shoe_index + 1:])
+                summary['pnl'] = state.session_pnl - start_pnl
+                return summary
+
+            bet = decision['bet_amount']
+            summary['hands'] += 1
+            if bet > 0:
+                summary['bets'] += 1
+                summary['volume'] += bet
+
+            if hand == 'T':
+                summary['ties'] += 1
+                state.hands_played_in_shoe += 1
+                continue
+
+            won = hand == 'B'
+            summary['wins' if won else 'losses'] += 1
+            BaccaratStrategist.update_state_after_hand(state, won, bet if won else -bet)
+
+    summary['pnl'] = state.session_pnl - start_pnl
+    return summary
@@ -0,0 +1,146 @@
+import math
+import warnings
+from functools import lru_cache
+import numpy as np
+from .kernel import HANDS_PER_SESSION, OUT_LOSS, OUT_WIN, OUT_TIE
+
+try:
+    from scipy.stats import qmc
+except ImportError:  # optional: 'Sobol' falls back to stratified sampling
+    qmc = None
+
+# --- VARIANCE REDUCTION ---
+# Instead of drawing each session's hands on demand, a batch pre-draws every
+# universe's hands by session number (the session_outcomes path of run_careers).
+# Each session is dealt in chunks of CHUNK_HANDS (sessions usually stop long
+# before hand 240, so the early chunks decide the result), exactly as the table
+# would deal them:
+#   ties       T ~ Binomial(CHUNK_HANDS, P_TIE)           (uniform u_tie)
+#   wins       W ~ Binomial(CHUNK_HANDS - T, P_BANKER / (P_BANKER + P_PLAYER))  (uniform u_win)
+#   order      a uniformly random arrangement of the chunk's W / L / T hands
+# and the modes only change how the chunk uniforms are spread across universes:
+#   Stratified  Latin hypercube: per (session, chunk) the universes of a replicate
+#               block take one (u_tie, u_win) from each quantile stratum
+#   Antithetic  universes come in pairs playing u and 1 - u, the partner winning
+#               the hands its twin lost (same arrangement, reversed)
+#   Sobol       scrambled Sobol points, two dimensions per session chunk
+# Every universe still sees exactly the real table, so plain means stay unbiased.
+# Measured gain (tests/test_sampling.py): the variance of a batch's mean session
+# PnL drops about 2x. Career figures gain less, roughly 1.2-1.5x in variance,
+# because later sessions depend on the path. So expect ~1.2-1.5x fewer universes
+# for the same accuracy, not several times fewer.
+# Universes are only dependent inside their group (pair / replicate block), and
+# groups are independent, so standard errors are computed over groups
+# (see engine/importance.py weighted_rate and engine/analysis.py bootstrap_scores).
+SAMPLING_MODES = {
+    'Plain': 'Independent pseudo-random universes',
+    'Stratified': 'Session outcomes stratified by quantile',
+    'Antithetic': 'Mirrored universe pairs (u, 1 - u)',
+    'Sobol': 'Scrambled Sobol session draws',
+}
+if qmc is None:
+    del SAMPLING_MODES['Sobol']  # needs scipy (see requirements.txt)
+CHUNK_HANDS = 20
+CHUNKS = HANDS_PER_SESSION // CHUNK_HANDS
+REPLICATE_SIZE = 16         # universes per stratified / Sobol block (a power of two keeps Sobol nets balanced)
+PREDRAW_MEMORY_MB = 64      # per-batch cap for the pre-drawn hand matrix
+
+
+def uses_predraw(mode: str) -> bool:
+    """Whether `mode` pre-draws its hands (judged by the mode that actually runs, see effective_sampling)."""
+    return effective_sampling(mode, 0) != 'Plain'
+
+
+def effective_sampling(mode: str, total_sessions: int) -> str:
+    """The mode sample_outcomes actually runs (Sobol past the sequence's dimension limit is stratified)."""
+    if mode not in SAMPLING_MODES:
+        return 'Stratified' if mode == 'Sobol' else 'Plain'
+    if mode == 'Sobol' and 2 * total_sessions * CHUNKS > getattr(qmc.Sobol, 'MAXDIM', 21201):
+        return 'Stratified'
+    return mode
+
+
+def predraw_batch_size(total_sessions: int) -> int:
+    """Largest batch whose pre-drawn (universes, sessions, hands) int8 matrix fits PREDRAW_MEMORY_MB."""
+    per_universe = max(1, total_sessions) * HANDS_PER_SESSION
+    return max(REPLICATE_SIZE, PREDRAW_MEMORY_MB * 1024 * 1024 // per_universe // REPLICATE_SIZE * REPLICATE_SIZE)
+
+
+@lru_cache(maxsize=4)
+def _binomial_cdfs(p_win: float, p_loss: float):
+    """(tie CDF over 0..CHUNK_HANDS, win CDF table [decided hands, wins]) for inverse-CDF draws."""
+    def cdf(n, p):
+        k = np.arange(n + 1)
+        log_pmf = np.array([math.lgamma(n + 1) - math.lgamma(i + 1) - math.lgamma(n - i + 1) for i in k])
+        log_pmf += k * np.log(p) + (n - k) * np.log1p(-p)
+        out = np.ones(CHUNK_HANDS + 1)
+        out[:n + 1] = np.cumsum(np.exp(log_pmf))
+        return np.minimum(out, 1.0)
+
+    tie_cdf = cdf(CHUNK_HANDS, 1.0 - p_win - p_loss)
+    win_cdf = np.stack([cdf(n, p_win / (p_win + p_loss)) for n in range(CHUNK_HANDS + 1)])
+    return tie_cdf, win_cdf
+
+
+def _deal(u_tie, u_win, order, p_win, p_loss, mirrored=False):
+    """
+    Outcome rows (..., HANDS_PER_SESSION) from chunk uniforms (..., CHUNKS) and
+    chunk arrangements (..., CHUNKS, CHUNK_HANDS).
+    """
+    tie_cdf, win_cdf = _binomial_cdfs(p_win, p_loss)
+    ties = np.minimum(np.searchsorted(tie_cdf, u_tie, side='right'), CHUNK_HANDS)
+    decided = CHUNK_HANDS - ties
+    wins = np.minimum((win_cdf[decided] < u_win[..., None]).sum(axis=-1), decided)
+
+    # Hands ranked by `order`: the first W are wins, then losses, the last T ties
+    # (mirrored: the last W decided hands win instead)
+    rank = np.arange(CHUNK_HANDS, dtype=np.int16)
+    won = rank >= (decided - wins)[..., None] if mirrored else rank < wins[..., None]
+    template = np.where(rank < decided[..., None], np.where(won, OUT_WIN, OUT_LOSS), OUT_TIE).astype(np.int8)
+    outcomes = np.empty_like(template)
+    np.put_along_axis(outcomes, order, template, axis=-1)
+    return outcomes.reshape(*outcomes.shape[:-2], HANDS_PER_SESSION)
+
+
+def _arrangements(rng, shape):
+    return np.argsort(rng.random((*shape, CHUNKS, CHUNK_HANDS), dtype=np.float32), axis=-1)
+
+
+def _stratified(rng, size, total_sessions):
+    """(size, sessions, CHUNKS) uniforms with one point in each of `size` strata per session chunk."""
+    shape = (size, total_sessions, CHUNKS)
+    strata = rng.permuted(np.broadcast_to(np.arange(size)[:, None, None], shape), axis=0)
+    return (strata + rng.random(shape)) / size
+
+
+def sample_outcomes(mode: str, rng: np.random.Generator, n_universes: int, total_sessions: int,
+                    p_win: float, p_loss: float):
+    """
+    (outcomes, groups): int8 (n_universes, total_sessions, HANDS_PER_SESSION) hands
+    and every universe's group, named by the index of the group's first universe.
+    """
+    dims = total_sessions * CHUNKS
+    mode = effective_sampling(mode, total_sessions)
+    outcomes = np.empty((n_universes, total_sessions, HANDS_PER_SESSION), dtype=np.int8)
+
+    if mode == 'Antithetic':
+        n_pairs = -(-n_universes // 2)
+        u_tie, u_win = rng.random((n_pairs, total_sessions, CHUNKS)), rng.random((n_pairs, total_sessions, CHUNKS))
+        order = _arrangements(rng, (n_pairs, total_sessions))
+        outcomes[0::2] = _deal(u_tie, u_win, order, p_win, p_loss)
+        twins = n_universes // 2
+        outcomes[1::2] = _deal(1.0 - u_tie[:twins], 1.0 - u_win[:twins], order[:twins], p_win, p_loss, mirrored=True)
+        return outcomes, np.arange(n_universes, dtype=np.int32) // 2 * 2
+
+    # Stratified / Sobol: one independent randomization per replicate block
+    for start in range(0, n_universes, REPLICATE_SIZE):
+        size = min(REPLICATE_SIZE, n_universes - start)
+        if mode == 'Sobol':
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')  # balance warning for a short last block
+                points = qmc.Sobol(2 * dims, scramble=True, seed=rng).random(size)
+            u_tie, u_win = (half.reshape(size, total_sessions, CHUNKS) for half in (points[:, :dims], points[:, dims:]))
+        else:
+            u_tie, u_win = _stratified(rng, size, total_sessions), _stratified(rng, size, total_sessions)
+        outcomes[start:start + size] = _deal(u_tie, u_win, _arrangements(rng, (size, total_sessions)), p_win, p_loss)
+    return outcomes, np.arange(n_universes, dtype=np.int32) // REPLICATE_SIZE * REPLICATE_SIZE
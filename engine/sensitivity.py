@@ -0,0 +1,189 @@
+import dataclasses
+from functools import lru_cache
+import numpy as np
+from .analysis import score_results
+from .career import run_careers
+from .kernel import draw_outcomes, HANDS_PER_SESSION
+
+try:
+    from scipy.stats import qmc
+except ImportError:  # optional: plain uniform sampling for the Saltelli design
+    qmc = None
+
+# --- PARAMETERS ---
+# name -> (label, target, field, step, low, high)
+# target 'overrides' = StrategyOverrides field, 'career' = run_careers keyword.
+# step is the one-at-a-time perturbation; low/high bound the slider (and Sobol).
+PARAMETERS = {
+    'iron_gate': ('Iron Gate', 'overrides', 'iron_gate_limit', 1, 2, 6),
+    'stop_loss': ('Stop Loss', 'overrides', 'stop_loss_units', 2, 5, 30),
+    'target': ('Target', 'overrides', 'profit_lock_units', 2, 3, 20),
+    'press_depth': ('Press Depth', 'overrides', 'press_depth', 1, 0, 5),
+    'safety': ('Safety Buffer', 'career', 'safety_factor', 5, 10, 60),
+    'ratchet': ('Ratchet %', 'overrides', 'ratchet_lock_pct', 10, 10, 90),
+    'contrib_win': ('Contrib (Win)', 'career', 'contrib_win', 100, 0, 1000),
+    'contrib_loss': ('Contrib (Loss)', 'career', 'contrib_loss', 100, 0, 1000),
+    'tax_rate': ('Tax Rate', 'overrides', 'tax_rate', 5, 5, 50),
+}
+
+# Parameters whose 0 means "unlimited": it ranks above `high` when stepping
+UNLIMITED_AT_ZERO = {'press_depth'}
+
+# Scoreboard outputs reported per parameter
+METRICS = {
+    'avg_final_ga': 'Final GA (€)',
+    'score_survival': 'Survival (%)',
+    'score_gold': 'Gold Chase (%)',
+    'total_score': 'Total Score',
+}
+
+# Universes per design point, capped so the shared hand matrix stays under CRN_MEMORY_MB
+SENSITIVITY_UNIVERSES = 1000
+CRN_MEMORY_MB = 128
+SOBOL_BASE_SAMPLES = 16
+
+
+def parameter_value(params: dict, name: str):
+    _, target, field, *_ = PARAMETERS[name]
+    return getattr(params['overrides'], field) if target == 'overrides' else params[field]
+
+
+def format_value(name: str, value) -> str:
+    return '\u221e' if name in UNLIMITED_AT_ZERO and value == 0 else str(value)
+
+
+def _ordered_range(name: str) -> tuple:
+    """(step, low, high) on the parameter's ordered scale: an unlimited 0 sits at high + 1."""
+    _, _, _, step, low, high = PARAMETERS[name]
+    if name in UNLIMITED_AT_ZERO:
+        return step, max(low, 1), high + 1
+    return step, low, high
+
+
+def _from_ordered(name: str, value: int) -> int:
+    _, _, _, _, _, high = PARAMETERS[name]
+    return 0 if name in UNLIMITED_AT_ZERO and value == high + 1 else value
+
+
+def with_parameters(params: dict, values: dict) -> dict:
+    """Copy of run_careers keyword arguments with some PARAMETERS replaced."""
+    params = dict(params)
+    override_values = {}
+    for name, value in values.items():
+        _, target, field, *_ = PARAMETERS[name]
+        if target == 'overrides':
+            override_values[field] = int(value)
+        else:
+            params[field] = int(value)
+    if override_values:
+        params['overrides'] = dataclasses.replace(params['overrides'], **override_values)
+    return params
+
+
+def crn_universes(n_requested: int, total_sessions: int) -> int:
+    per_universe = max(1, total_sessions) * HANDS_PER_SESSION
+    return max(10, min(n_requested, SENSITIVITY_UNIVERSES, CRN_MEMORY_MB * 1024 * 1024 // per_universe))
+
+
+@lru_cache(maxsize=2)
+def common_outcomes(n_universes: int, total_sessions: int, seed: int) -> np.ndarray:
+    """(universes, sessions, hands) shared by every design point (per process, cached)."""
+    rng = np.random.default_rng(seed)
+    outcomes = draw_outcomes(rng, n_universes * total_sessions).reshape(n_universes, total_sessions, HANDS_PER_SESSION)
+    outcomes.flags.writeable = False
+    return outcomes
+
+
+def evaluate_point(params: dict, n_universes: int, seed: int) -> dict:
+    """METRICS for one configuration on the common hands. Top level so it pickles to worker processes."""
+    total_sessions = params['total_months'] * params['sessions_per_year'] // 12
+    outcomes = common_outcomes(n_universes, total_sessions, seed)
+    results = run_careers(n_universes, rng=np.random.default_rng(seed), session_outcomes=outcomes,
+                          **{**params, 'tilt': None, 'corpus': None})
+    score = score_results(results, params['total_months'], params['start_ga'])
+    return {metric: float(score[metric]) for metric in METRICS}
+
+
+# --- ONE-AT-A-TIME ---
+def oat_design(params: dict, names=None) -> list:
+    """
+    [(name, side, values)] design points: the base config (name None) then each
+    parameter one step down and up, clamped to its slider range.
+    """
+    points = [(None, 'base', {})]
+    for name in names or PARAMETERS:
+        step, low, high = _ordered_range(name)
+        value = parameter_value(params, name)
+        if name in UNLIMITED_AT_ZERO and value == 0:
+            value = high
+        for side, shifted in (('low', max(low, value - step)), ('high', min(high, value + step))):
+            if shifted != value:
+                points.append((name, side, {name: _from_ordered(name, shifted)}))
+    return points
+
+
+def oat_effects(params: dict, design: list, outputs: list) -> list:
+    """
+    Tornado rows sorted by total_score swing: per parameter the low/high values
+    and each metric's change from the base config.
+    """
+    base = outputs[0]
+    rows = {}
+    for (name, side, values), output in zip(design, outputs):
+        if name is None or output is None:
+            continue
+        row = rows.setdefault(name, {'name': name, 'label': PARAMETERS[name][0], 'value': parameter_value(params, name),
+                                     'low': None, 'high': None, 'delta_low': {}, 'delta_high': {}})
+        row[side] = values[name]
+        row[f'delta_{side}'] = {metric: output[metric] - base[metric] for metric in METRICS}
+    for row in rows.values():
+        row['swing'] = {metric: abs(row['delta_high'].get(metric, 0.0) - row['delta_low'].get(metric, 0.0))
+                        for metric in METRICS}
+    return sorted(rows.values(), key=lambda r: r['swing']['total_score'], reverse=True)
+
+
+# --- VARIANCE-BASED (SOBOL / SALTELLI) ---
+def saltelli_design(names: list, n_base: int = SOBOL_BASE_SAMPLES, seed: int = None) -> list:
+    """
+    Parameter-value dicts in Saltelli order: A rows, B rows, then A with column i
+    from B for each parameter (n_base * (k + 2) points). Values snap to each
+    parameter's step grid, every step equally likely (unlimited 0 ranked last).
+    """
+    k = len(names)
+    if qmc is not None:
+        unit = qmc.Sobol(2 * k, scramble=True, seed=seed).random(n_base)
+    else:
+        unit = np.random.default_rng(seed).random((n_base, 2 * k))
+    a, b = unit[:, :k], unit[:, k:]
+    blocks = [a, b] + [np.where(np.arange(k) == i, b, a) for i in range(k)]
+
+    def to_values(row):
+        values = {}
+        for name, u in zip(names, row):
+            step, low, high = _ordered_range(name)
+            n_levels = (high - low) // step + 1
+            level = min(int(u * n_levels), n_levels - 1)
+            values[name] = _from_ordered(name, low + step * level)
+        return values
+
+    return [to_values(row) for block in blocks for row in block]
+
+
+def sobol_indices(names: list, outputs: list, n_base: int = SOBOL_BASE_SAMPLES) -> dict:
+    """
+    First-order (Saltelli 2010) and total (Jansen) indices per parameter and metric:
+    {metric: {name: (S1, ST)}}.
+    """
+    k = len(names)
+    indices = {}
+    for metric in METRICS:
+        y = np.array([o[metric] for o in outputs], dtype=float).reshape(k + 2, n_base)
+        f_a, f_b, f_ab = y[0], y[1], y[2:]
+        variance = np.var(np.concatenate([f_a, f_b]))
+        if variance <= 0:
+            indices[metric] = {name: (0.0, 0.0) for name in names}
+            continue
+        first = np.mean(f_b * (f_ab - f_a), axis=1) / variance
+        total = 0.5 * np.mean((f_a - f_ab) ** 2, axis=1) / variance
+        indices[metric] = {name: (float(s1), float(st)) for name, s1, st in zip(names, first, total)}
+    return indices
@@ -0,0 +1,95 @@
+import random
+from .strategy_rules import SessionState, BaccaratStrategist, PlayMode, StrategyOverrides
+from .tier_params import get_tier_for_ga
+from .career import run_careers, RESULT_COLUMNS
+
+class SimulationWorker:
+    """Runs the strategy logic."""
+    @staticmethod
+    def run_session(current_ga: float, overrides: StrategyOverrides, tier_map: dict, use_ratchet: bool = False,
+                    draw=random.random, mode: str = 'Standard', active_level: int = 1):
+        """Reference session (BaccaratStrategist, one hand at a time). `draw` supplies the hand uniforms."""
+        tier = get_tier_for_ga(current_ga, tier_map, active_level, mode)
+        
+        session_overrides = overrides
+        trigger_profit_amount = 0
+        ratchet_triggered = False
+        
+        if use_ratchet:
+            trigger_profit_amount = overrides.profit_lock_units * tier.base_unit
+            session_overrides = StrategyOverrides(
+                iron_gate_limit=overrides.iron_gate_limit,
+                stop_loss_units=overrides.stop_loss_units,
+                profit_lock_units=1000, 
+                press_trigger_wins=overrides.press_trigger_wins,
+                press_depth=overrides.press_depth,
+                progression=overrides.progression
+            )
+        
+        state = SessionState(tier=tier, overrides=session_overrides)
+        state.current_shoe = 1
+        volume = 0 
+        
+        while state.current_shoe <= 3 and state.mode != PlayMode.STOPPED:
+            decision = BaccaratStrategist.get_next_decision(state, ytd_pnl=0.0)
+            
+            if decision['mode'] == PlayMode.STOPPED:
+                break
+            
+            bet = decision['bet_amount']
+            volume += bet
+            
+            if use_ratchet:
+                if not ratchet_triggered and state.session_pnl >= trigger_profit_amount:
+                    ratchet_triggered = True
+                
+                # Dynamic Ratchet Lock
+                # Lock % of the Trigger Amount
+                lock_pct = overrides.ratchet_lock_pct / 100.0
+                lock_floor = trigger_profit_amount * lock_pct
+                
+                if ratchet_triggered and state.session_pnl <= lock_floor:
+                    break 
+
+            rnd = draw()
+            won = False
+            pnl_change = 0
+            is_tie = False
+            
+            if rnd < 0.4586: 
+                won = True
+                pnl_change = bet * 0.95 
+            elif rnd < (0.4586 + 0.4462): 
+                won = False
+                pnl_change = -bet
+            else: 
+                is_tie = True
+                pnl_change = 0
+
+            if not is_tie:
+                BaccaratStrategist.update_state_after_hand(state, won, pnl_change)
+            else:
+                state.hands_played_in_shoe += 1
+
+            if state.hands_played_in_shoe >= 80:
+                state.current_shoe += 1
+                state.hands_played_in_shoe = 0
+                state.presses_this_shoe = 0
+                if state.current_shoe == 3:
+                    state.shoe3_start_pnl = state.session_pnl
+
+        return state.session_pnl, volume
+
+    @staticmethod
+    def run_full_career(start_ga, total_months, sessions_per_year, 
+                        contrib_win, contrib_loss, overrides, use_ratchet,
+                        use_tax, use_holiday, safety_factor, 
+                        target_points, earn_rate, ladder_mode='Standard'):
+        """Single universe through the batched career engine (engine/career.py)."""
+        res = run_careers(1, start_ga, total_months, sessions_per_year,
+                          contrib_win, contrib_loss, overrides, use_ratchet,
+                          use_tax, use_holiday, safety_factor,
+                          target_points, earn_rate, ladder_mode)
+        out = {key: res[key][0].item() for key in RESULT_COLUMNS}
+        out['trajectory'] = res['trajectory'][0].tolist()
+        return out
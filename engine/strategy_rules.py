@@ -2,6 +2,7 @@ from enum import Enum, auto
 from dataclasses import dataclass, field
 from typing import Optional
 from .tier_params import TierConfig
+from .progressions import ProgressionSpec, get_progression
 
 # --- DEFINITIONS START HERE ---
 
@@ -30,6 +31,7 @@ class StrategyOverrides:
     ratchet_lock_pct: int = 50      # % of profit to lock (10-90)
     tax_threshold: int = 12500      # GA threshold for Luxury Tax
     tax_rate: int = 25              # % Tax rate on surplus
+    progression: str = 'Sniper'     # Bet progression (engine/progressions.py)
 
 @dataclass
 class SessionState:
@@ -52,9 +54,26 @@ class SessionState:
     gold_churn_active: bool = False
     shoe3_start_pnl: float = 0.0
     
+    # Progression (None = built-in Sniper)
+    progression: Optional[ProgressionSpec] = None
+    prog_index: int = 0
+    prog_units: int = 1
+    prog_cycle_pnl: float = 0.0
+    
     def __post_init__(self):
         if self.shoe_pnls is None:
             self.shoe_pnls = {1: 0.0, 2: 0.0, 3: 0.0}
+        if self.progression is None and self.overrides:
+            self.progression = get_progression(self.overrides.progression)
+
+    @property
+    def progression_drives_bet(self) -> bool:
+        """True when the next bet comes from a non-Sniper progression (not watching, re-entering or tripwired)."""
+        if self.progression is None or self.progression.kind == 'sniper':
+            return False
+        if self.mode == PlayMode.WATCHER or self.penalty_cooldown > 0:
+            return False
+        return not (not self.overrides and self.shoe1_tripwire_triggered)
 
 class BaccaratStrategist:
     @staticmethod
@@ -98,6 +117,11 @@ class BaccaratStrategist:
         if state.penalty_cooldown > 0:
             return {'bet_amount': current_base, 'reason': f"RE-ENTRY ({state.penalty_cooldown})", 'mode': PlayMode.ACTIVE}
 
+        # Declarative Progression
+        if state.progression_drives_bet:
+            units = state.progression.bet_units(state)
+            return {'bet_amount': current_base * units, 'reason': f"{state.progression.name} ({units}u)", 'mode': PlayMode.ACTIVE}
+
         # Sniper Logic
         max_depth = 999 
         
@@ -117,8 +141,23 @@ class BaccaratStrategist:
         
         return {'bet_amount': bet, 'reason': reason, 'mode': PlayMode.ACTIVE}
 
+    @staticmethod
+    def advance_shoe(state: SessionState):
+        """Starts the next shoe: shoe counters and streaks reset, PnL carries over."""
+        state.current_shoe += 1
+        state.hands_played_in_shoe = 0
+        state.presses_this_shoe = 0
+        state.consecutive_wins = 0
+        state.consecutive_losses = 0
+        state.penalty_cooldown = 0
+
+        # Snapshot for Shoe 3 Survival Logic
+        if state.current_shoe == 3:
+            state.shoe3_start_pnl = state.session_pnl
+
     @staticmethod
     def update_state_after_hand(state: SessionState, won: bool, amount_won: float):
+        prog_active = state.progression_drives_bet
         state.session_pnl += amount_won
         state.shoe_pnls[state.current_shoe] += amount_won
         state.hands_played_in_shoe += 1
@@ -131,6 +170,9 @@ class BaccaratStrategist:
                 state.penalty_cooldown = 3
             return 
 
+        if prog_active:
+            state.progression.advance(state, won, amount_won)
+
         if won:
             state.consecutive_wins += 1
             state.consecutive_losses = 0
@@ -150,6 +192,7 @@ class BaccaratStrategist:
             if state.consecutive_losses >= limit:
                 state.mode = PlayMode.WATCHER
                 state.sniper_state = SniperState.RESET
+                ProgressionSpec.reset(state)
                 return
 
         if not state.overrides and state.current_shoe == 1 and not state.shoe1_tripwire_triggered:
@@ -1,4 +1,9 @@
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
+import numpy as np
 
 @dataclass
 class TierConfig:
@@ -16,6 +21,9 @@ class TierConfig:
 # 2. FORTRESS: Aggressive 100 start (2000 threshold)
 # 3. TITAN: High Roller Hysteresis (150/250 push)
 
+# Titan: once on Tier 3, only drop back below this GA (buffer under the 5k upgrade)
+TITAN_DOWNGRADE_GA = 4500
+
 def generate_tier_map(safety_factor: int = 25, mode: str = 'Standard') -> dict:
     tiers = {}
     
@@ -71,39 +79,77 @@ def generate_tier_map(safety_factor: int = 25, mode: str = 'Standard') -> dict:
         )
     return tiers
 
-def get_tier_for_ga(current_ga: float, tier_map: dict = None, active_level: int = 1, mode: str = 'Standard') -> TierConfig:
+class TierLadder:
+    """
+    Precomputed, read-only view of a tier map.
+    Scalar lookups bisect the sorted thresholds (O(log n)); array lookups use
+    np.searchsorted over all universes at once. Lookups return ladder indices:
+    tiers[i], levels[i], base_units[i], press_units[i].
+    """
+    def __init__(self, tier_map: dict, mode: str = 'Standard'):
+        self.mode = mode
+        self.tier_map = tier_map
+        self.levels = sorted(tier_map.keys())
+        self.tiers = [tier_map[l] for l in self.levels]
+        self.thresholds = [t.min_ga for t in self.tiers]
+
+        self.level_array = np.array(self.levels, dtype=np.int16)
+        self.min_ga = np.array(self.thresholds, dtype=np.float64)
+        self.base_units = np.array([t.base_unit for t in self.tiers], dtype=np.float64)
+        self.press_units = np.array([t.press_unit for t in self.tiers], dtype=np.float64)
+
+    def index_of(self, current_ga: float, active_level: int = 1) -> int:
+        if self.mode == 'Titan' and active_level == 3:
+            return 1 if current_ga < TITAN_DOWNGRADE_GA else 2
+        return max(bisect_right(self.thresholds, current_ga) - 1, 0)
+
+    def lookup(self, current_ga: float, active_level: int = 1) -> TierConfig:
+        return self.tiers[self.index_of(current_ga, active_level)]
+
+    def indices_of(self, ga: np.ndarray, active_levels: np.ndarray = None) -> np.ndarray:
+        """Vectorized index_of. With Titan + active_levels, applies the Tier 3 hysteresis buffer."""
+        idx = np.maximum(np.searchsorted(self.min_ga, ga, side='right') - 1, 0)
+        if self.mode == 'Titan' and active_levels is not None:
+            at_top = active_levels == 3
+            idx = np.where(at_top, np.where(ga < TITAN_DOWNGRADE_GA, 1, 2), idx)
+        return idx
+
+
+@lru_cache(maxsize=64)
+def get_ladder(safety_factor: int = 25, mode: str = 'Standard') -> TierLadder:
+    """Memoized ladder per (safety_factor, mode). Treat the result as read-only."""
+    return TierLadder(generate_tier_map(safety_factor, mode), mode)
+
+
+# Ladders built for caller-owned tier dicts, by dict identity (the dict is kept
+# alive alongside, so its id cannot be reused). Treat those dicts as read-only.
+_MAP_LADDERS = OrderedDict()
+_MAP_LADDERS_SIZE = 64
+_map_ladders_lock = threading.Lock()
+
+
+def ladder_for(tier_map: dict, mode: str = 'Standard') -> TierLadder:
+    """Memoized TierLadder for a tier dict (no re-sort per lookup)."""
+    key = (id(tier_map), mode)
+    with _map_ladders_lock:
+        entry = _MAP_LADDERS.get(key)
+        if entry is not None and entry[0] is tier_map:
+            _MAP_LADDERS.move_to_end(key)
+            return entry[1]
+        ladder = TierLadder(tier_map, mode)
+        _MAP_LADDERS[key] = (tier_map, ladder)
+        if len(_MAP_LADDERS) > _MAP_LADDERS_SIZE:
+            _MAP_LADDERS.popitem(last=False)
+        return ladder
+
+
+def get_tier_for_ga(current_ga: float, tier_map=None, active_level: int = 1, mode: str = 'Standard') -> TierConfig:
     """
     Selects Tier with Hysteresis (Memory).
+    tier_map may be a TierLadder (preferred), a tier dict, or None for the default ladder of `mode`.
     """
     if tier_map is None:
-        tier_map = generate_tier_map()
-
-    # --- TITAN HYSTERESIS LOGIC (UPDATED) ---
-    if mode == 'Titan':
-        # 1. UPGRADE CHECK
-        if active_level < 3:
-            if current_ga >= 5000: return tier_map[3] # Cross 5k -> Tier 3
-            if current_ga >= 2000: return tier_map[2] # Cross 2k -> Tier 2
-            return tier_map[1] # Else Tier 1
-
-        # 2. DOWNGRADE CHECK (Tightened Safety)
-        if active_level == 3:
-            if current_ga < 4500: return tier_map[2] # Crash 4.5k -> Drop to 2 (Was 3500)
-            return tier_map[3] # Stay at 3 (Buffer Zone)
-            
-        return tier_map[active_level] # Fallback
-
-    # --- FORTRESS LOGIC ---
-    if mode == 'Fortress':
-        if current_ga >= 2000: return tier_map[2]
-        return tier_map[1]
-
-    # --- STANDARD LOGIC ---
-    selected_tier = tier_map[min(tier_map.keys())]
-    for level in sorted(tier_map.keys()):
-        t = tier_map[level]
-        if current_ga >= t.min_ga:
-            selected_tier = t
-        else:
-            break
-    return selected_tier
+        return get_ladder(mode=mode).lookup(current_ga, active_level)
+    if isinstance(tier_map, TierLadder):
+        return tier_map.lookup(current_ga, active_level)
+    return ladder_for(tier_map, mode).lookup(current_ga, active_level)
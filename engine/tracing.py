@@ -0,0 +1,102 @@
+import threading
+import numpy as np
+from .kernel import (OUT_LOSS, OUT_WIN, OUT_TIE, MODE_NORMAL, MODE_WATCHER, MODE_COOLDOWN,
+                     REASON_BASE, REASON_PRESS, REASON_PROGRESSION, REASON_WATCH, REASON_COOLDOWN,
+                     END_STOP_LOSS, END_PROFIT_LOCK, END_SHOE3_TRAIL, END_RATCHET, END_SHOES_DONE)
+
+# --- HAND-LEVEL TRACING ---
+# Opt-in: a deterministic sample of universes (and of their sessions) is replayed
+# hand by hand through the kernel into a preallocated structured ring buffer.
+# Everything else runs exactly as before: the only cost on the unsampled path is
+# one vectorized hash per session slot. The ring keeps the newest rows, so the
+# sessions leading up to a bankruptcy are the ones still there at the end.
+TRACE_DTYPE = np.dtype([
+    ('universe', np.int32), ('session', np.int32), ('hand', np.int16), ('shoe', np.int8),
+    ('bet', np.float32), ('reason', np.int8), ('outcome', np.int8), ('pnl', np.float32),
+    ('mode', np.int8), ('wins', np.int16), ('losses', np.int16),
+])
+TRACE_CAPACITY = 100_000   # rows (~2.6 MB)
+
+OUTCOME_LABELS = {OUT_LOSS: 'Player', OUT_WIN: 'Banker', OUT_TIE: 'Tie', -1: 'END'}
+MODE_LABELS = {MODE_NORMAL: 'Normal', MODE_WATCHER: 'Watcher', MODE_COOLDOWN: 'Cooldown'}
+REASON_LABELS = {
+    REASON_BASE: 'Base', REASON_PRESS: 'Press', REASON_PROGRESSION: 'Progression',
+    REASON_WATCH: 'Watch (Iron Gate)', REASON_COOLDOWN: 'Cooldown',
+    END_STOP_LOSS: 'Stop Loss', END_PROFIT_LOCK: 'Profit Lock', END_SHOE3_TRAIL: 'Shoe 3 Trail',
+    END_RATCHET: 'Ratchet Lock', END_SHOES_DONE: 'Shoes Done',
+}
+
+
+def _unit_hash(*keys) -> np.ndarray:
+    """Deterministic uniform [0, 1) per element (splitmix64), identical in every process."""
+    h = np.uint64(0x9E3779B97F4A7C15)
+    with np.errstate(over='ignore'):
+        for key in keys:
+            h = (h ^ np.asarray(key, dtype=np.uint64)) * np.uint64(0xBF58476D1CE4E5B9)
+            h = (h ^ (h >> np.uint64(31))) * np.uint64(0x94D049BB133111EB)
+            h = h ^ (h >> np.uint64(29))
+    return (h >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+class TraceRing:
+    """
+    Fixed-size ring of TRACE_DTYPE rows plus the sampling rule. Pickles as its
+    settings only, so worker processes get an empty ring of the same kind.
+    """
+    def __init__(self, universe_rate: float = 0.01, session_rate: float = 1.0,
+                 capacity: int = TRACE_CAPACITY, seed: int = 0):
+        self.universe_rate = universe_rate
+        self.session_rate = session_rate
+        self.capacity = capacity
+        self.seed = seed
+        self.data = np.zeros(capacity, dtype=TRACE_DTYPE)
+        self.cursor = np.zeros(1, dtype=np.int64)  # rows ever written
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        return (TraceRing, (self.universe_rate, self.session_rate, self.capacity, self.seed))
+
+    def spawn(self) -> 'TraceRing':
+        """Empty ring with the same settings (one per batch, merged with extend())."""
+        return TraceRing(self.universe_rate, self.session_rate, self.capacity, self.seed)
+
+    def select(self, universes: np.ndarray, sessions: np.ndarray) -> np.ndarray:
+        """Which (universe, session number) pairs are traced."""
+        chosen = _unit_hash(self.seed, universes) < self.universe_rate
+        if self.session_rate < 1.0:
+            chosen &= _unit_hash(self.seed + 1, universes, sessions) < self.session_rate
+        return chosen
+
+    def records(self) -> np.ndarray:
+        """Rows still in the ring, oldest first."""
+        written = int(self.cursor[0])
+        if written <= self.capacity:
+            return self.data[:written].copy()
+        head = written % self.capacity
+        return np.concatenate([self.data[head:], self.data[:head]])
+
+    def extend(self, rows: np.ndarray):
+        """Appends rows (e.g. another batch's records()), keeping the newest `capacity`."""
+        rows = rows[-self.capacity:]
+        with self._lock:
+            start = int(self.cursor[0])
+            positions = (start + np.arange(len(rows))) % self.capacity
+            self.data[positions] = rows
+            self.cursor[0] = start + len(rows)
+
+    @property
+    def dropped(self) -> int:
+        return max(0, int(self.cursor[0]) - self.capacity)
+
+
+def trace_table(rows: np.ndarray, universe: int = None) -> list:
+    """Grid rows with readable labels, optionally for one universe."""
+    if universe is not None:
+        rows = rows[rows['universe'] == universe]
+    return [{
+        'universe': int(r['universe']), 'session': int(r['session']) + 1, 'hand': int(r['hand']),
+        'shoe': int(r['shoe']), 'bet': round(float(r['bet']), 2),
+        'reason': REASON_LABELS.get(int(r['reason']), '?'), 'outcome': OUTCOME_LABELS.get(int(r['outcome']), '?'),
+        'pnl': round(float(r['pnl']), 2), 'mode': MODE_LABELS.get(int(r['mode']), '?'),
+        'wins': int(r['wins']), 'losses': int(r['losses']),
+    } for r in rows]
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import weakref
+import numpy as np
+
+# --- TRAJECTORY STORAGE ---
+# One contiguous (universes, months) float32 block per run. Batches write their
+# own row slice in place; above SPILL_MB the block lives in a memory-mapped temp
+# file instead of RAM. float32 resolves GA to the cent only below €131,072 (2^17);
+# from there its spacing is €0.0156 or more (€0.125 at €1M). That is fine for the
+# percentile bands and charts drawn from trajectories; cent-exact figures come from
+# the float64 result columns (e.g. final_ga).
+TRAJECTORY_DTYPE = np.float32
+SPILL_MB = int(os.environ.get('BACCARAT_SPILL_MB', 256))
+
+
+class TrajectoryBuffer:
+    def __init__(self, n_universes: int, n_months: int, spill_mb: int = None, directory: str = None,
+                 data: np.ndarray = None):
+        self.n_universes = n_universes
+        self.n_months = n_months
+        self.path = None
+        self._finalizer = None
+
+        if data is not None:
+            # Caller owns the storage (e.g. a shared memory segment)
+            self.data = data
+            return
+
+        limit = (SPILL_MB if spill_mb is None else spill_mb) * 1024 * 1024
+        nbytes = n_universes * n_months * np.dtype(TRAJECTORY_DTYPE).itemsize
+        if nbytes > limit:
+            fd, self.path = tempfile.mkstemp(prefix='baccarat_traj_', suffix='.f32', dir=directory)
+            os.close(fd)
+            self.data = np.memmap(self.path, dtype=TRAJECTORY_DTYPE, mode='w+', shape=(n_universes, n_months))
+            # Temp file goes away even if close() is never reached
+            self._finalizer = weakref.finalize(self, _remove_file, self.path)
+        else:
+            self.data = np.zeros((n_universes, n_months), dtype=TRAJECTORY_DTYPE)
+
+    @property
+    def spilled(self) -> bool:
+        return self.path is not None
+
+    def rows(self, start: int, count: int) -> np.ndarray:
+        """Writable view of rows [start, start+count) for one batch."""
+        return self.data[start:start + count]
+
+    def row_of(self, view: np.ndarray) -> int:
+        """First row of a view handed out by rows()."""
+        offset = view.__array_interface__['data'][0] - self.data.__array_interface__['data'][0]
+        return offset // (self.n_months * self.data.itemsize)
+
+    def gather(self, views: list) -> np.ndarray:
+        """
+        Batch views (in batch order) as one (rows, months) array. No copy when they
+        form a prefix of the buffer, which is always the case once a run completes.
+        """
+        if not views:
+            return self.data[:0]
+        expected = 0
+        for view in views:
+            if self.row_of(view) != expected:
+                return np.concatenate(views)
+            expected += len(view)
+        return self.data[:expected]
+
+    def close(self):
+        """Deletes the spill file. Views already handed out stay readable on POSIX until released."""
+        if self._finalizer is not None:
+            self._finalizer()
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
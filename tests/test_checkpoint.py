@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from engine.career import run_careers
+from engine.checkpoint import CheckpointInUse, RunCheckpoint, batch_seed
+from engine.strategy_rules import StrategyOverrides
+
+PARAMS = dict(start_ga=2000, total_months=6, sessions_per_year=12, contrib_win=300, contrib_loss=200,
+              overrides=StrategyOverrides(), use_ratchet=True, use_tax=True, use_holiday=True,
+              safety_factor=25, target_points=20000, earn_rate=10)
+BATCH, N_BATCHES, SEED = 40, 5, 1234
+
+
+def _batch(index: int) -> dict:
+    """Batch `index` exactly as ui/simulator.py runs it."""
+    trajectory = np.zeros((BATCH, PARAMS['total_months']), dtype=np.float32)
+    result = run_careers(BATCH, rng=np.random.default_rng(batch_seed(SEED, index)),
+                         first_universe=index * BATCH, trajectory_out=trajectory, **PARAMS)
+    return {**result, 'trajectory': trajectory}
+
+
+def _merge(batches: list) -> dict:
+    return {name: np.concatenate([b[name] for b in batches]) for name in batches[0]}
+
+
+def test_resumed_run_matches_uninterrupted(tmp_path):
+    uninterrupted = _merge([_batch(i) for i in range(N_BATCHES)])
+
+    first = RunCheckpoint('run', N_BATCHES, BATCH, SEED, directory=str(tmp_path))
+    for i in (0, 3):   # out of order, as the scheduler finishes them
+        first.save_batch(i, _batch(i), play_gate=0)
+    first.close()      # interrupted
+
+    resumed = RunCheckpoint('run', N_BATCHES, BATCH, SEED, directory=str(tmp_path))
+    assert resumed.completed == {0, 3} and resumed.resumed == 2 * BATCH
+    batches = [resumed.load_batch(i) if i in resumed.completed else _batch(i) for i in range(N_BATCHES)]
+    resumed.discard()
+
+    merged = _merge(batches)
+    assert merged.keys() == uninterrupted.keys()
+    for name, values in uninterrupted.items():
+        assert np.array_equal(merged[name], values), name
+    assert not (tmp_path / 'run').exists()
+
+
+def test_live_checkpoint_refuses_second_run(tmp_path):
+    first = RunCheckpoint('run', N_BATCHES, BATCH, directory=str(tmp_path))
+    with pytest.raises(CheckpointInUse):
+        RunCheckpoint('run', N_BATCHES, BATCH, directory=str(tmp_path))
+    first.save_batch(0, _batch(0), play_gate=0)
+    first.close()
+    second = RunCheckpoint('run', N_BATCHES, BATCH, directory=str(tmp_path))
+    assert second.seed == first.seed and second.completed == {0}
+    second.close()
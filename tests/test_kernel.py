@@ -0,0 +1,8 @@
+from engine.kernel import self_check
+
+
+def test_kernel_matches_reference_sessions():
+    """Same hand draws through SimulationWorker.run_session and the kernel give identical sessions."""
+    report = self_check(n_sessions=300)
+    mismatched = [case for case in report['cases'] if not case['identical']]
+    assert report['identical'], mismatched
@@ -0,0 +1,27 @@
+import time
+import pytest
+from engine.markov import forecast_career
+from engine.strategy_rules import StrategyOverrides
+
+PREVIEW_SECONDS = 1.0
+
+
+def _preview(years: int, freq: int, stop_loss: int, mode: str = 'Standard'):
+    return forecast_career(2000, years * 12, freq, 300, 200, StrategyOverrides(stop_loss_units=stop_loss),
+                           True, True, True, 25, mode)
+
+
+@pytest.mark.parametrize('mode', ['Standard', 'Fortress', 'Titan'])
+@pytest.mark.parametrize('years, freq, stop_loss', [(10, 50, 20), (10, 50, 30), (30, 50, 20)])
+def test_preview_fast_at_slider_upper_range(mode, years, freq, stop_loss):
+    _preview(1, freq, stop_loss, mode)   # session laws are sampled once per rule set (cached)
+    started = time.perf_counter()
+    preview = _preview(years, freq, stop_loss, mode)
+    assert time.perf_counter() - started < PREVIEW_SECONDS
+    assert 0 <= preview.clipped_mass <= 1
+
+
+def test_clipping_flags_only_catch_up_heavy_runs():
+    calm = _preview(10, 9, 8)
+    assert calm.clipped_mass < 0.01 and not calm.approximate
+    assert _preview(10, 50, 20).approximate
@@ -0,0 +1,60 @@
+import re
+import time
+import numpy as np
+import main
+from engine.career import run_careers
+from engine.strategy_rules import StrategyOverrides
+from utils import metrics, persistence
+from utils.scheduler import JobScheduler
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{.*\})? (\S+)$')
+PARAMS = dict(start_ga=2000, total_months=3, sessions_per_year=12, contrib_win=300, contrib_loss=200,
+              overrides=StrategyOverrides(), use_ratchet=True, use_tax=True, use_holiday=True,
+              safety_factor=25, target_points=20000, earn_rate=10)
+
+
+def _scrape() -> dict:
+    """GET /metrics through the route handler, parsed to {'name{labels}': value}."""
+    response = main.metrics_endpoint()
+    assert response.media_type == metrics.CONTENT_TYPE
+    samples = {}
+    for line in response.body.decode().splitlines():
+        if not line or line.startswith('#'):
+            assert line.startswith(('# HELP ', '# TYPE ')) or not line
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        name, labels, value = match.groups()
+        samples[name + (labels or '')] = float(value)
+    return samples
+
+
+def test_scrape_moves_after_batch_and_profile_update(tmp_path, monkeypatch):
+    monkeypatch.setattr(persistence, 'DB_FILE', str(tmp_path / 'lab.db'))
+    monkeypatch.setattr(persistence, 'DATA_FILE', str(tmp_path / 'legacy.json'))
+    before = _scrape()
+
+    def batch(job, index):
+        result = run_careers(50, rng=np.random.default_rng(index), **PARAMS)
+        metrics.record_careers(result)
+        return result
+
+    job = JobScheduler(max_workers=1).submit('test', 'metrics', 2, batch)
+    deadline = time.monotonic() + 30
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.finished
+    persistence.update_profile('Tester', lambda profile: profile.update(ga=1800.0))
+    after = _scrape()
+
+    assert after['lab_universes_total'] == before['lab_universes_total'] + 100
+    assert after['lab_sessions_total'] > before['lab_sessions_total']
+    assert after['lab_hands_total'] > before['lab_hands_total']
+    assert after['lab_batches_total{outcome="done"}'] == before.get('lab_batches_total{outcome="done"}', 0) + 2
+    assert after['lab_batch_seconds_count'] == before['lab_batch_seconds_count'] + 2
+    assert after['lab_batch_seconds_bucket{le="+Inf"}'] == after['lab_batch_seconds_count']
+    key = 'lab_profile_seconds_count{op="update"}'
+    assert after[key] == before.get(key, 0) + 1
+    # Cumulative buckets never decrease with the bound
+    buckets = [v for k, v in after.items() if k.startswith('lab_profile_seconds_bucket{op="update"')]
+    assert buckets == sorted(buckets) and buckets[-1] == after[key]
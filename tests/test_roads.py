@@ -0,0 +1,28 @@
+import pytest
+from engine.roads import parse_road
+
+
+@pytest.mark.parametrize('text, shoes', [
+    ('', []),
+    ('   \n\n', []),
+    ('BPT', [['B', 'P', 'T']]),
+    ('bpt', [['B', 'P', 'T']]),
+    ('B P | T B', [['B', 'P'], ['T', 'B']]),
+    ('B/P/', [['B'], ['P']]),
+    ('| B |', [['B']]),
+    ('BB---PP', [['B', 'B'], ['P', 'P']]),
+    ('B P\n\n\nT', [['B', 'P'], ['T']]),
+    ('Banker Player Tie', [['B', 'P', 'T']]),
+    ('banker,player\nshoe\ntie', [['B', 'P'], ['T']]),
+    ('hand,result\n1,B\n2,P\n\n3,T', [['B', 'P'], ['T']]),
+    ('hand;result\n1;B\n2;P', [['B', 'P']]),
+    ('hand\tresult\n1\tB\n2\tP', [['B', 'P']]),
+])
+def test_parse_road(text, shoes):
+    assert parse_road(text) == shoes
+
+
+@pytest.mark.parametrize('text', ['x', 'B P Q', 'result\n1,B\nfoo,P'])
+def test_parse_road_rejects_unknown_tokens(text):
+    with pytest.raises(ValueError):
+        parse_road(text)
@@ -0,0 +1,60 @@
+from functools import lru_cache
+import numpy as np
+import pytest
+from engine.career import run_careers
+from engine.importance import universe_groups, group_sums
+from engine.kernel import P_BANKER, P_PLAYER, compile_rules, draw_outcomes, run_sessions
+from engine.sampling import REPLICATE_SIZE, effective_sampling, sample_outcomes, uses_predraw
+from engine.strategy_rules import StrategyOverrides
+
+MODES = ('Stratified', 'Antithetic')
+BATCH = 256
+
+
+@lru_cache(maxsize=None)
+def _batch_means(mode: str, n_batches: int, seed: int = 0) -> np.ndarray:
+    """Mean session PnL (1-unit base) of n_batches independent batches of BATCH sessions."""
+    rng = np.random.default_rng(seed)
+    rules = compile_rules(StrategyOverrides(), False)
+    means = []
+    for _ in range(n_batches):
+        if mode == 'Plain':
+            outcomes = draw_outcomes(rng, BATCH)
+        else:
+            outcomes = sample_outcomes(mode, rng, BATCH, 1, P_BANKER, P_PLAYER)[0][:, 0]
+        pnl, _, _ = run_sessions(outcomes, np.ones(BATCH), np.ones(BATCH), rules)
+        means.append(pnl.mean())
+    return np.array(means)
+
+
+def test_sobol_without_scipy_still_predraws():
+    mode = effective_sampling('Sobol', 120)
+    assert mode in ('Sobol', 'Stratified')
+    assert uses_predraw('Sobol') and uses_predraw(mode)
+    assert not uses_predraw('Plain')
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_session_means_unbiased_and_less_variable(mode):
+    plain = _batch_means('Plain', 200, seed=1)
+    reduced = _batch_means(mode, 200, seed=2)
+    se = np.sqrt(plain.var(ddof=1) / len(plain) + reduced.var(ddof=1) / len(reduced))
+    assert abs(reduced.mean() - plain.mean()) < 4 * se
+    # Measured ~2x; a safe floor that still fails if the reduction disappears
+    assert plain.var(ddof=1) / reduced.var(ddof=1) > 1.3
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_career_aggregation_unbiased(mode):
+    params = dict(start_ga=2000, total_months=12, sessions_per_year=12, contrib_win=300, contrib_loss=200,
+                  overrides=StrategyOverrides(), use_ratchet=True, use_tax=True, use_holiday=True,
+                  safety_factor=25, target_points=20000, earn_rate=10)
+    plain = run_careers(1024, rng=np.random.default_rng(3), **params)['final_ga']
+    results = run_careers(1024, rng=np.random.default_rng(4), sampling=mode, **params)
+    groups = universe_groups(results)
+    assert groups is not None and len(np.unique(groups)) == 1024 // (2 if mode == 'Antithetic' else REPLICATE_SIZE)
+    # Standard error over independent groups (universes inside a group are dependent)
+    sums, sizes = group_sums(results['final_ga'][:, None], groups)
+    group_means = sums[:, 0] / sizes
+    se = np.sqrt(plain.var(ddof=1) / len(plain) + group_means.var(ddof=1) / len(group_means))
+    assert abs(results['final_ga'].mean() - plain.mean()) < 4 * se
@@ -0,0 +1,54 @@
+import random
+import pytest
+from utils import analytics, persistence
+from utils.summary import RECENT_SIZE, apply_session, rebuild_summary
+
+
+def _history(n: int, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    ga, entries = 1700.0, []
+    for i in range(n):
+        pnl = rng.choice([-1, 0, 1]) * rng.randint(10, 400)
+        entries.append({'date': f'{2023 + i // 15}-0{1 + i % 9}-01 20:00', 'start_ga': ga, 'end_ga': ga + pnl,
+                        'pnl': pnl, 'shoes': 2, 'tier': rng.choice([1, 2, 3, None]), 'volume': rng.randint(0, 5000)})
+        ga += pnl
+    return entries
+
+
+@pytest.mark.parametrize('prefix', [0, 1, RECENT_SIZE - 1, 17])
+def test_incremental_summary_matches_rebuild(prefix):
+    history = _history(3 * RECENT_SIZE + 7)
+    summary = rebuild_summary({'history': history[:prefix], 'ga': 1700.0})
+    for entry in history[prefix:]:
+        apply_session(summary, entry)
+    assert summary == rebuild_summary({'history': history})
+
+
+def test_logged_sessions_match_rebuild(tmp_path, monkeypatch):
+    monkeypatch.setattr(persistence, 'DB_FILE', str(tmp_path / 'lab.db'))
+    monkeypatch.setattr(persistence, 'DATA_FILE', str(tmp_path / 'legacy.json'))
+    ga = persistence.load_profile('Tester')['ga']
+    for entry in _history(RECENT_SIZE + 5):
+        end_ga = ga + entry['pnl']
+        persistence.log_session_result(ga, end_ga, 2, tier=entry['tier'], volume=entry['volume'], player='Tester')
+        ga = end_ga
+    profile = persistence.load_profile('Tester')
+    assert profile['summary'] == rebuild_summary(profile)
+
+
+def test_summary_only_profile_skips_history(tmp_path, monkeypatch):
+    monkeypatch.setattr(persistence, 'DB_FILE', str(tmp_path / 'lab.db'))
+    monkeypatch.setattr(persistence, 'DATA_FILE', str(tmp_path / 'legacy.json'))
+    persistence.log_session_result(1700.0, 1800.0, 2, tier=1, volume=500.0, player='Tester')
+    calls = []
+
+    def load_history(player):
+        calls.append(player)
+        return persistence.load_history(player)
+
+    profile = persistence.load_profile('Tester', with_history=False)
+    assert 'history' not in profile and profile['summary']['sessions'] == 1
+    frame = analytics.get_analytics(profile, load_history=load_history)['frame']
+    assert len(frame) == 1 and calls == ['Tester']
+    analytics.get_analytics(profile, load_history=load_history)  # cached: no second read
+    assert calls == ['Tester']
@@ -1,19 +1,23 @@
 from nicegui import ui
 import plotly.graph_objects as go
-from utils.persistence import load_profile
+from utils.persistence import DEFAULT_PLAYER, load_profile, load_history
+from utils.analytics import get_analytics, DEFAULT_EARN_RATE, ROLLING_WINDOW
+from utils.summary import recent_sessions, year_totals, win_rate
 from engine.ecosystem import calculate_luxury_tax
 
-def show_dashboard():
+def show_dashboard(player: str = DEFAULT_PLAYER):
     # 1. Load Data
-    profile = load_profile()
-    history = profile.get('history', [])
+    profile = load_profile(player, with_history=False)
+    summary = profile['summary']  # O(1) aggregates; history is only read for the charts (on an analytics cache miss)
     current_ga = profile['ga']
-    ytd_pnl = profile['ytd_pnl']
+    this_year = year_totals(summary)
+    ytd_pnl = this_year['pnl']
     
     # 2. Key Metrics
     contributions = profile.get('contributions', 0)
     # Calculate Luxury Tax exposure
     potential_tax = calculate_luxury_tax(current_ga, profile.get('luxury_tax_paid', 0))
+    recent = recent_sessions(summary)
     
     # 3. Build UI
     with ui.column().classes('w-full max-w-4xl mx-auto gap-6 p-4'):
@@ -32,7 +36,7 @@ def show_dashboard():
             with ui.card().classes('bg-slate-900 border-l-4 border-purple-500 p-4'):
                 ui.label('YTD PnL').classes('text-xs text-slate-500 font-bold')
                 ui.label(f"€{ytd_pnl:,.0f}").classes(f'text-3xl font-black {color}')
-                ui.label(f"{len(history)} Sessions").classes('text-xs text-slate-600')
+                ui.label(f"{this_year['sessions']} Sessions ({summary['sessions']} lifetime)").classes('text-xs text-slate-600')
 
             # Luxury Tax / Ecosystem
             with ui.card().classes('bg-slate-900 border-l-4 border-yellow-500 p-4'):
@@ -44,25 +48,52 @@ def show_dashboard():
                     ui.label("€0").classes('text-3xl text-slate-700 font-black')
                     ui.label('Safe (< €12,500)').classes('text-xs text-slate-600')
 
+        # --- ANALYTICS STATS ---
+        with ui.grid(columns=3).classes('w-full gap-4'):
+            with ui.card().classes('bg-slate-900 border-l-4 border-green-500 p-4'):
+                ui.label('WIN RATE').classes('text-xs text-slate-500 font-bold')
+                ui.label(f"{win_rate(summary):.0%}").classes('text-3xl text-white font-black')
+                streak = summary['streak']
+                streak_text = f" | {streak['length']} {streak['kind']}{'s' if streak['length'] > 1 else ''} in a row" if streak['kind'] else ''
+                ui.label(f"Last {len(recent)}: €{sum(s['pnl'] for s in recent):+,.0f}{streak_text}" if recent else 'No sessions').classes('text-xs text-slate-600')
+
+            with ui.card().classes('bg-slate-900 border-l-4 border-red-500 p-4'):
+                ui.label('MAX DRAWDOWN').classes('text-xs text-slate-500 font-bold')
+                ui.label(f"€{summary['max_drawdown']:,.0f}").classes('text-3xl text-red-400 font-black')
+                ui.label(f"Current: €{max(0.0, summary['peak_ga'] - current_ga):,.0f} (peak €{summary['peak_ga']:,.0f})").classes('text-xs text-slate-600')
+
+            with ui.card().classes('bg-slate-900 border-l-4 border-yellow-500 p-4'):
+                ui.label('SBM POINTS').classes('text-xs text-slate-500 font-bold')
+                ui.label(f"{this_year['volume'] * DEFAULT_EARN_RATE / 100:,.0f}").classes('text-3xl text-yellow-400 font-black')
+                ui.label(f"Lifetime: {summary['lifetime_volume'] * DEFAULT_EARN_RATE / 100:,.0f}").classes('text-xs text-slate-600')
+
         # --- PERFORMANCE CHART (Plotly) ---
         with ui.card().classes('w-full bg-slate-900 p-4'):
             ui.label('PERFORMANCE TRAJECTORY').classes('text-slate-500 text-xs font-bold mb-4')
             
-            if not history:
+            if not summary['sessions']:
                 ui.label('No sessions recorded yet.').classes('text-slate-600 italic')
             else:
-                # Prepare Data
-                dates = [h['date'] for h in history]
-                pnls = [h['end_ga'] for h in history] # We plot GA over time
-                
-                # Create Plot
+                # Create Plot (GA over time, peak and rolling PnL from the cached analytics frame)
+                stats = get_analytics(profile, load_history=load_history)
+                frame = stats['frame']
                 fig = go.Figure()
                 fig.add_trace(go.Scatter(
-                    x=dates, y=pnls,
+                    x=frame['date'], y=frame['end_ga'],
                     mode='lines+markers',
                     name='Bankroll',
                     line=dict(color='#00ff88', width=3),
-                    marker=dict(size=8)
+                    marker=dict(size=8 if len(frame) <= 200 else 0)
+                ))
+                fig.add_trace(go.Scatter(
+                    x=frame['date'], y=frame['peak_ga'],
+                    mode='lines', name='Peak',
+                    line=dict(color='#64748b', width=1, dash='dot')
+                ))
+                fig.add_trace(go.Bar(
+                    x=frame['date'], y=frame['rolling_pnl'],
+                    name=f'Rolling PnL ({ROLLING_WINDOW})', yaxis='y2',
+                    marker_color='#3b82f6', opacity=0.4
                 ))
                 
                 # Styling for Dark Mode
@@ -72,17 +103,40 @@ def show_dashboard():
                     font=dict(color='#94a3b8'),
                     margin=dict(l=20, r=20, t=10, b=20),
                     xaxis=dict(showgrid=False),
-                    yaxis=dict(gridcolor='#334155')
+                    yaxis=dict(gridcolor='#334155'),
+                    yaxis2=dict(overlaying='y', side='right', showgrid=False),
+                    legend=dict(orientation='h')
                 )
                 
                 ui.plotly(fig).classes('w-full h-64')
 
+        # --- MONTHLY AGGREGATES ---
+        monthly = get_analytics(profile, load_history=load_history)['monthly'] if summary['sessions'] else None
+        if monthly is not None and len(monthly):
+            with ui.card().classes('w-full bg-slate-900 p-4'):
+                ui.label('MONTHLY PnL').classes('text-slate-500 text-xs font-bold mb-4')
+                fig = go.Figure(go.Bar(
+                    x=monthly.index.astype(str), y=monthly['pnl'],
+                    marker_color=['#22c55e' if v >= 0 else '#ef4444' for v in monthly['pnl']],
+                    customdata=monthly[['sessions', 'win_rate', 'points']].to_numpy(),
+                    hovertemplate='%{x}: €%{y:,.0f}<br>%{customdata[0]} sessions, %{customdata[1]:.0%} won, %{customdata[2]:,.0f} pts<extra></extra>'
+                ))
+                fig.update_layout(
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font=dict(color='#94a3b8'),
+                    margin=dict(l=20, r=20, t=10, b=20),
+                    xaxis=dict(showgrid=False),
+                    yaxis=dict(gridcolor='#334155')
+                )
+                ui.plotly(fig).classes('w-full h-48')
+
         # --- RECENT HISTORY ---
         with ui.card().classes('w-full bg-slate-800 p-0'):
             ui.label('RECENT LOGS').classes('p-4 text-slate-500 text-xs font-bold')
             
             with ui.column().classes('w-full gap-0'):
-                for session in reversed(history[-5:]): # Show last 5
+                for session in recent[:5]: # Show last 5 (newest first, from the summary ring)
                     pnl = session['pnl']
                     color = 'text-green-400' if pnl >= 0 else 'text-red-400'
                     icon = 'trending_up' if pnl >= 0 else 'trending_down'
@@ -1,13 +1,18 @@
-from nicegui import ui
+import asyncio
+from nicegui import background_tasks, ui
 from engine.strategy_rules import SessionState, BaccaratStrategist, PlayMode
+from engine.progressions import PROGRESSIONS, ProgressionSpec, get_progression
 from engine.tier_params import get_tier_for_ga
-from utils.persistence import load_profile, log_session_result
+from engine.roads import parse_road, replay_road
+from engine.odds import get_odds_table
+from utils.persistence import DEFAULT_PLAYER, load_profile, log_session_result
 
 class Scorecard:
-    def __init__(self):
+    def __init__(self, player: str = DEFAULT_PLAYER):
         # 1. LOAD PERSISTENCE
         # -------------------
-        self.profile = load_profile()
+        self.player = player
+        self.profile = load_profile(player, with_history=False)  # header needs GA / YTD only
         self.start_ga = self.profile['ga']
         
         # 2. AUTO-CALCULATE TIER (Unified Ladder)
@@ -29,9 +34,15 @@ class Scorecard:
         self.shoe_label = None
         self.next_shoe_btn = None
         self.end_session_btn = None
+        self.road_input = None
+        self.hud_odds_label = None
+        self.progression_name = 'Sniper'
+        self.odds_table = None  # engine/odds.py table for the current tier + progression
+        self.session_volume = 0.0  # total wagered this session (SBM points)
         
         self.build_ui()
         self.refresh_hud()
+        background_tasks.create(self.load_odds(self.progression_name))
 
     def process_result(self, won: bool):
         if self.state.mode == PlayMode.STOPPED:
@@ -40,6 +51,7 @@ class Scorecard:
 
         bet_amt = self.current_decision['bet_amount']
         pnl_change = bet_amt if won else -bet_amt
+        self.session_volume += bet_amt
 
         # Update Engine
         BaccaratStrategist.update_state_after_hand(self.state, won, pnl_change)
@@ -50,25 +62,65 @@ class Scorecard:
         # Refresh Screen
         self.refresh_hud()
 
+    def ingest_road(self):
+        """Bulk entry: replays a whole road/CSV (B/P/T, '|' between shoes) and refreshes the HUD once."""
+        if self.state.mode == PlayMode.STOPPED:
+            ui.notify('Session Ended. Please save and exit.', type='warning')
+            return
+        try:
+            shoes = parse_road(self.road_input.value or '')
+        except ValueError as e:
+            ui.notify(str(e), type='negative')
+            return
+        if not shoes:
+            ui.notify('No hands found', type='warning')
+            return
+
+        summary = replay_road(self.state, shoes, ytd_pnl=self.profile['ytd_pnl'])
+        self.session_volume += summary['volume']
+        self.current_decision = BaccaratStrategist.get_next_decision(self.state, ytd_pnl=self.profile['ytd_pnl'])
+        self.refresh_hud()
+        self.road_input.set_value('')
+
+        msg = f"Ingested {summary['hands']} hands ({summary['wins']}W/{summary['losses']}L/{summary['ties']}T), PnL €{summary['pnl']:+,.0f}"
+        if summary['ignored']:
+            msg += f" | {summary['ignored']} hands ignored after the session stopped"
+        ui.notify(msg, type='positive')
+
+    async def load_odds(self, progression: str):
+        """Builds (or fetches the cached) odds table off the event loop."""
+        self.odds_table = None
+        self.refresh_hud()
+        try:
+            table = await asyncio.to_thread(get_odds_table, self.tier_config, progression)
+        except ValueError:
+            table = None  # too many behaviour states (e.g. Oscar's Grind): HUD shows n/a
+        if progression == self.progression_name:
+            self.odds_table = table
+            self.refresh_hud()
+
+    def set_progression(self, e):
+        """Switches bet progression; Sniper is the built-in press logic."""
+        spec = get_progression(e.value)
+        self.state.progression = None if spec.kind == 'sniper' else spec
+        self.progression_name = spec.name
+        ProgressionSpec.reset(self.state)
+        if self.state.mode != PlayMode.STOPPED:
+            self.current_decision = BaccaratStrategist.get_next_decision(self.state, ytd_pnl=self.profile['ytd_pnl'])
+        self.refresh_hud()
+        background_tasks.create(self.load_odds(spec.name))
+        ui.notify(f'Progression: {spec.name}', type='info')
+
     def advance_shoe(self):
         """Moves from Shoe 1 -> 2 -> 3 -> End."""
         if self.state.current_shoe >= 3:
             self.end_session()
             return
 
-        # Advance Shoe
-        self.state.current_shoe += 1
-        
-        # Reset Shoe-Specific Counters (but keep PnL)
-        self.state.hands_played_in_shoe = 0
-        self.state.presses_this_shoe = 0
-        self.state.consecutive_wins = 0
-        self.state.consecutive_losses = 0
-        self.state.penalty_cooldown = 0
+        # Advance Shoe (resets shoe counters, keeps PnL)
+        BaccaratStrategist.advance_shoe(self.state)
         
-        # Capture Snapshot for Shoe 3 Survival Logic
         if self.state.current_shoe == 3:
-            self.state.shoe3_start_pnl = self.state.session_pnl
             ui.notify('Entering Shoe 3: Survival Rules Active', type='info')
 
         # Get fresh decision for new shoe
@@ -85,7 +137,8 @@ class Scorecard:
         final_ga = self.start_ga + self.state.session_pnl
         
         # Save to Persistence
-        log_session_result(self.start_ga, final_ga, self.state.current_shoe)
+        log_session_result(self.start_ga, final_ga, self.state.current_shoe,
+                           tier=self.tier_config.level, volume=self.session_volume, player=self.player)
         
         # Update State
         self.state.mode = PlayMode.STOPPED
@@ -118,7 +171,17 @@ class Scorecard:
         else:
             self.hud_mode_badge.props('color=green icon=verified_user label="SNIPER: ACTIVE"')
 
-        # 3. Update Stats
+        # 3. Update Odds (O(1) table lookup)
+        odds = self.odds_table.lookup(self.state) if self.odds_table and mode != PlayMode.STOPPED else None
+        if odds:
+            self.hud_odds_label.set_text(
+                f"LOCK {odds['p_profit']:.0%} · STOP {odds['p_stop']:.0%} · "
+                f"EXP. VOLUME €{odds['exp_volume']:,.0f}"
+            )
+        else:
+            self.hud_odds_label.set_text("LOCK — · STOP — · EXP. VOLUME —" if mode != PlayMode.STOPPED else "")
+
+        # 4. Update Stats
         pnl = self.state.session_pnl
         current_ga = self.start_ga + pnl
         
@@ -153,6 +216,7 @@ class Scorecard:
                 self.hud_bet_label = ui.label('€50').classes('text-6xl font-black text-white mb-2')
                 self.hud_reason_label = ui.label('Waiting for Trigger').classes('text-slate-400 italic text-sm mb-4')
                 self.hud_mode_badge = ui.chip('ACTIVE', icon='verified_user').props('color=green text-color=white')
+                self.hud_odds_label = ui.label('').classes('text-slate-400 text-xs font-mono mt-2')
 
             # --- CONTROLS ---
             with ui.row().classes('w-full gap-4'):
@@ -185,10 +249,15 @@ class Scorecard:
 
             # --- SESSION TOOLS ---
             with ui.expansion('Session Tools', icon='settings').classes('w-full bg-slate-800 text-slate-300'):
+                with ui.row().classes('px-4 pt-4 w-full'):
+                    ui.select(list(PROGRESSIONS.keys()), value='Sniper', label='Progression', on_change=self.set_progression).classes('w-full')
+                with ui.column().classes('px-4 pt-4 w-full gap-2'):
+                    self.road_input = ui.textarea('Bulk Entry (Road / CSV)', placeholder='BBPBTPPB | PBBBP ...').props('dark autogrow').classes('w-full font-mono')
+                    ui.button('INGEST', on_click=self.ingest_road, icon='playlist_add').props('outline color=cyan')
                 with ui.row().classes('p-4 w-full justify-between'):
                     self.next_shoe_btn = ui.button('Next Shoe', on_click=self.advance_shoe, color='blue', icon='skip_next').props('outline')
                     self.end_session_btn = ui.button('End & Save', on_click=self.end_session, color='red', icon='save').props('outline')
 
-def show_scorecard():
+def show_scorecard(player: str = DEFAULT_PLAYER):
     # Helper to clear content and show this view
-    Scorecard()
+    Scorecard(player)
@@ -1,23 +1,28 @@
+import pandas as pd
 from nicegui import ui
-from utils.persistence import load_profile
+from utils.persistence import DEFAULT_PLAYER, load_profile, load_history
+from utils.analytics import get_analytics
 
-def show_session_log():
+def show_session_log(player: str = DEFAULT_PLAYER):
     # 1. Load Data
-    profile = load_profile()
-    history = profile.get('history', [])
+    profile = load_profile(player, with_history=False)
+    stats = get_analytics(profile, load_history=load_history)
+    frame = stats['frame']
     
-    # 2. Reverse history to show newest first
+    # 2. Reverse history to show newest first (built column-wise from the analytics frame)
     # We add an ID for the table
-    rows = []
-    for i, entry in enumerate(reversed(history)):
-        rows.append({
-            'id': len(history) - i,
-            'date': entry.get('date', 'N/A'),
-            'start': f"€{entry.get('start_ga', 0):.0f}",
-            'end': f"€{entry.get('end_ga', 0):.0f}",
-            'pnl': entry.get('pnl', 0),
-            'shoes': entry.get('shoes', 0)
-        })
+    newest = frame.iloc[::-1]
+    rows = pd.DataFrame({
+        'id': newest.index,
+        'date': newest['date'].dt.strftime('%Y-%m-%d %H:%M').fillna('N/A'),
+        'start': '€' + newest['start_ga'].round().astype('int64').astype(str),
+        'end': '€' + newest['end_ga'].round().astype('int64').astype(str),
+        'pnl': newest['pnl'],
+        'shoes': newest['shoes'],
+        'tier': newest['tier'].astype(object).where(newest['tier'].notna(), '-'),
+        'volume': newest['volume'].round(),
+        'drawdown': newest['drawdown'].round(),
+    }).to_dict('records')
 
     # 3. UI Layout
     with ui.column().classes('w-full max-w-4xl mx-auto gap-6 p-4'):
@@ -38,6 +43,8 @@ def show_session_log():
                         {'headerName': 'Start', 'field': 'start', 'width': 100},
                         {'headerName': 'End', 'field': 'end', 'width': 100},
                         {'headerName': 'Shoes', 'field': 'shoes', 'width': 90},
+                        {'headerName': 'Tier', 'field': 'tier', 'width': 80},
+                        {'headerName': 'Volume', 'field': 'volume', 'width': 110, 'valueFormatter': "'€' + value"},
                         {
                             'headerName': 'PnL', 
                             'field': 'pnl', 
@@ -52,11 +59,30 @@ def show_session_log():
                             # Format as currency
                             'valueFormatter': "'€' + value" 
                         },
+                        {'headerName': 'Drawdown', 'field': 'drawdown', 'width': 120, 'valueFormatter': "'€' + value"},
                     ],
                     'rowData': rows,
                     'rowSelection': 'single',
                 }).classes('h-96 w-full theme-balham-dark')
                 
+            # Yearly Aggregates
+            yearly = stats['yearly']
+            if len(yearly):
+                with ui.card().classes('w-full bg-slate-900 p-0 overflow-hidden'):
+                    ui.aggrid({
+                        'columnDefs': [
+                            {'headerName': 'Year', 'field': 'year', 'width': 90},
+                            {'headerName': 'Sessions', 'field': 'sessions', 'width': 100},
+                            {'headerName': 'PnL', 'field': 'pnl', 'width': 120, 'valueFormatter': "'€' + value"},
+                            {'headerName': 'Win Rate', 'field': 'win_rate', 'width': 110, 'valueFormatter': "Math.round(value * 100) + '%'"},
+                            {'headerName': 'Volume', 'field': 'volume', 'width': 130, 'valueFormatter': "'€' + value"},
+                            {'headerName': 'Points', 'field': 'points', 'width': 110},
+                        ],
+                        'rowData': yearly.round().assign(year=yearly.index.astype(str), win_rate=yearly['win_rate']).to_dict('records'),
+                    }).classes('h-48 w-full theme-balham-dark')
+
             # Export / Summary
-            with ui.row().classes('w-full justify-end text-slate-500 text-xs'):
+            with ui.row().classes('w-full justify-end gap-6 text-slate-500 text-xs'):
+                ui.label(f"Win Rate: {stats['win_rate']:.0%}")
+                ui.label(f"Max Drawdown: €{stats['max_drawdown']:,.0f}")
                 ui.label(f"Total Sessions: {len(rows)}")
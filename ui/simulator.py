@@ -1,12 +1,40 @@
 from nicegui import ui
 import plotly.graph_objects as go
-import random
 import asyncio
+import csv
+import io
+from concurrent.futures import TimeoutError as FuturesTimeout
 import traceback
 import numpy as np
-from engine.strategy_rules import SessionState, BaccaratStrategist, PlayMode, StrategyOverrides
-from engine.tier_params import TIER_MAP, TierConfig, generate_tier_map, get_tier_for_ga
-from utils.persistence import load_profile, save_profile
+from engine.strategy_rules import StrategyOverrides
+from engine.tier_params import get_ladder
+from engine.career import run_careers, merge_results
+from engine.trajectory import TrajectoryBuffer
+from engine.parallel import USE_PROCESSES, SharedCareerBlock, submit_batch, get_pool
+from engine.sensitivity import (PARAMETERS, METRICS, SOBOL_BASE_SAMPLES, crn_universes, evaluate_point,
+                                format_value, oat_design, oat_effects, saltelli_design, sobol_indices, with_parameters)
+from engine.corpus import list_corpora, open_corpus
+from engine.markov import forecast_career
+from engine.importance import TARGETS, make_tilt
+from engine.analysis import summarize
+from engine.sampling import SAMPLING_MODES, effective_sampling, uses_predraw, predraw_batch_size
+from engine.checkpoint import CHECKPOINT_MIN_UNIVERSES, CheckpointInUse, RunCheckpoint, config_key, batch_seed
+from engine.ecosystem import PLAY_GATE
+from engine.tracing import TRACE_DTYPE, TraceRing, trace_table
+from engine.kernel import KERNEL_BACKEND
+from engine.progressions import PROGRESSIONS
+from utils.persistence import DEFAULT_PLAYER, load_profile, update_profile
+from utils.metrics import record_careers
+from utils.scheduler import SCHEDULER, QUEUED, DONE, CANCELLED, FAILED
+
+# LIVE STREAMING: seconds between progress polls / partial redraws (max 2 websocket pushes/s)
+LIVE_REFRESH_INTERVAL = 0.5
+SYNTHETIC_SOURCE = 'Synthetic (i.i.d.)'
+BOOTSTRAP_BLOCKS = {1: 'Single Shoes', 3: '3-Shoe Blocks'}
+# How often the analytic preview checks the sliders for changes (seconds)
+PREVIEW_POLL_INTERVAL = 0.3
+
+GRADE_COLORS = {'A': 'text-green-400', 'B': 'text-blue-400', 'C': 'text-yellow-400', 'D': 'text-orange-400', 'F': 'text-red-600'}
 
 # SBM LOYALTY TIERS
 SBM_TIERS = {
@@ -15,171 +43,35 @@ SBM_TIERS = {
     'Platinum': 175000
 }
 
-class SimulationWorker:
-    """Runs the strategy logic."""
-    @staticmethod
-    def run_session(current_ga: float, overrides: StrategyOverrides, tier_map: dict, use_ratchet: bool = False):
-        tier = get_tier_for_ga(current_ga, tier_map)
-        
-        session_overrides = overrides
-        trigger_profit_amount = 0
-        ratchet_triggered = False
-        
-        if use_ratchet:
-            trigger_profit_amount = overrides.profit_lock_units * tier.base_unit
-            session_overrides = StrategyOverrides(
-                iron_gate_limit=overrides.iron_gate_limit,
-                stop_loss_units=overrides.stop_loss_units,
-                profit_lock_units=1000, 
-                press_trigger_wins=overrides.press_trigger_wins,
-                press_depth=overrides.press_depth
-            )
-        
-        state = SessionState(tier=tier, overrides=session_overrides)
-        state.current_shoe = 1
-        volume = 0 
-        
-        while state.current_shoe <= 3 and state.mode != PlayMode.STOPPED:
-            decision = BaccaratStrategist.get_next_decision(state, ytd_pnl=0.0)
-            
-            if decision['mode'] == PlayMode.STOPPED:
-                break
-            
-            bet = decision['bet_amount']
-            volume += bet
-            
-            if use_ratchet:
-                if not ratchet_triggered and state.session_pnl >= trigger_profit_amount:
-                    ratchet_triggered = True
-                
-                # Dynamic Ratchet Lock
-                # Lock % of the Trigger Amount
-                lock_pct = overrides.ratchet_lock_pct / 100.0
-                lock_floor = trigger_profit_amount * lock_pct
-                
-                if ratchet_triggered and state.session_pnl <= lock_floor:
-                    break 
-
-            rnd = random.random()
-            won = False
-            pnl_change = 0
-            is_tie = False
-            
-            if rnd < 0.4586: 
-                won = True
-                pnl_change = bet * 0.95 
-            elif rnd < (0.4586 + 0.4462): 
-                won = False
-                pnl_change = -bet
-            else: 
-                is_tie = True
-                pnl_change = 0
-
-            if not is_tie:
-                BaccaratStrategist.update_state_after_hand(state, won, pnl_change)
-            else:
-                state.hands_played_in_shoe += 1
-
-            if state.hands_played_in_shoe >= 80:
-                state.current_shoe += 1
-                state.hands_played_in_shoe = 0
-                state.presses_this_shoe = 0
-                if state.current_shoe == 3:
-                    state.shoe3_start_pnl = state.session_pnl
-
-        return state.session_pnl, volume
-
-    @staticmethod
-    def run_full_career(start_ga, total_months, sessions_per_year, 
-                        contrib_win, contrib_loss, overrides, use_ratchet,
-                        use_tax, use_holiday, safety_factor, 
-                        target_points, earn_rate):
-        
-        tier_map = generate_tier_map(safety_factor)
-        trajectory = []
-        current_ga = start_ga
-        sessions_played_total = 0
-        last_session_won = False
-        
-        m_contrib = 0
-        m_tax = 0
-        m_play_pnl = 0
-        m_holidays = 0
-        m_insolvent_months = 0 
-        m_total_volume = 0 
-        
-        gold_hit_year = -1
-        current_year_points = 0
-        
-        for m in range(total_months):
-            if m > 0 and m % 12 == 0:
-                current_year_points = 0
 
-            # A. Luxury Tax
-            tax_thresh = overrides.tax_threshold
-            tax_rate = overrides.tax_rate / 100.0
-            
-            if use_tax and current_ga > tax_thresh:
-                surplus = current_ga - tax_thresh
-                tax = surplus * tax_rate
-                current_ga -= tax
-                m_tax += tax
-
-            # B. Contribution
-            should_contribute = True
-            if use_holiday and current_ga >= 10000:
-                should_contribute = False
-            
-            if should_contribute:
-                amount = contrib_win if last_session_won else contrib_loss
-                current_ga += amount
-                m_contrib += amount
-            else:
-                m_holidays += 1
-            
-            # C. Play
-            can_play = (current_ga >= 1500)
-            if not can_play:
-                m_insolvent_months += 1
-            
-            expected_sessions = int((m + 1) * (sessions_per_year / 12))
-            sessions_due = expected_sessions - sessions_played_total
-            
-            if can_play and sessions_due > 0:
-                for _ in range(sessions_due):
-                    pnl, vol = SimulationWorker.run_session(current_ga, overrides, tier_map, use_ratchet)
-                    current_ga += pnl
-                    m_play_pnl += pnl
-                    sessions_played_total += 1
-                    m_total_volume += vol
-                    last_session_won = (pnl > 0)
-                    
-                    points = vol * (earn_rate / 100)
-                    current_year_points += points
-            
-            if gold_hit_year == -1 and current_year_points >= target_points:
-                gold_hit_year = (m // 12) + 1
-            
-            trajectory.append(current_ga)
-            
-        return {
-            'trajectory': trajectory,
-            'final_ga': current_ga,
-            'contrib': m_contrib,
-            'tax': m_tax,
-            'play_pnl': m_play_pnl,
-            'holidays': m_holidays,
-            'insolvent_months': m_insolvent_months,
-            'total_volume': m_total_volume,
-            'gold_year': gold_hit_year
-        }
+def custom_status_levels(text: str) -> dict:
+    """'10000, 50k' -> {'Custom 10,000': 10000, 'Custom 50,000': 50000} (unparseable entries skipped)."""
+    levels = {}
+    for part in (text or '').replace(';', ',').split(','):
+        part = part.strip().lower().replace('_', '').replace(' ', '')
+        scale = 1000 if part.endswith('k') else 1
+        try:
+            points = int(float(part.rstrip('k')) * scale)
+        except ValueError:
+            continue
+        if points > 0:
+            levels[f"Custom {points:,}"] = points
+    return levels
 
-def show_simulator():
+def show_simulator(player: str = DEFAULT_PLAYER):
     running = False
+    current_job = None
+    live_plot = None
+    client_id = ui.context.client.id
+    preview_signature = None
+    preview_busy = False
+
+    # Closing the tab cancels this client's queued/running simulations
+    ui.context.client.on_disconnect(lambda: SCHEDULER.cancel_client(client_id))
     
     # --- STRATEGY LIBRARY ---
     def load_saved_strategies():
-        profile = load_profile()
+        profile = load_profile(player, with_history=False)
         return profile.get('saved_strategies', {})
 
     def update_strategy_list():
@@ -193,14 +85,15 @@ def show_simulator():
             ui.notify('Please enter a name', type='warning')
             return
         
-        profile = load_profile()
-        if 'saved_strategies' not in profile:
-            profile['saved_strategies'] = {}
-            
         config = {
             'sim_num': slider_num_sims.value,
             'sim_years': slider_years.value,
             'sim_freq': slider_frequency.value,
+            'sim_is': select_is_target.value,
+            'sim_sampling': select_sampling.value,
+            'sim_source': select_source.value,
+            'sim_block': select_block.value,
+            'sim_custom_status': input_custom_status.value,
             'eco_win': slider_contrib_win.value,
             'eco_loss': slider_contrib_loss.value,
             'eco_tax': switch_luxury_tax.value,
@@ -208,9 +101,11 @@ def show_simulator():
             'eco_tax_thresh': slider_tax_thresh.value,
             'eco_tax_rate': slider_tax_rate.value,
             'tac_safety': slider_safety.value,
+            'tac_mode': select_ladder_mode.value,
             'tac_iron': slider_iron_gate.value,
             'tac_press': select_press.value,
             'tac_depth': slider_press_depth.value,
+            'tac_prog': select_progression.value,
             'risk_stop': slider_stop_loss.value,
             'risk_prof': slider_profit.value,
             'risk_ratch': switch_ratchet.value,
@@ -220,8 +115,8 @@ def show_simulator():
             'start_ga': slider_start_ga.value # NEW
         }
         
-        profile['saved_strategies'][name] = config
-        save_profile(profile)
+        # Re-read and write under the profile lock (a cockpit session may be logging meanwhile)
+        update_profile(player, lambda profile: profile.setdefault('saved_strategies', {}).update({name: config}))
         ui.notify(f'Saved: {name}', type='positive')
         update_strategy_list()
         input_name.value = ''
@@ -237,6 +132,13 @@ def show_simulator():
         slider_num_sims.value = config.get('sim_num', 20)
         slider_years.value = config.get('sim_years', 10)
         slider_frequency.value = config.get('sim_freq', 9)
+        select_is_target.value = config.get('sim_is', 'Off')
+        sampling = config.get('sim_sampling', 'Plain')
+        select_sampling.value = sampling if sampling in select_sampling.options else 'Plain'
+        source = config.get('sim_source', SYNTHETIC_SOURCE)
+        select_source.value = source if source in select_source.options else SYNTHETIC_SOURCE
+        select_block.value = config.get('sim_block', 1)
+        input_custom_status.value = config.get('sim_custom_status', '')
         slider_contrib_win.value = config.get('eco_win', 300)
         slider_contrib_loss.value = config.get('eco_loss', 200)
         switch_luxury_tax.value = config.get('eco_tax', True)
@@ -244,9 +146,11 @@ def show_simulator():
         slider_tax_rate.value = config.get('eco_tax_rate', 25)
         switch_holiday.value = config.get('eco_hol', True)
         slider_safety.value = config.get('tac_safety', 20)
+        select_ladder_mode.value = config.get('tac_mode', 'Standard')
         slider_iron_gate.value = config.get('tac_iron', 3)
         select_press.value = config.get('tac_press', 2)
         slider_press_depth.value = config.get('tac_depth', 3)
+        select_progression.value = config.get('tac_prog', 'Sniper')
         slider_stop_loss.value = config.get('risk_stop', 8)
         slider_profit.value = config.get('risk_prof', 10)
         switch_ratchet.value = config.get('risk_ratch', False)
@@ -261,106 +165,322 @@ def show_simulator():
         name = select_saved.value
         if not name: return
         
-        profile = load_profile()
-        if 'saved_strategies' in profile and name in profile['saved_strategies']:
-            del profile['saved_strategies'][name]
-            save_profile(profile)
-            ui.notify(f'Deleted: {name}', type='negative')
-            select_saved.value = None
-            update_strategy_list()
+        update_profile(player, lambda profile: profile.get('saved_strategies', {}).pop(name, None))
+        ui.notify(f'Deleted: {name}', type='negative')
+        select_saved.value = None
+        update_strategy_list()
 
     def update_ladder_preview():
-        factor = slider_safety.value
-        t_map = generate_tier_map(factor)
+        factor = int(slider_safety.value)
+        ladder = get_ladder(factor, select_ladder_mode.value)
         rows = []
-        for level, t in t_map.items():
-            risk_pct = (t.base_unit / t.min_ga) * 100
+        for level, t in zip(ladder.levels, ladder.tiers):
+            risk_pct = (t.base_unit / t.min_ga) * 100 if t.min_ga > 0 else 0
+            bet = f"€{t.base_unit:.0f}" if t.press_unit == t.base_unit else f"€{t.base_unit:.0f}/{t.press_unit:.0f}"
             rows.append({
                 'tier': f"Tier {level}",
-                'bet': f"€{t.base_unit}",
+                'bet': bet,
                 'start': f"€{t.min_ga:,.0f}",
                 'risk': f"{risk_pct:.1f}%"
             })
         ladder_grid.options['rowData'] = rows
         ladder_grid.update()
 
+    # --- ANALYTIC PREVIEW (Markov chain, no sampling) ---
+    def preview_inputs():
+        overrides = StrategyOverrides(
+            iron_gate_limit=int(slider_iron_gate.value),
+            stop_loss_units=int(slider_stop_loss.value),
+            profit_lock_units=int(slider_profit.value),
+            press_trigger_wins=int(select_press.value),
+            press_depth=int(slider_press_depth.value),
+            progression=select_progression.value,
+            ratchet_lock_pct=int(slider_ratchet_lock.value),
+            tax_threshold=int(slider_tax_thresh.value),
+            tax_rate=int(slider_tax_rate.value)
+        )
+        return (
+            int(slider_start_ga.value), int(slider_years.value) * 12, int(slider_frequency.value),
+            int(slider_contrib_win.value), int(slider_contrib_loss.value), overrides,
+            switch_ratchet.value, switch_luxury_tax.value, switch_holiday.value,
+            int(slider_safety.value), select_ladder_mode.value,
+        )
+
+    async def refresh_preview():
+        nonlocal preview_signature, preview_busy
+        if preview_busy: return
+        inputs = preview_inputs()
+        if inputs == preview_signature: return
+        preview_busy = True
+        try:
+            preview = await asyncio.to_thread(forecast_career, *inputs)
+            preview_signature = inputs
+            render_preview(preview, inputs[0])
+        except Exception as e:
+            print(traceback.format_exc())
+            preview_signature = inputs
+            lbl_preview_note.set_text(f"Preview unavailable: {e}")
+        finally:
+            preview_busy = False
+
+    def render_preview(preview, start_ga):
+        survival = 1 - preview.prob_insolvent
+        color = 'text-green-400' if survival >= 0.9 else ('text-yellow-400' if survival >= 0.7 else 'text-red-400')
+        lbl_preview_survival.set_text(f"{survival*100:.1f}%")
+        lbl_preview_survival.classes(replace=f'text-2xl font-black {color}')
+        lbl_preview_final.set_text(f"€{preview.expected_final_ga:,.0f}")
+        lbl_preview_bands.set_text(
+            f"€{preview.bands[10][-1]:,.0f} / €{preview.bands[50][-1]:,.0f} / €{preview.bands[90][-1]:,.0f}"
+        )
+        lbl_preview_insolvent.set_text(f"{preview.expected_insolvent_months:.1f}")
+        if preview.approximate:
+            # Catch-up runs / tails fell off the grid or the backlog cap: numbers are only indicative
+            lbl_preview_note.set_text(
+                f"APPROXIMATE (out of range): up to {preview.clipped_mass * 100:.0f}% of careers hit the grid edge or the catch-up cap. "
+                f"Run the sim for real numbers."
+            )
+            lbl_preview_note.classes(replace='text-[10px] text-orange-400 italic')
+            return
+        lbl_preview_note.set_text(
+            f"Analytic estimate from €{start_ga:,} (bucketed GA, sampled session law). Run the sim for the full picture."
+        )
+        lbl_preview_note.classes(replace='text-[10px] text-slate-600 italic')
+
+    def request_abort():
+        if current_job is None: return
+        SCHEDULER.cancel(current_job.id)
+        btn_abort.disable()
+        label_stats.set_text("Aborting after current careers...")
+
+    def read_inputs():
+        """Slider values -> (config, overrides, run_careers keyword arguments)."""
+        # --- CONFIG ---
+        config = {
+            'num_sims': int(slider_num_sims.value),
+            'seed': None if input_seed.value is None else int(input_seed.value),
+            'years': int(slider_years.value),
+            'freq': int(slider_frequency.value),
+            'is_target': select_is_target.value,
+            'sampling': select_sampling.value,
+            'hand_source': select_source.value,
+            'block': int(select_block.value),
+            'contrib_win': int(slider_contrib_win.value),
+            'contrib_loss': int(slider_contrib_loss.value),
+            'status_target_name': select_status.value,
+            'status_target_pts': SBM_TIERS[select_status.value],
+            # Every level is evaluated from the same run's yearly points
+            'status_levels': {**SBM_TIERS, **custom_status_levels(input_custom_status.value)},
+            'earn_rate': float(slider_earn_rate.value),
+            'use_ratchet': switch_ratchet.value,
+            'use_tax': switch_luxury_tax.value,
+            'use_holiday': switch_holiday.value,
+            'safety': int(slider_safety.value),
+            'ladder_mode': select_ladder_mode.value,
+            'start_ga': int(slider_start_ga.value), # NEW
+            'press_depth': int(slider_press_depth.value),
+            'ratchet_pct': int(slider_ratchet_lock.value),
+            'tax_thresh': int(slider_tax_thresh.value),
+            'tax_rate': int(slider_tax_rate.value),
+            'press_limit_capped': True # Controlled by depth slider now
+        }
+
+        total_months = config['years'] * 12
+
+        overrides = StrategyOverrides(
+            iron_gate_limit=int(slider_iron_gate.value),
+            stop_loss_units=int(slider_stop_loss.value),
+            profit_lock_units=int(slider_profit.value),
+            press_trigger_wins=int(select_press.value),
+            press_depth=config['press_depth'],
+            progression=select_progression.value,
+            ratchet_lock_pct=config['ratchet_pct'],
+            tax_threshold=config['tax_thresh'],
+            tax_rate=config['tax_rate']
+        )
+
+        # Generate dynamic tiers based on safety factor
+        # Use the user's Start GA directly
+        start_ga = config['start_ga']
+
+        career_params = dict(
+            start_ga=start_ga, total_months=total_months, sessions_per_year=config['freq'],
+            contrib_win=config['contrib_win'], contrib_loss=config['contrib_loss'], overrides=overrides,
+            use_ratchet=config['use_ratchet'], use_tax=config['use_tax'], use_holiday=config['use_holiday'],
+            safety_factor=config['safety'], target_points=config['status_target_pts'], earn_rate=config['earn_rate'],
+            ladder_mode=config['ladder_mode'], tilt=make_tilt(config['is_target'], config['years'] * config['freq']),
+            sampling=config['sampling'],
+        )
+        # Record the mode that actually runs (e.g. Sobol past its dimension limit is stratified)
+        config['sampling'] = career_params['sampling'] = effective_sampling(config['sampling'], config['years'] * config['freq'])
+        if uses_predraw(config['sampling']):
+            # Variance-reduced universes are pre-drawn from the real table (no likelihood ratio)
+            career_params['tilt'] = None
+            config['is_target'] = 'Off'
+        config['hand_source_label'] = None
+        if config['hand_source'] != SYNTHETIC_SOURCE:
+            config['hand_source_label'] = f"Backtest {config['hand_source']} ({BOOTSTRAP_BLOCKS[config['block']]})"
+            # Backtest: sessions replay recorded shoes (memory-mapped, reopened by path in workers)
+            career_params['corpus'] = open_corpus(config['hand_source'])
+            career_params['block_shoes'] = config['block']
+            career_params['tilt'] = None
+            config['is_target'] = 'Off'  # recorded shoes carry no likelihood ratio
+            config['sampling'] = career_params['sampling'] = 'Plain'
+        if switch_trace.value:
+            career_params['trace'] = TraceRing(universe_rate=min(1.0, max(0.0, float(input_trace_pct.value or 0)) / 100))
+        return config, overrides, career_params
+
     async def run_sim():
-        nonlocal running
+        nonlocal running, current_job, live_plot
         if running: return
+        trajectories = None
+        block = None
+        checkpoint = None
         
         try:
             running = True
+            current_job = None
+            live_plot = None
             btn_sim.disable()
+            btn_sens.disable()
+            btn_abort.enable()
+            btn_abort.set_visibility(True)
             progress.set_value(0)
             progress.set_visibility(True)
             label_stats.set_text("Initializing Multiverse...")
             
-            # --- CONFIG ---
-            config = {
-                'num_sims': int(slider_num_sims.value),
-                'years': int(slider_years.value),
-                'freq': int(slider_frequency.value),
-                'contrib_win': int(slider_contrib_win.value),
-                'contrib_loss': int(slider_contrib_loss.value),
-                'status_target_name': select_status.value,
-                'status_target_pts': SBM_TIERS[select_status.value],
-                'earn_rate': float(slider_earn_rate.value),
-                'use_ratchet': switch_ratchet.value,
-                'use_tax': switch_luxury_tax.value,
-                'use_holiday': switch_holiday.value,
-                'safety': int(slider_safety.value),
-                'start_ga': int(slider_start_ga.value), # NEW
-                'press_depth': int(slider_press_depth.value),
-                'ratchet_pct': int(slider_ratchet_lock.value),
-                'tax_thresh': int(slider_tax_thresh.value),
-                'tax_rate': int(slider_tax_rate.value),
-                'press_limit_capped': True # Controlled by depth slider now
-            }
-            
+            config, overrides, career_params = read_inputs()
             total_months = config['years'] * 12
-            
-            overrides = StrategyOverrides(
-                iron_gate_limit=int(slider_iron_gate.value),
-                stop_loss_units=int(slider_stop_loss.value),
-                profit_lock_units=int(slider_profit.value),
-                press_trigger_wins=int(select_press.value),
-                press_depth=config['press_depth'],
-                ratchet_lock_pct=config['ratchet_pct'],
-                tax_threshold=config['tax_thresh'],
-                tax_rate=config['tax_rate']
-            )
+            trace = career_params.get('trace')
 
-            # Generate dynamic tiers based on safety factor
-            # Use the user's Start GA directly
-            start_ga = config['start_ga']
-            
-            all_results = []
-            batch_size = 10
-            for i in range(0, config['num_sims'], batch_size):
-                count = min(batch_size, config['num_sims'] - i)
-                
-                def run_batch_careers():
-                    batch_data = []
-                    for _ in range(count):
-                        res = SimulationWorker.run_full_career(
-                            start_ga, total_months, config['freq'],
-                            config['contrib_win'], config['contrib_loss'], overrides, 
-                            config['use_ratchet'], config['use_tax'], config['use_holiday'], 
-                            config['safety'], config['status_target_pts'], config['earn_rate']
-                        )
-                        batch_data.append(res)
-                    return batch_data
-
-                batch_res = await asyncio.to_thread(run_batch_careers)
-                all_results.extend(batch_res)
-                
-                pct = len(all_results) / config['num_sims']
-                progress.set_value(pct)
-                label_stats.set_text(f"Simulating Universe {len(all_results)}/{config['num_sims']}")
+            # --- SUBMIT TO THE SHARED LAB SCHEDULER ---
+            # Each batch is one vectorized career run (engine/career.py)
+            batch_size = min(1000, max(10, config['num_sims'] // 20))
+            if uses_predraw(config['sampling']):
+                # Each batch pre-draws all of its hands: keep that matrix bounded
+                batch_size = min(batch_size, predraw_batch_size(total_months * config['freq'] // 12))
+            n_batches = -(-config['num_sims'] // batch_size)
+
+            # Checkpoints (engine/checkpoint.py): big runs save every finished batch and
+            # pick up where an aborted / interrupted run with the same settings stopped
+            if config['num_sims'] >= CHECKPOINT_MIN_UNIVERSES:
+                try:
+                    checkpoint = await asyncio.to_thread(RunCheckpoint, config_key(config, overrides, batch_size),
+                                                         n_batches, batch_size, config['seed'])
+                except CheckpointInUse:
+                    # Same settings already running elsewhere: run this one unsaved
+                    ui.notify("An identical run is in progress: this one runs without a checkpoint", type='warning')
+            if checkpoint is not None:
+                run_seed = checkpoint.seed
+                if checkpoint.resumed:
+                    ui.notify(f"Resuming from checkpoint: {checkpoint.resumed}/{config['num_sims']} Universes done", type='info')
+            else:
+                run_seed = config['seed'] if config['seed'] is not None else int(np.random.SeedSequence().entropy % (2 ** 63))
+            config['run_seed'] = run_seed
+            restored = checkpoint.completed if checkpoint else set()
+
+            # One float32 block for every universe; batches write their rows in place.
+            # With worker processes the columns live in shared memory too, so a batch
+            # only sends back a completion notice.
+            if USE_PROCESSES:
+                block = SharedCareerBlock(config['num_sims'], total_months)
+                trajectories = block.trajectories
+            else:
+                trajectories = TrajectoryBuffer(config['num_sims'], total_months)
+
+            def restore_batch(index, start, count):
+                data = checkpoint.load_batch(index)
+                rows = trajectories.rows(start, count)
+                rows[:] = data.pop('trajectory')
+                if block is None:
+                    return {**data, 'trajectory': rows}
+                for name, values in data.items():
+                    block.arrays[name][start:start + count] = values
+                return block.batch(start, count)
+
+            def run_batch_careers(job, index):
+                start = index * batch_size
+                count = min(batch_size, config['num_sims'] - start)
+                if index in restored:
+                    return restore_batch(index, start, count)
+                # Batch i always gets the same stream, wherever and whenever it runs
+                seed = batch_seed(run_seed, index)
+                if block is None:
+                    # Own ring per batch, merged in when the batch lands
+                    params = career_params if trace is None else {**career_params, 'trace': trace.spawn()}
+                    result = run_careers(
+                        count, rng=np.random.default_rng(seed), should_stop=lambda: job.cancel_requested,
+                        first_universe=start, trajectory_out=trajectories.rows(start, count), **params
+                    )
+                    if trace is not None and result is not None:
+                        trace.extend(params['trace'].records())
+                else:
+                    future = submit_batch(block, start, count, career_params, seed)
+                    while True:
+                        try:
+                            _, _, completed, traces = future.result(timeout=LIVE_REFRESH_INTERVAL)
+                            break
+                        except FuturesTimeout:
+                            if job.cancel_requested:
+                                block.cancel()
+                    result = block.batch(start, count) if completed else None
+                    if traces is not None:
+                        trace.extend(traces)
+                if result is not None:
+                    record_careers(result)
+                    if checkpoint is not None:
+                        checkpoint.save_batch(index, result, PLAY_GATE)
+                return result
+
+            label = f"{config['num_sims']}u x {config['years']}y ({config['status_target_name']})"
+            job = SCHEDULER.submit(client_id, label, n_batches, run_batch_careers)
+            current_job = job
+
+            def live_summary(batches):
+                # Out-of-order batches make merge_results copy trajectories: keep it off the event loop
+                return summarize(merge_results(batches, trajectories), config, overrides, True)
+
+            # Live Streaming (throttled): poll at most every LIVE_REFRESH_INTERVAL and
+            # redraw bands + scoreboard from what has landed
+            rendered = 0
+            while not job.finished:
+                await asyncio.sleep(LIVE_REFRESH_INTERVAL)
+                if job.status == QUEUED:
+                    label_stats.set_text(f"Queued (position {SCHEDULER.queue_position(job) + 1})...")
+                    continue
+                batches = job.results()
+                n_done = sum(len(b['final_ga']) for b in batches if b is not None)
+                progress.set_value(n_done / config['num_sims'])
+                label_stats.set_text(f"Simulating Universe {n_done}/{config['num_sims']}")
+                if rendered < n_done < config['num_sims']:
+                    render_analysis(await asyncio.to_thread(live_summary, batches))
+                    rendered = n_done
+
+            if job.status == FAILED:
+                raise job.error
+            if job.status == DONE and checkpoint is not None:
+                await asyncio.to_thread(checkpoint.discard)
+
+            results = await asyncio.to_thread(merge_results, job.results(), trajectories)
+            n_done = len(results.get('final_ga', []))
+            if not n_done:
+                label_stats.set_text("Aborted before any Universe completed")
+                return
 
             label_stats.set_text("Analyzing Data...")
-            render_analysis(all_results, config, start_ga, overrides)
-            label_stats.set_text("Simulation Complete")
+            try:
+                summary = await asyncio.to_thread(summarize, results, config, overrides)
+            except Exception as e:
+                label_stats.set_text(f"Analysis Error: {e}")
+                print(traceback.format_exc())
+                return
+            render_analysis(summary)
+            if trace is not None:
+                render_traces(trace, results)
+            if job.status == CANCELLED:
+                kept = " (checkpoint kept: run again to resume)" if checkpoint is not None else ""
+                label_stats.set_text(f"Aborted: {n_done}/{config['num_sims']} Universes analyzed{kept}")
+            else:
+                label_stats.set_text("Simulation Complete")
 
         except Exception as e:
             error_msg = str(e)
@@ -370,58 +490,172 @@ def show_simulator():
             
         finally:
             running = False
+            current_job = None
+            if checkpoint is not None:
+                checkpoint.close()  # release the run directory (kept on disk unless discarded)
+            if block is not None:
+                block.close()
+            elif trajectories is not None:
+                trajectories.close()
             btn_sim.enable()
+            btn_sens.enable()
+            btn_abort.set_visibility(False)
             progress.set_visibility(False)
 
-    def render_analysis(results, config, start_ga, overrides):
-        if not results: return
-        
-        trajectories = np.array([r['trajectory'] for r in results])
-        months = list(range(trajectories.shape[1]))
-        
-        min_band = np.min(trajectories, axis=0)
-        max_band = np.max(trajectories, axis=0)
-        p25_band = np.percentile(trajectories, 25, axis=0)
-        p75_band = np.percentile(trajectories, 75, axis=0)
-        mean_line = np.mean(trajectories, axis=0)
-        
-        avg_final_ga = np.mean([r['final_ga'] for r in results])
-        avg_contrib = np.mean([r['contrib'] for r in results])
-        avg_tax = np.mean([r['tax'] for r in results])
-        avg_pnl = np.mean([r['play_pnl'] for r in results])
-        avg_holidays = np.mean([r['holidays'] for r in results])
-        avg_insolvent = np.mean([r['insolvent_months'] for r in results])
-        avg_volume = np.mean([r['total_volume'] for r in results])
-        
-        gold_hits = [r['gold_year'] for r in results if r['gold_year'] != -1]
-        gold_prob = (len(gold_hits) / len(results)) * 100
-        avg_year_hit = np.mean(gold_hits) if gold_hits else 0
-        
-        total_months = config['years'] * 12
-        insolvency_pct = (avg_insolvent / total_months) * 100
-        active_pct = 100 - insolvency_pct
-        avg_monthly_cost = (avg_contrib - avg_tax) / total_months
-        net_life_result = avg_final_ga + avg_tax - (start_ga + avg_contrib)
+    async def run_sensitivity():
+        """
+        One-at-a-time sensitivity around the current sliders (plus Sobol indices when
+        switched on). Every design point replays the same hands (common random
+        numbers), so small differences between points are real, not noise.
+        """
+        nonlocal running, current_job
+        if running: return
+
+        try:
+            running = True
+            current_job = None
+            btn_sim.disable()
+            btn_sens.disable()
+            btn_abort.enable()
+            btn_abort.set_visibility(True)
+            progress.set_value(0)
+            progress.set_visibility(True)
+
+            config, overrides, career_params = read_inputs()
+            if config['hand_source'] != SYNTHETIC_SOURCE:
+                ui.notify('Sensitivity uses synthetic hands', type='info')
+            for key in ('corpus', 'block_shoes', 'trace'):
+                career_params.pop(key, None)
+            career_params['tilt'] = None
+
+            n_universes = crn_universes(config['num_sims'], config['years'] * config['freq'])
+            seed = int(np.random.SeedSequence().generate_state(1)[0])
+            names = list(PARAMETERS)
+            oat = oat_design(career_params, names)
+            sobol = saltelli_design(names, SOBOL_BASE_SAMPLES, seed) if switch_sobol.value else []
+            points = [with_parameters(career_params, values) for _, _, values in oat]
+            points += [with_parameters(career_params, values) for values in sobol]
+
+            def run_point(job, index):
+                if job.cancel_requested:
+                    return None
+                if not USE_PROCESSES:
+                    return evaluate_point(points[index], n_universes, seed)
+                future = get_pool().submit(evaluate_point, points[index], n_universes, seed)
+                while True:
+                    try:
+                        return future.result(timeout=LIVE_REFRESH_INTERVAL)
+                    except FuturesTimeout:
+                        if job.cancel_requested:
+                            future.cancel()
+                            return None
+
+            job = SCHEDULER.submit(client_id, f"Sensitivity {len(points)} pts x {n_universes}u", len(points), run_point)
+            current_job = job
+            while not job.finished:
+                await asyncio.sleep(LIVE_REFRESH_INTERVAL)
+                if job.status == QUEUED:
+                    label_stats.set_text(f"Queued (position {SCHEDULER.queue_position(job) + 1})...")
+                    continue
+                progress.set_value(job.progress)
+                label_stats.set_text(f"Sensitivity: point {job.batches_done}/{len(points)} ({n_universes} Universes each)")
+
+            if job.status == FAILED:
+                raise job.error
+            if job.status == CANCELLED:
+                label_stats.set_text("Sensitivity aborted")
+                return
+
+            outputs = job.results()
+            rows = oat_effects(career_params, oat, outputs[:len(oat)])
+            indices = sobol_indices(names, outputs[len(oat):], SOBOL_BASE_SAMPLES) if sobol else None
+            render_sensitivity(rows, indices, outputs[0], n_universes)
+            label_stats.set_text("Sensitivity Complete")
+
+        except Exception as e:
+            error_msg = str(e)
+            print(traceback.format_exc())
+            ui.notify(f"Error: {error_msg}", type='negative', close_button=True)
+            label_stats.set_text(f"Failed: {error_msg}")
+
+        finally:
+            running = False
+            current_job = None
+            btn_sim.enable()
+            btn_sens.enable()
+            btn_abort.set_visibility(False)
+            progress.set_visibility(False)
+
+    def render_sensitivity(rows, indices, base, n_universes):
+        """Tornado chart of each parameter's effect (metric picked with the toggle) + Sobol table."""
+        def draw(metric):
+            labels = [f"{r['label']} ({format_value(r['name'], r['low']) if r['low'] is not None else '-'} / "
+                      f"{format_value(r['name'], r['high']) if r['high'] is not None else '-'})" for r in rows]
+            fig = go.Figure()
+            fig.add_trace(go.Bar(y=labels, x=[r['delta_low'].get(metric, 0) for r in rows], orientation='h', name='Step Down', marker_color='#f97316'))
+            fig.add_trace(go.Bar(y=labels, x=[r['delta_high'].get(metric, 0) for r in rows], orientation='h', name='Step Up', marker_color='#22d3ee'))
+            fig.update_layout(title=f"{METRICS[metric]} vs base {base[metric]:,.1f}", barmode='overlay',
+                              paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', font=dict(color='#94a3b8'),
+                              margin=dict(l=20, r=20, t=40, b=20), yaxis=dict(autorange='reversed'),
+                              xaxis=dict(title='Change from current config', gridcolor='#334155'),
+                              legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1))
+            tornado.figure = fig
+            tornado.update()
+            if sobol_grid is not None:
+                sobol_grid.options['rowData'] = [
+                    {'param': PARAMETERS[name][0], 's1': round(s1, 3), 'st': round(st, 3)}
+                    for name, (s1, st) in sorted(indices[metric].items(), key=lambda kv: -kv[1][1])
+                ]
+                sobol_grid.update()
+
+        sobol_grid = None
+        with sensitivity_container:
+            sensitivity_container.clear()
+            with ui.card().classes('w-full bg-slate-900 p-4'):
+                with ui.row().classes('w-full items-center justify-between'):
+                    ui.label('SENSITIVITY (ONE STEP PER SLIDER)').classes('font-bold text-cyan-400 text-xs tracking-widest')
+                    ui.label(f"{n_universes} Universes per point, common random numbers").classes('text-[10px] text-slate-500')
+                toggle = ui.toggle(METRICS, value='total_score', on_change=lambda e: draw(e.value)).props('dense')
+                tornado = ui.plotly(go.Figure()).classes('w-full h-96')
+                if indices is not None:
+                    ui.label(f'SOBOL INDICES ({SOBOL_BASE_SAMPLES} base samples, full slider ranges)').classes('text-xs text-slate-500 font-bold mt-2')
+                    sobol_grid = ui.aggrid({
+                        'columnDefs': [
+                            {'headerName': 'Parameter', 'field': 'param', 'width': 150},
+                            {'headerName': 'First Order', 'field': 's1', 'width': 120},
+                            {'headerName': 'Total', 'field': 'st', 'width': 120},
+                        ],
+                        'rowData': [],
+                    }).classes('h-64 w-full theme-balham-dark')
+        draw(toggle.value)
+
+    def render_analysis(summary):
+        """Draws an AnalysisSummary (see engine/analysis.py). Partial summaries only refresh scoreboard + chart."""
+        nonlocal live_plot
+        if summary is None: return
+        score = summary.score
+        start_ga = summary.start_ga
+        avg_final_ga = score['avg_final_ga']
+        avg_monthly_cost = score['avg_monthly_cost']
+        gold_prob, gold_se = score['score_gold'], score['gold_se']
+        avg_year_hit = summary.avg_year_hit
 
         # SCOREBOARD
-        survivor_count = len([r for r in results if r['final_ga'] >= 1500])
-        score_survival = (survivor_count / len(results)) * 100
-        
-        if avg_monthly_cost <= 0:
-            score_cost = 100
-        else:
-            score_cost = max(0, 100 - (avg_monthly_cost / 5))
-            
-        score_time = active_pct
-        score_gold = gold_prob
-        
-        total_score = (score_gold * 0.30) + (score_survival * 0.30) + (score_cost * 0.20) + (score_time * 0.20)
-        
-        if total_score >= 90: grade, g_col = "A", "text-green-400"
-        elif total_score >= 80: grade, g_col = "B", "text-blue-400"
-        elif total_score >= 70: grade, g_col = "C", "text-yellow-400"
-        elif total_score >= 60: grade, g_col = "D", "text-orange-400"
-        else: grade, g_col = "F", "text-red-600"
+        score_survival = score['score_survival']
+        score_cost = score['score_cost']
+        score_time = score['score_time']
+        score_gold = score['score_gold']
+        total_score = score['total_score']
+        grade = score['grade']
+        g_col = GRADE_COLORS[grade]
+        # Bootstrap intervals (CI_LEVEL) shown under each number; empty when too few universes
+        ci = summary.bootstrap['intervals'] if summary.bootstrap else {}
+        approx = ' (normal approx.)' if summary.bootstrap and summary.bootstrap['method'] == 'normal' else ''
+
+        def ci_label(metric, fmt):
+            if metric in ci:
+                low, high = ci[metric]
+                ui.label(f"{fmt.format(low)} – {fmt.format(high)}{approx}").classes('text-[10px] text-slate-500')
 
         with scoreboard_container:
             scoreboard_container.clear()
@@ -431,6 +665,12 @@ def show_simulator():
                         ui.label('STRATEGY GRADE').classes('text-xs text-slate-400 font-bold tracking-widest')
                         ui.label(f"{grade}").classes(f'text-6xl font-black {g_col} leading-none')
                         ui.label(f"{total_score:.1f}% Score").classes(f'text-sm font-bold {g_col}')
+                        ci_label('total_score', '{:.1f}%')
+                        if summary.bootstrap:
+                            odds = ' · '.join(f"{g} {p * 100:.0f}%" for g, p in summary.bootstrap['grade_probs'].items() if p >= 0.005)
+                            ui.label(odds + approx).classes('text-[10px] text-slate-400 font-bold')
+                        if summary.partial:
+                            ui.label(f"LIVE: {summary.n_results}/{summary.num_sims} Universes").classes('text-[10px] text-cyan-400 font-bold tracking-widest')
                     
                     with ui.column().classes('items-center'):
                         ui.label('AVG ENDING BANKROLL').classes('text-[10px] text-slate-400 font-bold tracking-widest')
@@ -438,45 +678,62 @@ def show_simulator():
                         pnl_color = 'text-green-400' if avg_final_ga >= start_ga else 'text-red-400'
                         pnl_prefix = '+' if avg_final_ga >= start_ga else ''
                         ui.label(f"{pnl_prefix}€{avg_final_ga - start_ga:,.0f}").classes(f'text-sm font-bold {pnl_color}')
+                        ci_label('avg_final_ga', '€{:,.0f}')
 
                     with ui.grid(columns=4).classes('gap-x-8 gap-y-2'):
                         with ui.column().classes('items-center'):
                             ui.label('Gold Chase').classes('text-[10px] text-slate-500 uppercase')
                             ui.label(f"{score_gold:.0f}%").classes('text-lg font-bold text-yellow-400')
+                            ci_label('score_gold', '{:.0f}%')
                         with ui.column().classes('items-center'):
                             ui.label('Survival').classes('text-[10px] text-slate-500 uppercase')
                             ui.label(f"{score_survival:.0f}%").classes('text-lg font-bold text-blue-400')
+                            ci_label('score_survival', '{:.0f}%')
                         with ui.column().classes('items-center'):
                             ui.label('Cost Effic.').classes('text-[10px] text-slate-500 uppercase')
                             ui.label(f"{score_cost:.0f}%").classes('text-lg font-bold text-green-400')
+                            ci_label('score_cost', '{:.0f}%')
                         with ui.column().classes('items-center'):
                             ui.label('Active Play').classes('text-[10px] text-slate-500 uppercase')
                             ui.label(f"{score_time:.0f}%").classes('text-lg font-bold text-purple-400')
+                            ci_label('score_time', '{:.0f}%')
 
         # CHART
-        with chart_container:
-            chart_container.clear()
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=months + months[::-1], y=np.concatenate([max_band, min_band[::-1]]), fill='toself', fillcolor='rgba(128, 128, 128, 0.2)', line=dict(color='rgba(255,255,255,0)'), name='Best/Worst'))
-            fig.add_trace(go.Scatter(x=months + months[::-1], y=np.concatenate([p75_band, p25_band[::-1]]), fill='toself', fillcolor='rgba(0, 255, 136, 0.3)', line=dict(color='rgba(255,255,255,0)'), name='Likely'))
-            fig.add_trace(go.Scatter(x=months, y=mean_line, mode='lines', name='Average', line=dict(color='white', width=2)))
-            
-            fig.add_hline(y=1000, line_dash="dash", line_color="red", annotation_text="Insolvency")
-            if config['use_holiday']: fig.add_hline(y=10000, line_dash="dash", line_color="yellow", annotation_text="Holiday")
-            if config['use_tax']: fig.add_hline(y=12500, line_dash="dash", line_color="gold", annotation_text="Luxury Tax")
+        bands = {name: np.asarray(band) for name, band in summary.bands.items()}
+        months = list(range(len(bands['mean'])))
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=months + months[::-1], y=np.concatenate([bands['max'], bands['min'][::-1]]), fill='toself', fillcolor='rgba(128, 128, 128, 0.2)', line=dict(color='rgba(255,255,255,0)'), name='Best/Worst'))
+        fig.add_trace(go.Scatter(x=months + months[::-1], y=np.concatenate([bands['p75'], bands['p25'][::-1]]), fill='toself', fillcolor='rgba(0, 255, 136, 0.3)', line=dict(color='rgba(255,255,255,0)'), name='Likely'))
+        fig.add_trace(go.Scatter(x=months, y=bands['mean'], mode='lines', name='Average', line=dict(color='white', width=2)))
+        
+        fig.add_hline(y=1000, line_dash="dash", line_color="red", annotation_text="Insolvency")
+        if summary.use_holiday: fig.add_hline(y=10000, line_dash="dash", line_color="yellow", annotation_text="Holiday")
+        if summary.use_tax: fig.add_hline(y=12500, line_dash="dash", line_color="gold", annotation_text="Luxury Tax")
+
+        fig.update_layout(title='Monte Carlo Confidence Bands', paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', font=dict(color='#94a3b8'), margin=dict(l=20, r=20, t=40, b=20), xaxis=dict(title='Months Passed', gridcolor='#334155'), yaxis=dict(title='Game Account (€)', gridcolor='#334155'), showlegend=True, legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+
+        if live_plot is not None:
+            # Update in place: one figure push instead of rebuilding the card
+            live_plot.figure = fig
+            live_plot.update()
+        else:
+            with chart_container:
+                chart_container.clear()
+                live_plot = ui.plotly(fig).classes('w-full h-96')
 
-            fig.update_layout(title='Monte Carlo Confidence Bands', paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', font=dict(color='#94a3b8'), margin=dict(l=20, r=20, t=40, b=20), xaxis=dict(title='Months Passed', gridcolor='#334155'), yaxis=dict(title='Game Account (€)', gridcolor='#334155'), showlegend=True, legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
-            ui.plotly(fig).classes('w-full h-96')
+        if summary.partial:
+            return
 
         # METRICS
         with stats_container:
             stats_container.clear()
             with ui.grid(columns=3).classes('w-full gap-4'):
                 with ui.card().classes('bg-slate-900 border-l-4 border-yellow-500 p-4'):
-                    ui.label(f"{config['status_target_name'].upper()} PROB").classes('text-xs text-slate-500')
+                    ui.label(f"{summary.status_name.upper()} PROB").classes('text-xs text-slate-500')
                     g_color = 'text-green-400' if gold_prob > 80 else 'text-yellow-400'
                     if gold_prob < 50: g_color = 'text-red-400'
                     ui.label(f"{gold_prob:.1f}%").classes(f'text-3xl font-black {g_color}')
+                    ui.label(f"± {gold_se * 100:.2f}% (1 SE)").classes('text-[10px] text-slate-500')
                     if gold_prob > 0:
                         ui.label(f"Hit Year {avg_year_hit:.1f}").classes('text-xs text-slate-400')
 
@@ -492,70 +749,73 @@ def show_simulator():
                     else:
                         ui.label(f"€{avg_monthly_cost:.0f}").classes('text-2xl font-bold text-red-400')
 
+            # Status attainment: every SBM level (and custom threshold) from this one run
+            if summary.status:
+                years = list(range(1, len(next(iter(summary.status.values()))['curve']) + 1))
+                status_fig = go.Figure()
+                for name, level in summary.status.items():
+                    status_fig.add_trace(go.Scatter(x=years, y=[p * 100 for p in level['curve']], mode='lines+markers',
+                                                    name=f"{name} ({level['prob'] * 100:.1f}%)"))
+                status_fig.update_layout(title='Status Reached By Year', paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', font=dict(color='#94a3b8'), margin=dict(l=20, r=20, t=40, b=20), xaxis=dict(title='Year', gridcolor='#334155', dtick=1), yaxis=dict(title='Universes (%)', gridcolor='#334155', rangemode='tozero'), legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+                ui.plotly(status_fig).classes('w-full h-72')
+
+        report_text = summary.report
         with report_container:
             report_container.clear()
-            try:
-                lines = []
-                lines.append(f"MONTE CARLO REPORT ({len(results)} Universes)")
-                lines.append(f"STRATEGY GRADE: {grade} ({total_score:.1f}%)")
-                lines.append("-" * 40)
-                
-                tgt_name = config.get('status_target_name', 'N/A')
-                tgt_pts = config.get('status_target_pts', 0)
-                
-                s_ga = f"€{start_ga:,.0f}"
-                f_ga = f"€{avg_final_ga:,.0f}"
-                n_res = f"€{net_life_result:,.0f}"
-                t_cost = f"€{avg_monthly_cost:,.0f}"
-                act_play = f"{active_pct:.1f}%"
-                ins_mo = f"{avg_insolvent:.1f}"
-                g_prob = f"{gold_prob:.1f}%"
-                
-                st_iron = overrides.iron_gate_limit
-                st_press = overrides.press_trigger_wins
-                
-                depth = overrides.press_depth
-                st_depth = "Unlimited" if depth == 0 else f"{depth} steps"
-                
-                st_stop = overrides.stop_loss_units
-                st_prof = overrides.profit_lock_units
-                st_safe = config.get('safety', 0)
-                
-                st_ratch = f"ON ({config['ratchet_pct']}%)" if config.get('use_ratchet') else "OFF"
-                st_win = config.get('contrib_win', 0)
-                st_loss = config.get('contrib_loss', 0)
-                
-                t_thr = config['tax_thresh']
-                t_rate = config['tax_rate']
-                st_tax = f"ON (>€{t_thr} @ {t_rate}%)" if config.get('use_tax') else "OFF"
-                st_hol = "ON" if config.get('use_holiday') else "OFF"
-
-                lines.append(f"Target: {tgt_name} ({tgt_pts:,.0f} pts)")
-                lines.append(f"Start GA: {s_ga} | Final GA: {f_ga}")
-                lines.append(f"Net Life Result: {n_res} (Avg)")
-                lines.append(f"True Cost: {t_cost}/month")
-                lines.append(f"Active Play: {act_play} ({ins_mo} months insolvent)")
-                lines.append(f"Gold Prob: {g_prob}")
-                
-                lines.append("-" * 20 + " INPUTS " + "-" * 20)
-                lines.append(f"Iron Gate: {st_iron} Losses")
-                lines.append(f"Press Logic: {st_press} wins (Depth: {st_depth})")
-                lines.append(f"Stop/Target: {st_stop}u / {st_prof}u")
-                lines.append(f"Ratchet: {st_ratch}")
-                lines.append(f"Safety Buffer: {st_safe}x")
-                lines.append(f"Contrib: Win=€{st_win}, Loss=€{st_loss}")
-                lines.append(f"Tax: {st_tax}")
-                lines.append(f"Holiday: {st_hol}")
-                
-                report_text = "\n".join(lines)
-            except Exception as e:
-                report_text = f"Report Error: {str(e)}"
-                print(traceback.format_exc())
-
             with ui.expansion('AI Analysis Data', icon='analytics').classes('w-full bg-slate-800 text-slate-400 mb-4'):
                 ui.button('COPY', on_click=lambda: ui.run_javascript(f'navigator.clipboard.writeText(`{report_text}`)')).props('flat dense icon=content_copy color=white').classes('absolute top-2 right-12 z-10')
+                ui.button('JSON', on_click=lambda: ui.download(summary.to_json().encode(), 'analysis.json')).props('flat dense icon=download color=white').classes('absolute top-2 right-32 z-10')
                 ui.html(f'<pre style="white-space: pre-wrap; font-family: monospace; color: #94a3b8; font-size: 0.75rem;">{report_text}</pre>', sanitize=False)
 
+    def render_traces(trace, results):
+        """Hand-by-hand viewer for the traced universes, ruined ones listed first."""
+        rows = trace.records()
+        if not len(rows):
+            return
+        final_ga = results['final_ga']
+        traced = np.unique(rows['universe'])
+        traced = traced[traced < len(final_ga)]
+        ruined = traced[final_ga[traced] < PLAY_GATE]
+        options = {int(u): f"Universe {u} ({'BANKRUPT' if u in ruined else f'€{final_ga[u]:,.0f}'})"
+                   for u in np.concatenate([ruined, np.setdiff1d(traced, ruined)])}
+
+        def show(universe):
+            trace_grid.options['rowData'] = trace_table(rows, universe)
+            trace_grid.update()
+
+        def download_csv():
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=list(TRACE_DTYPE.names))
+            writer.writeheader()
+            writer.writerows(trace_table(rows))
+            ui.download(buffer.getvalue().encode(), 'hand_trace.csv')
+
+        with report_container:
+            with ui.expansion('Hand Trace', icon='receipt_long').classes('w-full bg-slate-800 text-slate-400 mb-4'):
+                with ui.row().classes('w-full items-center gap-4'):
+                    select_universe = ui.select(options, value=next(iter(options), None), label='Universe',
+                                                on_change=lambda e: show(e.value)).classes('flex-grow')
+                    ui.button('CSV', on_click=download_csv).props('flat dense icon=download color=white')
+                dropped = f", oldest {trace.dropped:,} rows dropped" if trace.dropped else ""
+                ui.label(f"{len(traced)} Universes traced, {len(ruined)} bankrupt, {len(rows):,} hands kept{dropped}").classes('text-[10px] text-slate-500')
+                trace_grid = ui.aggrid({
+                    'columnDefs': [
+                        {'headerName': 'Session', 'field': 'session', 'width': 80},
+                        {'headerName': 'Hand', 'field': 'hand', 'width': 70},
+                        {'headerName': 'Shoe', 'field': 'shoe', 'width': 70},
+                        {'headerName': 'Mode', 'field': 'mode', 'width': 90},
+                        {'headerName': 'Reason', 'field': 'reason', 'width': 130},
+                        {'headerName': 'Bet', 'field': 'bet', 'width': 80},
+                        {'headerName': 'Outcome', 'field': 'outcome', 'width': 90},
+                        {'headerName': 'PnL', 'field': 'pnl', 'width': 80},
+                        {'headerName': 'W', 'field': 'wins', 'width': 60},
+                        {'headerName': 'L', 'field': 'losses', 'width': 60},
+                    ],
+                    'rowData': [],
+                }).classes('h-96 w-full theme-balham-dark')
+        if select_universe.value is not None:
+            show(select_universe.value)
+
     # --- LAYOUT ---
     with ui.column().classes('w-full max-w-4xl mx-auto gap-6 p-4'):
         ui.label('RESEARCH LAB: MY MONTE-CARLO').classes('text-2xl font-light text-slate-300')
@@ -586,9 +846,11 @@ def show_simulator():
                     with ui.row().classes('w-full justify-between'):
                         ui.label('Universes').classes('text-xs text-slate-400')
                         lbl_num_sims = ui.label()
-                    slider_num_sims = ui.slider(min=10, max=100, value=20).props('color=cyan')
+                    slider_num_sims = ui.slider(min=10, max=10000, step=10, value=20).props('color=cyan')
                     lbl_num_sims.bind_text_from(slider_num_sims, 'value', lambda v: f'{v}')
                     lbl_num_sims.set_text('20') 
+                    # Same seed + same settings = same universes (blank: random)
+                    input_seed = ui.number('Seed', value=None, format='%d', min=0).props('dense clearable').classes('w-full')
                     
                     with ui.row().classes('w-full justify-between'):
                         ui.label('Duration (Years)').classes('text-xs text-slate-400')
@@ -604,6 +866,21 @@ def show_simulator():
                     lbl_frequency.bind_text_from(slider_frequency, 'value', lambda v: f'{v}')
                     lbl_frequency.set_text('9') 
 
+                    # Rare events (ruin of a strong strategy, Platinum) need tilted hands + weights
+                    select_is_target = ui.select(list(TARGETS.keys()), value='Off', label='Rare-Event Sampling').classes('w-full')
+                    # Variance reduction (replaces rare-event sampling): modest, see engine/sampling.py
+                    select_sampling = ui.select(list(SAMPLING_MODES.keys()), value='Plain', label='Universe Sampling').classes('w-full')
+                    select_sampling.tooltip('Career results need ~1.2-1.5x fewer universes for the same accuracy (session PnL ~2x)')
+
+                    # Backtest against recorded shoes (python -m engine.corpus to import a CSV)
+                    select_source = ui.select([SYNTHETIC_SOURCE] + list_corpora(), value=SYNTHETIC_SOURCE, label='Hand Source').classes('w-full')
+                    select_block = ui.select(BOOTSTRAP_BLOCKS, value=1, label='Block Bootstrap').classes('w-full')
+
+                    # Debugging: replay a sample of universes hand by hand (engine/tracing.py)
+                    with ui.row().classes('w-full items-center gap-4'):
+                        switch_trace = ui.switch('Trace Hands').props('color=purple')
+                        input_trace_pct = ui.number('Universes (%)', value=1, min=0.01, max=100, step=0.5).props('dense').classes('w-32')
+
                 with ui.column().classes('w-1/2'):
                     ui.label('LADDER PREVIEW').classes('font-bold text-white mb-2')
                     with ui.expansion('View Table', icon='list').classes('w-full bg-slate-800 text-slate-300'):
@@ -666,6 +943,9 @@ def show_simulator():
                     slider_safety = ui.slider(min=10, max=60, value=20, on_change=update_ladder_preview).props('color=orange')
                     lbl_safety.bind_text_from(slider_safety, 'value', lambda v: f'{v}x')
                     lbl_safety.set_text('20x')
+
+                    # Titan/Fortress ignore the safety buffer; Titan keeps per-universe hysteresis
+                    select_ladder_mode = ui.select(['Standard', 'Fortress', 'Titan'], value='Standard', label='Ladder Mode', on_change=update_ladder_preview).classes('w-full')
                     
                     with ui.row().classes('w-full justify-between'):
                         ui.label('Iron Gate Limit').classes('text-xs text-purple-400')
@@ -674,6 +954,9 @@ def show_simulator():
                     lbl_iron.bind_text_from(slider_iron_gate, 'value', lambda v: f'{v} Losses')
                     lbl_iron.set_text('3 Losses')
                     
+                    # Press Logic/Depth only apply to Sniper; other progressions size bets themselves
+                    select_progression = ui.select(list(PROGRESSIONS.keys()), value='Sniper', label='Progression').classes('w-full')
+
                     select_press = ui.select({0: 'Flat', 1: 'Press 1-Win', 2: 'Press 2-Wins'}, value=2, label='Press Logic').classes('w-full')
                     
                     with ui.row().classes('w-full justify-between'):
@@ -709,6 +992,7 @@ def show_simulator():
 
                     ui.label('Status Target').classes('text-xs text-yellow-400 mt-2')
                     select_status = ui.select(list(SBM_TIERS.keys()), value='Gold').classes('w-full')
+                    input_custom_status = ui.input('Extra Thresholds (pts)', placeholder='e.g. 10000, 50k').props('dense').classes('w-full')
                     
                     with ui.row().classes('w-full justify-between'):
                         ui.label('Earn Rate').classes('text-xs text-yellow-400')
@@ -730,14 +1014,64 @@ def show_simulator():
                      lbl_start_ga.bind_text_from(slider_start_ga, 'value', lambda v: f'€{v}')
                      lbl_start_ga.set_text('€1700')
                 
-                btn_sim = ui.button('RUN STATUS SIM', on_click=run_sim).props('icon=verified color=yellow text-color=black size=lg')
+                with ui.row().classes('items-center gap-2'):
+                    btn_abort = ui.button('ABORT', on_click=request_abort).props('icon=stop color=red outline')
+                    btn_abort.set_visibility(False)
+                    switch_sobol = ui.switch('Sobol').props('color=cyan')
+                    btn_sens = ui.button('SENSITIVITY', on_click=run_sensitivity).props('icon=tune color=cyan outline')
+                    btn_sim = ui.button('RUN STATUS SIM', on_click=run_sim).props('icon=verified color=yellow text-color=black size=lg')
         
-        label_stats = ui.label('Ready...').classes('text-sm text-slate-500')
+        # ANALYTIC PREVIEW (refreshes on any slider change, before running the sim)
+        with ui.card().classes('w-full bg-slate-900 p-4 border-l-4 border-cyan-500'):
+            ui.label('ANALYTIC PREVIEW').classes('font-bold text-cyan-400 text-xs tracking-widest')
+            with ui.row().classes('w-full justify-between'):
+                with ui.column().classes('items-center gap-0'):
+                    ui.label('Survival').classes('text-[10px] text-slate-500 uppercase')
+                    lbl_preview_survival = ui.label('...').classes('text-2xl font-black text-slate-400')
+                with ui.column().classes('items-center gap-0'):
+                    ui.label('Exp. Final GA').classes('text-[10px] text-slate-500 uppercase')
+                    lbl_preview_final = ui.label('...').classes('text-2xl font-black text-white')
+                with ui.column().classes('items-center gap-0'):
+                    ui.label('P10 / P50 / P90').classes('text-[10px] text-slate-500 uppercase')
+                    lbl_preview_bands = ui.label('...').classes('text-sm font-bold text-slate-300 mt-2')
+                with ui.column().classes('items-center gap-0'):
+                    ui.label('Insolvent Months').classes('text-[10px] text-slate-500 uppercase')
+                    lbl_preview_insolvent = ui.label('...').classes('text-2xl font-black text-orange-400')
+            lbl_preview_note = ui.label('Computing...').classes('text-[10px] text-slate-600 italic')
+
+        ui.timer(PREVIEW_POLL_INTERVAL, refresh_preview)
+
+        with ui.row().classes('w-full justify-between items-center'):
+            label_stats = ui.label('Ready...').classes('text-sm text-slate-500')
+            ui.label(f"Kernel: {'Numba JIT' if KERNEL_BACKEND == 'numba' else 'Pure Python'}").classes('text-[10px] text-slate-600 font-mono')
         progress = ui.linear_progress().props('color=green').classes('mt-0')
         progress.set_visibility(False)
 
+        # LAB QUEUE (shared across every connected client)
+        with ui.expansion('LAB QUEUE', icon='dns').classes('w-full bg-slate-800 text-slate-300'):
+            queue_grid = ui.aggrid({
+                'columnDefs': [
+                    {'headerName': 'Job', 'field': 'id', 'width': 70},
+                    {'headerName': 'Run', 'field': 'label', 'width': 200},
+                    {'headerName': 'Status', 'field': 'status', 'width': 110},
+                    {'headerName': 'Batches', 'field': 'batches', 'width': 100},
+                    {'headerName': 'Mine', 'field': 'mine', 'width': 70},
+                ],
+                'rowData': [],
+            }).classes('h-40 w-full theme-balham-dark')
+
+        def refresh_queue():
+            rows = []
+            for j in SCHEDULER.snapshot():
+                rows.append({**j, 'mine': 'YES' if j['client'] == client_id else ''})
+            queue_grid.options['rowData'] = rows
+            queue_grid.update()
+
+        ui.timer(2.0, refresh_queue)
+
         # Place Scoreboard at the top of results
         scoreboard_container = ui.column().classes('w-full mb-4')
+        sensitivity_container = ui.column().classes('w-full')
         stats_container = ui.column().classes('w-full')
         chart_container = ui.card().classes('w-full bg-slate-900 p-4')
         report_container = ui.column().classes('w-full')
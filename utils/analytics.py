@@ -0,0 +1,133 @@
+import threading
+import numpy as np
+import pandas as pd
+from utils.summary import recent_sessions
+
+# --- SESSION ANALYTICS ---
+# profile['history'] is loaded into one columnar DataFrame and every metric is a
+# vectorized pandas/NumPy pass over it. The frame and the derived tables are
+# cached until log_session_result() invalidates them, so dashboard and session
+# log visits stay instant with years of sessions.
+ROLLING_WINDOW = 10
+DEFAULT_EARN_RATE = 10  # SBM points per €100 wagered (simulator default)
+
+HISTORY_COLUMNS = {
+    'start_ga': 'float64', 'end_ga': 'float64', 'pnl': 'float64',
+    'shoes': 'int64', 'tier': 'Int64', 'volume': 'float64',
+}
+
+_cache = {}  # player -> (token, analytics)
+_cache_lock = threading.Lock()
+
+
+def invalidate(player: str = None):
+    """Drops cached analytics for one player, or all (called whenever a session is logged)."""
+    with _cache_lock:
+        if player is None:
+            _cache.clear()
+        else:
+            _cache.pop(player, None)
+
+
+def history_frame(history: list) -> pd.DataFrame:
+    """Session log as a DataFrame indexed by session number (1-based), oldest first."""
+    df = pd.DataFrame.from_records(history, columns=['date', *HISTORY_COLUMNS])
+    # Entries logged before tier/volume were recorded stay NA / 0
+    df['volume'] = df['volume'].fillna(0.0)
+    df = df.astype(HISTORY_COLUMNS)
+    df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d %H:%M', errors='coerce')
+    df.index = pd.RangeIndex(1, len(df) + 1, name='session')
+    return df
+
+
+def get_analytics(profile: dict, earn_rate: float = DEFAULT_EARN_RATE, load_history=None) -> dict:
+    """
+    All history analytics for `profile`, cached until the history changes.
+    A summary-only profile (load_profile(with_history=False)) is checked against
+    the cache from its summary; load_history(player) only runs on a miss.
+    """
+    player = profile.get('player')
+    if 'history' in profile:
+        history = profile['history']
+        token = (len(history), history[-1].get('date') if history else None, earn_rate)
+    else:
+        history = None
+        newest = recent_sessions(profile['summary'], 1)
+        token = (profile['summary']['sessions'], newest[0].get('date') if newest else None, earn_rate)
+    with _cache_lock:
+        cached = _cache.get(player)
+        if cached and cached[0] == token:
+            return cached[1]
+
+    if history is None:
+        history = load_history(player)
+    analytics = compute_analytics(history_frame(history), earn_rate)
+    with _cache_lock:
+        _cache[player] = (token, analytics)
+    return analytics
+
+
+def compute_analytics(df: pd.DataFrame, earn_rate: float = DEFAULT_EARN_RATE) -> dict:
+    df = df.copy()
+    df['win'] = df['pnl'] > 0
+    df['points'] = df['volume'] * (earn_rate / 100)
+    df['cum_pnl'] = df['pnl'].cumsum()
+    df['rolling_pnl'] = df['pnl'].rolling(ROLLING_WINDOW, min_periods=1).sum()
+
+    # 1. Drawdown on the GA curve (peak includes the starting bankroll)
+    peak = np.maximum.accumulate(np.maximum(df['end_ga'].to_numpy(), df['start_ga'].to_numpy()))
+    df['peak_ga'] = peak
+    df['drawdown'] = df['end_ga'] - peak
+    max_drawdown = float(-df['drawdown'].min()) if len(df) else 0.0
+
+    return {
+        'frame': df,
+        'sessions': len(df),
+        'total_pnl': float(df['pnl'].sum()),
+        'win_rate': float(df['win'].mean()) if len(df) else 0.0,
+        'max_drawdown': max_drawdown,
+        'current_drawdown': float(-df['drawdown'].iloc[-1]) if len(df) else 0.0,
+        'points': float(df['points'].sum()),
+        'by_tier': tier_table(df),
+        'streaks': streak_table(df),
+        'monthly': period_table(df, 'M'),
+        'yearly': period_table(df, 'Y'),
+    }
+
+
+def tier_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Sessions, win rate, PnL and volume per tier (sessions without a tier are skipped)."""
+    grouped = df.dropna(subset=['tier']).groupby('tier')
+    return pd.DataFrame({
+        'sessions': grouped.size(),
+        'win_rate': grouped['win'].mean(),
+        'pnl': grouped['pnl'].sum(),
+        'avg_pnl': grouped['pnl'].mean(),
+        'volume': grouped['volume'].sum(),
+    })
+
+
+def streak_table(df: pd.DataFrame) -> pd.DataFrame:
+    """How often each winning/losing streak length occurred (flat sessions break streaks)."""
+    sign = np.sign(df['pnl'])
+    runs = (sign != sign.shift()).cumsum()
+    lengths = pd.DataFrame({'sign': sign, 'run': runs}).groupby('run').agg(sign=('sign', 'first'), length=('sign', 'size'))
+    lengths = lengths[lengths['sign'] != 0]
+    table = lengths.assign(kind=np.where(lengths['sign'] > 0, 'win', 'loss')).pivot_table(
+        index='length', columns='kind', values='sign', aggfunc='size', fill_value=0)
+    return table.reindex(columns=['win', 'loss'], fill_value=0)
+
+
+def period_table(df: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """Monthly ('M') or yearly ('Y') totals."""
+    dated = df.dropna(subset=['date'])
+    period = dated['date'].dt.to_period(freq)
+    grouped = dated.groupby(period)
+    return pd.DataFrame({
+        'sessions': grouped.size(),
+        'pnl': grouped['pnl'].sum(),
+        'win_rate': grouped['win'].mean(),
+        'volume': grouped['volume'].sum(),
+        'points': grouped['points'].sum(),
+        'end_ga': grouped['end_ga'].last(),
+    })
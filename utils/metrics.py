@@ -0,0 +1,193 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# --- METRICS ---
+# Always-on operational counters for the lab server, exposed in the Prometheus
+# text format at /metrics (see main.py). Recording is a dict lookup and a few
+# additions under one lock, cheap enough for every batch, profile read and page
+# render. Rates (universes / hands per second) come from the scraper: rate() over
+# the *_total counters. Values that are cheaper to read than to track (queue
+# depth, database size) are gauges computed by a callback at scrape time.
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Histogram buckets (seconds)
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+PAGE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+BATCH_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_lock = threading.Lock()
+_registry = {}   # name -> metric, in registration order
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(names: tuple, values: tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        with _lock:
+            _registry[name] = self
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(n, '') for n in self.labels)
+
+    def _snapshot(self) -> dict:
+        with _lock:
+            return dict(self._values)
+
+    def _samples(self) -> list:
+        """[(suffix, label values, extra label, value)] for render()."""
+        return [('', key, '', value) for key, value in sorted(self._snapshot().items())]
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        for suffix, key, extra, value in self._samples():
+            lines.append(f'{self.name}{suffix}{_label_text(self.labels, key, extra)} {_number(value)}')
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic total (name should end in _total)."""
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        super().__init__(name, help_text, labels)
+        if not self.labels:
+            self._values[()] = 0   # scrapeable from the start
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """
+    Current value. With `collect` the value is read at scrape time instead:
+    collect() returns {label values tuple: value}.
+    """
+    kind = 'gauge'
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), collect=None):
+        super().__init__(name, help_text, labels)
+        self.collect = collect
+
+    def set(self, value: float, **labels):
+        with _lock:
+            self._values[self._key(labels)] = value
+
+    def _samples(self) -> list:
+        if self.collect is None:
+            return super()._samples()
+        try:
+            values = self.collect()
+        except Exception:
+            return []  # a failing probe must not break the scrape
+        return [('', key, '', value) for key, value in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram of observed durations / sizes."""
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = FAST_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        if not self.labels:
+            self._values[()] = [0] * (len(self.buckets) + 1) + [0.0]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        slot = bisect.bisect_left(self.buckets, value)
+        with _lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # [per-bucket counts..., +Inf count, sum]
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[slot] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _snapshot(self) -> dict:
+        with _lock:
+            return {key: list(counts) for key, counts in self._values.items()}
+
+    def _samples(self) -> list:
+        samples = []
+        for key, counts in sorted(self._snapshot().items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float('inf')), counts):
+                cumulative += count
+                samples.append(('_bucket', key, f'le="{_number(bound)}"', cumulative))
+            samples.append(('_sum', key, '', counts[-1]))
+            samples.append(('_count', key, '', cumulative))
+        return samples
+
+
+def timed(histogram: Histogram, **labels):
+    """Decorator: observes each call's wall time."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text exposition format."""
+    with _lock:
+        metrics = list(_registry.values())
+    # Outside the lock: scrape-time gauges may take other locks (e.g. the scheduler's)
+    return '\n'.join(line for metric in metrics for line in metric.render()) + '\n'
+
+
+# --- LAB METRICS ---
+UNIVERSES = Counter('lab_universes_total', 'Simulated universes (careers) completed')
+SESSIONS = Counter('lab_sessions_total', 'Simulated sessions played')
+HANDS = Counter('lab_hands_total', 'Simulated hands dealt')
+BATCHES = Counter('lab_batches_total', 'Scheduler batches finished, by outcome', ('outcome',))
+BATCH_SECONDS = Histogram('lab_batch_seconds', 'Wall time of one scheduler batch', buckets=BATCH_BUCKETS)
+PROFILE_SECONDS = Histogram('lab_profile_seconds', 'Profile store latency, by operation', ('op',))
+PAGE_RENDER_SECONDS = Histogram('lab_page_render_seconds', 'Server-side page build time, by page', ('page',),
+                                buckets=PAGE_BUCKETS)
+
+
+def record_careers(result: dict):
+    """Counts a finished run_careers batch (engine/career.py RESULT_COLUMNS)."""
+    UNIVERSES.inc(len(result['final_ga']))
+    SESSIONS.inc(int(result['sessions'].sum()))
+    HANDS.inc(int(result['hands'].sum()))
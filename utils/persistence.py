@@ -1,9 +1,25 @@
+import copy
 import json
 import os
+import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from utils import analytics
+from utils.metrics import PROFILE_SECONDS, Gauge, timed
+from utils.summary import SUMMARY_VERSION, ensure_summary, apply_session, rebuild_summary
 
-# File where we store the Director's data
-DATA_FILE = 'lab_data.json'
+# --- STORAGE ---
+# One SQLite database (WAL mode) holds every player's profile. Each player is a
+# row in `profiles` (the profile document without history) plus append-only rows
+# in `sessions`, so logging a session never rewrites years of history.
+# Writers take the database write lock up front (BEGIN IMMEDIATE) and re-read
+# before mutating, so two tabs can no longer overwrite each other's updates;
+# readers never block writers under WAL.
+DB_FILE = os.environ.get('BACCARAT_DB', 'lab_data.db')
+DATA_FILE = 'lab_data.json'   # legacy single-profile file, imported once as DEFAULT_PLAYER
+DEFAULT_PLAYER = 'Director'
+BUSY_TIMEOUT_MS = 10000
 
 DEFAULT_PROFILE = {
     "ga": 1700.0,          # Game Account (Starting Bankroll)
@@ -15,44 +31,207 @@ DEFAULT_PROFILE = {
     "history": []          # Log of all sessions
 }
 
-def load_profile():
-    """Loads the profile from disk. If missing, creates a default one."""
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    player  TEXT PRIMARY KEY,
+    data    TEXT NOT NULL,
+    updated TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    player  TEXT NOT NULL,
+    seq     INTEGER NOT NULL,
+    entry   TEXT NOT NULL,
+    PRIMARY KEY (player, seq)
+);
+"""
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()
+
+
+def _connection() -> sqlite3.Connection:
+    """
+    One connection per thread, reused for the life of the thread. This is the
+    process's connection pool in practice: callers run on the event loop thread or
+    the bounded asyncio.to_thread / scheduler worker pools, so the count stays
+    bounded. A sqlite3 connection must not be used by two threads at once, and
+    this needs no checkout/return bookkeeping around each transaction.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is None or getattr(_local, 'path', None) != DB_FILE:
+        conn = sqlite3.connect(DB_FILE, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+        _local.conn, _local.path = conn, DB_FILE
+        _init_db(conn)
+    return conn
+
+
+def _init_db(conn: sqlite3.Connection):
+    with _init_lock:
+        if DB_FILE in _initialized:
+            return
+        conn.executescript(SCHEMA)
+        _migrate_legacy(conn)
+        _initialized.add(DB_FILE)
+
+
+def _migrate_legacy(conn: sqlite3.Connection):
+    """Imports lab_data.json as DEFAULT_PLAYER the first time the database is created."""
     if not os.path.exists(DATA_FILE):
-        save_profile(DEFAULT_PROFILE)
-        return DEFAULT_PROFILE
-    
+        return
+    if conn.execute('SELECT 1 FROM profiles LIMIT 1').fetchone():
+        return
     try:
         with open(DATA_FILE, 'r') as f:
-            return json.load(f)
+            legacy = json.load(f)
     except (json.JSONDecodeError, IOError):
-        # Backup corrupt file if needed, but for now just reset
-        return DEFAULT_PROFILE
+        return
+    with _write(conn):
+        _store(conn, DEFAULT_PLAYER, legacy)
+        conn.executemany(
+            'INSERT INTO sessions (player, seq, entry) VALUES (?, ?, ?)',
+            [(DEFAULT_PLAYER, i + 1, json.dumps(e)) for i, e in enumerate(legacy.get('history', []))]
+        )
+
+
+@contextmanager
+def _write(conn: sqlite3.Connection):
+    """Write transaction holding the database lock from the first statement (no lost updates)."""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield conn
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    conn.execute('COMMIT')
+
+
+def _store(conn: sqlite3.Connection, player: str, profile: dict):
+    doc = {k: v for k, v in profile.items() if k not in ('history', 'player')}
+    conn.execute(
+        'INSERT INTO profiles (player, data, updated) VALUES (?, ?, ?) '
+        'ON CONFLICT(player) DO UPDATE SET data = excluded.data, updated = excluded.updated',
+        (player, json.dumps(doc), datetime.now().isoformat(timespec='seconds'))
+    )
+
+
+def _fetch(conn: sqlite3.Connection, player: str):
+    row = conn.execute('SELECT data FROM profiles WHERE player = ?', (player,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def _history(conn: sqlite3.Connection, player: str) -> list:
+    rows = conn.execute('SELECT entry FROM sessions WHERE player = ? ORDER BY seq', (player,)).fetchall()
+    return [json.loads(r[0]) for r in rows]
+
+
+# --- PUBLIC API ---
+def list_players() -> list:
+    players = [r[0] for r in _connection().execute('SELECT player FROM profiles ORDER BY player')]
+    return players or [DEFAULT_PLAYER]
 
-def save_profile(data):
-    """Writes the profile to disk."""
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=4)
 
-def log_session_result(start_ga: float, end_ga: float, shoes_played: int):
+@timed(PROFILE_SECONDS, op='load')
+def load_profile(player: str = DEFAULT_PLAYER, with_history: bool = True):
+    """
+    Loads a player's profile. Missing players get a default one.
+    with_history=False skips the session log: cards and headers render from
+    profile['summary'] alone (see load_history / utils.analytics for the charts).
+    """
+    conn = _connection()
+    conn.execute('BEGIN')  # one snapshot for the document and its history
+    try:
+        doc = _fetch(conn, player)
+        history = _history(conn, player) if with_history else None
+    finally:
+        conn.execute('COMMIT')
+
+    if doc is None or doc.get('summary', {}).get('version') != SUMMARY_VERSION:
+        # New player, older row or a new summary layout: (re)build inside the write lock
+        doc = update_profile(player, lambda p: p.update(summary=rebuild_summary({**p, 'history': _history(conn, player)})))
+        history = _history(conn, player) if with_history else None
+    if not with_history:
+        return {**doc, 'player': player}
+    return {**doc, 'history': history, 'player': player}
+
+
+@timed(PROFILE_SECONDS, op='history')
+def load_history(player: str = DEFAULT_PLAYER) -> list:
+    """A player's session log, oldest first."""
+    return _history(_connection(), player)
+
+
+@timed(PROFILE_SECONDS, op='update')
+def update_profile(player: str, fn) -> dict:
+    """
+    Read-modify-write of one player's profile document in a single write
+    transaction: fn(profile) mutates it in place. History is not loaded here
+    (it is append-only, see log_session_result). Returns the stored document.
+    """
+    conn = _connection()
+    with _write(conn):
+        profile = _fetch(conn, player)
+        if profile is None:
+            profile = copy.deepcopy(DEFAULT_PROFILE)
+            ensure_summary(profile)
+            profile.pop('history')
+        fn(profile)
+        _store(conn, player, profile)
+    return profile
+
+
+@timed(PROFILE_SECONDS, op='log_session')
+def log_session_result(start_ga: float, end_ga: float, shoes_played: int, tier: int = None, volume: float = 0.0,
+                       player: str = DEFAULT_PLAYER):
     """Updates the profile after a session ends."""
-    profile = load_profile()
-    
     session_pnl = end_ga - start_ga
-    
-    # Update Totals
-    profile["ga"] = end_ga
-    profile["ytd_pnl"] += session_pnl
-    profile["sessions_played"] += 1
-    
-    # Log Entry
     entry = {
         "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
         "start_ga": start_ga,
         "end_ga": end_ga,
         "pnl": session_pnl,
-        "shoes": shoes_played
+        "shoes": shoes_played,
+        "tier": tier,
+        "volume": volume
     }
-    profile["history"].append(entry)
-    
-    save_profile(profile)
+
+    conn = _connection()
+    with _write(conn):
+        profile = _fetch(conn, player)
+        if profile is None:
+            profile = copy.deepcopy(DEFAULT_PROFILE)
+        if profile.get('summary', {}).get('version') != SUMMARY_VERSION:
+            profile['summary'] = rebuild_summary({**profile, 'history': _history(conn, player)})
+        profile.pop('history', None)
+
+        # Update Totals (relative, so concurrent contributions are not lost)
+        profile["ga"] += session_pnl
+        profile["ytd_pnl"] += session_pnl
+        profile["sessions_played"] += 1
+        apply_session(profile["summary"], entry)
+
+        # Log Entry
+        conn.execute(
+            'INSERT INTO sessions (player, seq, entry) '
+            'VALUES (?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM sessions WHERE player = ?), ?)',
+            (player, player, json.dumps(entry))
+        )
+        _store(conn, player, profile)
+
+    analytics.invalidate(player)
     return profile
+
+
+def _db_file_sizes() -> dict:
+    """On-disk bytes of the database and its write-ahead log (for /metrics)."""
+    sizes = {}
+    for part, path in (('db', DB_FILE), ('wal', DB_FILE + '-wal')):
+        if os.path.exists(path):
+            sizes[(part,)] = os.path.getsize(path)
+    return sizes
+
+
+DB_SIZE = Gauge('lab_db_size_bytes', 'Profile database size on disk', ('file',), collect=_db_file_sizes)
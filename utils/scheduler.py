@@ -0,0 +1,242 @@
+import itertools
+import os
+import threading
+import time
+from collections import deque, OrderedDict
+from utils.metrics import BATCHES, BATCH_SECONDS, Gauge
+
+# --- JOB STATES ---
+QUEUED = 'QUEUED'
+RUNNING = 'RUNNING'
+DONE = 'DONE'
+CANCELLED = 'CANCELLED'
+FAILED = 'FAILED'
+
+FINISHED_STATES = (DONE, CANCELLED, FAILED)
+
+# How many finished jobs stay visible in the shared status board
+HISTORY_SIZE = 20
+
+
+class SimulationJob:
+    """
+    One simulation run split into independent batches.
+    batch_fn(job, index) computes batch `index` and should check
+    `job.cancel_requested` between sessions/careers (cooperative cancellation).
+    """
+    _ids = itertools.count(1)
+
+    def __init__(self, client_id: str, label: str, n_batches: int, batch_fn):
+        self.id = next(self._ids)
+        self.client_id = client_id
+        self.label = label
+        self.n_batches = n_batches
+        self.batch_fn = batch_fn
+
+        self.status = QUEUED
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished_at = None
+
+        self.cancel_requested = False
+        self._next_index = 0
+        self._in_flight = 0
+        self._results = {}
+        self._lock = threading.Lock()
+        self._done_event = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def batches_done(self) -> int:
+        return len(self._results)
+
+    @property
+    def progress(self) -> float:
+        return self.batches_done / self.n_batches if self.n_batches else 1.0
+
+    def results(self) -> list:
+        """Completed batch results so far, in batch order."""
+        with self._lock:
+            return [self._results[i] for i in sorted(self._results)]
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done_event.wait(timeout)
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'client': self.client_id,
+            'label': self.label,
+            'status': self.status,
+            'progress': self.progress,
+            'batches': f"{self.batches_done}/{self.n_batches}",
+            'created': self.created,
+        }
+
+
+class JobScheduler:
+    """
+    Server-wide bounded worker pool for simulations.
+    - FIFO per client, round-robin between clients (one batch per turn).
+    - At most `max_workers` batches execute at once, whoever submitted them.
+    """
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._cond = threading.Condition()
+        self._client_queues = OrderedDict()  # client_id -> deque[SimulationJob]
+        self._jobs = OrderedDict()           # job_id -> SimulationJob (active + recent history)
+        self._workers = []
+
+    # --- PUBLIC API ---
+    def submit(self, client_id: str, label: str, n_batches: int, batch_fn) -> SimulationJob:
+        job = SimulationJob(client_id, label, n_batches, batch_fn)
+        with self._cond:
+            self._ensure_workers()
+            self._jobs[job.id] = job
+            self._client_queues.setdefault(client_id, deque()).append(job)
+            if n_batches == 0:
+                self._finish(job, DONE)
+            self._cond.notify_all()
+        return job
+
+    def cancel(self, job_id: int):
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return
+            job.cancel_requested = True
+            self._drop_from_queue(job)
+            if job._in_flight == 0:
+                self._finish(job, CANCELLED)
+
+    def cancel_client(self, client_id: str):
+        """Cancels every job of a client (e.g. browser tab closed)."""
+        # Snapshot under the lock: workers trim finished jobs from self._jobs meanwhile
+        with self._cond:
+            job_ids = [j.id for j in self._jobs.values() if j.client_id == client_id]
+        for job_id in job_ids:
+            self.cancel(job_id)
+
+    def queue_position(self, job: SimulationJob) -> int:
+        """0 = running / next up. Counts queued jobs submitted before this one."""
+        with self._cond:
+            ahead = [j for j in self._jobs.values() if j.status == QUEUED and j.created < job.created]
+            return len(ahead)
+
+    def snapshot(self) -> list:
+        """Status of active and recent jobs, for every client to display."""
+        with self._cond:
+            return [j.to_dict() for j in reversed(self._jobs.values())]
+
+    def counts(self) -> dict:
+        with self._cond:
+            running = sum(1 for j in self._jobs.values() if j.status == RUNNING)
+            queued = sum(1 for j in self._jobs.values() if j.status == QUEUED)
+        return {'running': running, 'queued': queued}
+
+    # --- INTERNALS (call with self._cond held) ---
+    def _ensure_workers(self):
+        while len(self._workers) < self.max_workers:
+            t = threading.Thread(target=self._worker_loop, name=f'sim-worker-{len(self._workers) + 1}', daemon=True)
+            self._workers.append(t)
+            t.start()
+
+    def _drop_from_queue(self, job):
+        queue = self._client_queues.get(job.client_id)
+        if queue and job in queue:
+            queue.remove(job)
+        if queue is not None and not queue:
+            del self._client_queues[job.client_id]
+
+    def _next_task(self):
+        # Round-robin: take the first client, serve its oldest job, rotate it to the back
+        while self._client_queues:
+            client_id, queue = next(iter(self._client_queues.items()))
+            job = queue[0]
+            if job.cancel_requested or job._next_index >= job.n_batches:
+                queue.popleft()
+                if not queue:
+                    del self._client_queues[client_id]
+                continue
+
+            index = job._next_index
+            job._next_index += 1
+            job._in_flight += 1
+            if job.status == QUEUED:
+                job.status = RUNNING
+                job.started = time.time()
+
+            if job._next_index >= job.n_batches:
+                queue.popleft()
+            if queue:
+                self._client_queues.move_to_end(client_id)
+            else:
+                del self._client_queues[client_id]
+            return job, index
+        return None
+
+    def _finish(self, job, status):
+        job.status = status
+        job.finished_at = time.time()
+        job._done_event.set()
+        self._trim_history()
+
+    def _trim_history(self):
+        finished = [j for j in self._jobs.values() if j.finished]
+        for j in finished[:max(0, len(finished) - HISTORY_SIZE)]:
+            del self._jobs[j.id]
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                task = self._next_task()
+                while task is None:
+                    self._cond.wait()
+                    task = self._next_task()
+            job, index = task
+
+            error = None
+            result = None
+            started = time.perf_counter()
+            try:
+                if not job.cancel_requested:
+                    result = job.batch_fn(job, index)
+            except Exception as e:
+                error = e
+            if error is not None:
+                BATCHES.inc(outcome='failed')
+            elif result is not None:
+                BATCH_SECONDS.observe(time.perf_counter() - started)
+                BATCHES.inc(outcome='done')
+            else:
+                BATCHES.inc(outcome='cancelled')
+
+            with self._cond:
+                job._in_flight -= 1
+                if error is not None and not job.finished:
+                    job.error = error
+                    job.cancel_requested = True
+                    self._drop_from_queue(job)
+                elif error is None and result is not None:
+                    # Careers finished before a cancel are still valid and kept
+                    with job._lock:
+                        job._results[index] = result
+
+                if job._in_flight == 0 and not job.finished:
+                    if job.error is not None:
+                        self._finish(job, FAILED)
+                    elif job.cancel_requested:
+                        self._finish(job, CANCELLED)
+                    elif job.batches_done >= job.n_batches:
+                        self._finish(job, DONE)
+
+
+# Shared by every browser client on this server process
+SCHEDULER = JobScheduler()
+
+JOBS = Gauge('lab_jobs', 'Simulation jobs by state', ('state',),
+             collect=lambda: {(state,): count for state, count in SCHEDULER.counts().items()})
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+# --- PROFILE SUMMARY ---
+# profile['summary'] holds running aggregates that log_session_result updates in
+# O(1) per session, so the dashboard header never has to walk the history.
+# Bump SUMMARY_VERSION whenever the layout changes: stale or missing summaries
+# are rebuilt from profile['history'] on load.
+SUMMARY_VERSION = 1
+RECENT_SIZE = 10  # recent-sessions ring
+
+
+def empty_summary(start_ga: float = 0.0) -> dict:
+    return {
+        "version": SUMMARY_VERSION,
+        "sessions": 0,
+        "wins": 0,
+        "lifetime_pnl": 0.0,
+        "lifetime_volume": 0.0,
+        "peak_ga": start_ga,
+        "max_drawdown": 0.0,
+        "streak": {"kind": None, "length": 0},   # current run of 'win' / 'loss' sessions
+        "best_streak": {"win": 0, "loss": 0},
+        "tiers": {},                             # tier level (str) -> sessions
+        "years": {},                             # 'YYYY' -> {'pnl', 'sessions', 'volume'}
+        "recent": [None] * RECENT_SIZE,          # ring buffer of history entries
+        "recent_head": 0,                        # slot the next entry goes into
+    }
+
+
+def apply_session(summary: dict, entry: dict):
+    """Folds one history entry into the summary (constant time)."""
+    pnl = entry.get("pnl", 0.0)
+    volume = entry.get("volume") or 0.0
+
+    summary["sessions"] += 1
+    summary["lifetime_pnl"] += pnl
+    summary["lifetime_volume"] += volume
+
+    # 1. Peak & drawdown (the peak includes the bankroll the session started from)
+    summary["peak_ga"] = max(summary["peak_ga"], entry.get("start_ga", 0.0), entry.get("end_ga", 0.0))
+    summary["max_drawdown"] = max(summary["max_drawdown"], summary["peak_ga"] - entry.get("end_ga", 0.0))
+
+    # 2. Streaks (flat sessions break the run)
+    kind = "win" if pnl > 0 else "loss" if pnl < 0 else None
+    streak = summary["streak"]
+    if kind is None:
+        streak.update(kind=None, length=0)
+    elif streak["kind"] == kind:
+        streak["length"] += 1
+    else:
+        streak.update(kind=kind, length=1)
+    if kind:
+        summary["best_streak"][kind] = max(summary["best_streak"][kind], streak["length"])
+    if kind == "win":
+        summary["wins"] += 1
+
+    # 3. Per tier / per year
+    tier = entry.get("tier")
+    if tier is not None:
+        summary["tiers"][str(tier)] = summary["tiers"].get(str(tier), 0) + 1
+    year = summary["years"].setdefault(str(entry.get("date", ""))[:4] or "?", {"pnl": 0.0, "sessions": 0, "volume": 0.0})
+    year["pnl"] += pnl
+    year["sessions"] += 1
+    year["volume"] += volume
+
+    # 4. Recent ring
+    summary["recent"][summary["recent_head"]] = entry
+    summary["recent_head"] = (summary["recent_head"] + 1) % RECENT_SIZE
+
+
+def rebuild_summary(profile: dict) -> dict:
+    history = profile.get("history", [])
+    summary = empty_summary(history[0].get("start_ga", 0.0) if history else profile.get("ga", 0.0))
+    for entry in history:
+        apply_session(summary, entry)
+    return summary
+
+
+def ensure_summary(profile: dict) -> bool:
+    """Rebuilds profile['summary'] if missing or outdated. Returns True if it did."""
+    summary = profile.get("summary")
+    if summary is not None and summary.get("version") == SUMMARY_VERSION:
+        return False
+    profile["summary"] = rebuild_summary(profile)
+    return True
+
+
+# --- READERS ---
+def recent_sessions(summary: dict, count: int = RECENT_SIZE) -> list:
+    """Newest first."""
+    ring, head = summary["recent"], summary["recent_head"]
+    ordered = [ring[(head - 1 - i) % RECENT_SIZE] for i in range(min(count, RECENT_SIZE))]
+    return [entry for entry in ordered if entry is not None]
+
+
+def year_totals(summary: dict, year: int = None) -> dict:
+    year = str(year or datetime.now().year)
+    return summary["years"].get(year, {"pnl": 0.0, "sessions": 0, "volume": 0.0})
+
+
+def win_rate(summary: dict) -> float:
+    return summary["wins"] / summary["sessions"] if summary["sessions"] else 0.0